@@ -2,7 +2,6 @@
 # -*- coding: utf-8 -*-
 import argparse
 import copy
-import csv
 import itertools
 import os
 import time
@@ -31,6 +30,19 @@ if not RENDER_DEPLOYMENT:
 # Import classifier classes
 from model.keypoint_classifier.keypoint_classifier import KeyPointClassifier
 from model.point_history_classifier.point_history_classifier import PointHistoryClassifier
+from model.translations import get_translation_tables
+from model.sign_decoder import create_sign_decoder, TemporalSignDecoder, DECODER_KINDS, DEFAULT_DECODER
+from model.sign_sequence_classifier.sign_sequence_classifier import get_sign_sequence_classifier, hand_features
+from model.sign_spotter import SignSpotter
+from model.buffered_csv_writer import close_csv_writers
+from model.data_logging import select_mode, logging_csv
+from model.sample_capture import get_sample_capture, close_sample_capture
+from pipeline.inference_client import get_inference_client, RemoteKeyPointClassifier
+from pipeline.hands_pool import get_hands_pool, PooledHands
+from pipeline.hand_landmarker import LiveStreamHands, HAND_DETECTORS, DEFAULT_HAND_DETECTOR
+from pipeline.landmark_tracker import SkippingHands, DEFAULT_DETECT_EVERY
+from pipeline.config import PROFILES, get_pipeline_config
+from speech.speech_worker import get_speech_worker, PRIORITY_SENTENCE, PRIORITY_WORD
 
 class CvFpsCalc(object):
     def __init__(self, buffer_len=1):
@@ -49,66 +61,68 @@ class CvFpsCalc(object):
 def get_args():
     parser = argparse.ArgumentParser()
     parser.add_argument("--device", type=int, default=0)
-    parser.add_argument("--width", type=int, default=1280)
-    parser.add_argument("--height", type=int, default=780)
+    parser.add_argument("--profile", type=str, choices=sorted(PROFILES), default=None,
+                        help="Pipeline performance profile (also SIGNOVA_PIPELINE_PROFILE), the options below "
+                             "override its settings")
+    parser.add_argument("--width", type=int, default=None)
+    parser.add_argument("--height", type=int, default=None)
     parser.add_argument('--use_static_image_mode', action='store_true')
-    parser.add_argument("--min_detection_confidence", type=float, default=0.7)
-    parser.add_argument("--min_tracking_confidence", type=int, default=0.5)
+    parser.add_argument("--min_detection_confidence", type=float, default=None)
+    parser.add_argument("--min_tracking_confidence", type=float, default=None)
     parser.add_argument("--speech_rate", type=int, default=150)
     parser.add_argument("--voice", type=str, default=None)
+    parser.add_argument("--decoder", type=str, choices=DECODER_KINDS, default=DEFAULT_DECODER)
+    parser.add_argument("--dynamic_signs", type=str, choices=DYNAMIC_SIGN_MODES, default=DEFAULT_DYNAMIC_SIGN_MODE)
+    parser.add_argument("--hand_detector", type=str, choices=HAND_DETECTORS, default=DEFAULT_HAND_DETECTOR,
+                        help="tasks: non-blocking HandLandmarker LIVE_STREAM (also SIGNOVA_HAND_DETECTOR)")
+    parser.add_argument("--detect_every", type=int, default=None,
+                        help="Detect hands every N frames, predict landmarks in between (also SIGNOVA_DETECT_EVERY)")
+    parser.add_argument('--capture_uncertain', action='store_true',
+                        help="Keep ambiguous keypoint frames for labelling (also SIGNOVA_CAPTURE_UNCERTAIN=1)")
     return parser.parse_args()
 
 class AudioTranslator:
-    def __init__(self, rate=150, voice_id=None):
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', rate)
-        if voice_id:
-            voices = self.engine.getProperty('voices')
-            for voice in voices:
-                if voice_id in voice.id:
-                    self.engine.setProperty('voice', voice.id)
-                    break
-        self.is_speaking = False
-        self.last_spoken_time = 0
-        self.cooldown = 1.2  # Reduced cooldown for more responsive feedback
-        self.speech_queue = deque(maxlen=5)  # Queue to manage multiple speech requests
-        self.speech_thread = None
+    """Per-session handle on the process-wide speech worker"""
+    _ids = itertools.count(1)
+
+    def __init__(self, rate=150, voice_id=None, use_phrase_cache=True):
+        self.worker = get_speech_worker(rate=rate, voice_id=voice_id, use_phrase_cache=use_phrase_cache)
+        self.owner = next(AudioTranslator._ids)  # Tags this session's items in the shared queue
         self.active = True
 
-    def speak(self, text):
-        current_time = time.time()
-        if not self.is_speaking and (current_time - self.last_spoken_time) > self.cooldown:
-            self.is_speaking = True
-            self.engine.say(text)
-            if not self.speech_thread or not self.speech_thread.is_alive():
-                self.speech_thread = threading.Thread(target=self._run_engine)
-                self.speech_thread.daemon = True  # Make thread daemon so it exits when main program exits
-                self.speech_thread.start()
-        else:
-            # Add to queue if we're currently speaking
-            if text not in self.speech_queue:
-                self.speech_queue.append(text)
+    @property
+    def engine(self):
+        return self.worker.engine
 
-    def _run_engine(self):
-        try:
-            self.engine.runAndWait()
-        except RuntimeError:
-            # Handle potential runtime errors from pyttsx3
-            pass
-        self.is_speaking = False
-        self.last_spoken_time = time.time()
-        
-        # Process any queued speech items
-        if self.speech_queue and self.active:
-            next_text = self.speech_queue.popleft()
-            self.is_speaking = True
-            self.engine.say(next_text)
-            self._run_engine()
+    @property
+    def phrase_cache(self):
+        return self.worker.phrase_cache
+
+    @property
+    def is_speaking(self):
+        return self.worker.is_speaking
+
+    @property
+    def cooldown(self):
+        return self.worker.cooldown
+
+    def register_vocabulary(self, phrases):
+        self.worker.register_vocabulary(phrases)
+
+    def speak(self, text, priority=PRIORITY_WORD):
+        if self.active:
+            self.worker.submit(text, priority=priority, owner=self.owner)
+
+    def list_voices(self):
+        return self.worker.list_voices()
+
+    def get_metrics(self):
+        return self.worker.metrics()
 
     def stop(self):
+        # The worker outlives sessions, only drop what this one queued
         self.active = False
-        self.engine.stop()
-        self.speech_queue.clear()
+        self.worker.clear(self.owner)
 
 class SentenceRecorder:
     def __init__(self, audio_translator):
@@ -123,112 +137,62 @@ class SentenceRecorder:
         self.confidence_threshold = 0.7  # Confidence threshold for sign recognition
         self.sign_counter = Counter()  # Count occurrences of signs for stability
         
-        # English to Kinyarwanda translations
-        self.english_to_kinyarwanda = {
-            "Open": "Gufungura", 
-            "Close": "Gufunga", 
-            "Pointer": "Kwerekana", 
-            "OK": "Nibyo",
-            "A": "A", 
-            "B": "B", 
-            "C": "C", 
-            "D": "D",
-            "Good": "Byiza", 
-            "Hello": "Muraho", 
-            "Thank you": "Murakoze",
-            "I am": "Ndi", 
-            "Milk": "Amata", 
-            "Tea": "Icyayi", 
-            "Bread": "Ifunga",
-            "Sorghum": "Uburo", 
-            "Water": "Amazi", 
-            "I know": "Ndabizi",
-            "I don't understand": "Simbyumva", 
-            "I want": "Nshaka", 
-            "No": "Nta",
-            "Hello well": "Muraho Neza", 
-            "Thank you very much": "Murakoze Cyane",
-            "I am Rwandan": "Ndi Umunyarwanda", 
-            "I want water": "Ndashaka Amazi"
-        }
-        
-        # RSL sign to English translations
-        self.word_translations = {
-            "Open": "Open", 
-            "Close": "Close", 
-            "Pointer": "Pointer", 
-            "OK": "OK",
-            "ASL A": "A", 
-            "ASL B": "B", 
-            "ASL C": "C", 
-            "ASL D": "D",
-            "Byiza": "Good", 
-            "Muraho": "Hello", 
-            "Murakoze": "Thank you",
-            "Ndi": "I am", 
-            "Amata": "Milk", 
-            "Icyayi": "Tea", 
-            "Ifunga": "Bread",
-            "Uburo": "Sorghum", 
-            "Amazi": "Water", 
-            "Ndabizi": "I know",
-            "Simbyumva": "I don't understand", 
-            "Nshaka": "I want", 
-            "Nta": "No",
-            "Muraho_Neza": "Hello well", 
-            "Murakoze_Cyane": "Thank you very much",
-            "Ndi_Umunyarwanda": "I am Rwandan", 
-            "Ndashaka_Amazi": "I want water",
-            # Additional Kinyarwanda signs from the dataset
-            "Akarere": "District",
-            "Akazi": "Work",
-            "Amakuru": "News",
-            "Bayi": "Bye",
-            "Bibi": "Grandmother",
-            "Igihugu": "Country",
-            "Neza": "Good",
-            "Nyarugenge": "Nyarugenge",
-            "Oya": "No",
-            "Papa": "Father",
-            "Umujyi wa kigali": "Kigali City",
-            "Umurenge": "Sector",
-            "Urakoze": "Thank you",
-            "Yego": "Yes"
-        }
+        # Shared, compiled once per process (includes the KinyarwandaSigns dataset folders)
+        self.tables = get_translation_tables()
+        self.english_to_kinyarwanda = self.tables.english_to_kinyarwanda
+        self.word_translations = self.tables.word_translations
         
-        # Load Kinyarwanda signs data
-        self.load_kinyarwanda_signs()
+        if self.audio is not None:
+            self.audio.register_vocabulary(self.get_vocabulary())
 
-    def add_word(self, word, confidence=0.9):
+    def add_word(self, word, confidence=0.9, stable=False):
+        """Add a recognized sign to the sentence.
+
+        stable: the sign was already confirmed by a temporal decoder, so the
+        frame counting and delay heuristics below are skipped.
+        """
         current_time = time.time()
         delay = self.phrase_delay if '_' in word else self.word_delay
         
         # Track recent signs for better recognition
         self.recent_signs.append(word)
+        
+        if stable:
+            self._append_word(word, confidence)
+            self.last_add_time = current_time
+            return True
+        
         self.sign_counter[word] += 1
         
         # Only add words that meet confidence threshold and appear consistently
         if confidence >= self.confidence_threshold and current_time - self.last_add_time > delay:
             # Check if this sign has appeared multiple times recently for stability
             if self.sign_counter[word] >= 2 or confidence > 0.85:
-                if '_' in word:
-                    for w in word.split('_'):
-                        display = self.word_translations.get(w, w)
-                        self.current_sentence.append(display)
-                        self.audio.speak(display)
-                else:
-                    display = self.word_translations.get(word, word)
-                    self.current_sentence.append(display)
-                    # Provide visual feedback that word was recognized
-                    print(f"Recognized: {display} (confidence: {confidence:.2f})")
-                    self.audio.speak(display)
+                self._append_word(word, confidence)
                 
                 # Reset counter for this word after adding it
                 self.sign_counter[word] = 0
                 self.last_add_time = current_time
             return True
         return False
+
+    def _append_word(self, word, confidence):
+        if '_' in word:
+            for w in word.split('_'):
+                display = self.word_translations.get(w, w)
+                self.current_sentence.append(display)
+                self.audio.speak(display)
+        else:
+            display = self.word_translations.get(word, word)
+            self.current_sentence.append(display)
+            # Provide visual feedback that word was recognized
+            print(f"Recognized: {display} (confidence: {confidence:.2f})")
+            self.audio.speak(display)
         
+    def get_vocabulary(self):
+        """Every phrase the recorder can display or translate to"""
+        return list(self.tables.vocabulary())
+
     def set_language(self, language):
         """Set the current language for translation"""
         self.current_language = language
@@ -237,13 +201,7 @@ class SentenceRecorder:
         """Translate a sentence to the target language"""
         if not sentence or target_language == 'english':
             return sentence
-            
-        if target_language == 'kinyarwanda':
-            words = sentence.split(' ')
-            translated_words = [self.english_to_kinyarwanda.get(word, word) for word in words]
-            return ' '.join(translated_words)
-            
-        return sentence
+        return self.tables.translate(sentence, target_language)
 
     def clear_sentence(self):
         if self.current_sentence:
@@ -263,41 +221,7 @@ class SentenceRecorder:
     def speak_sentence(self):
         sentence = self.get_current_sentence()
         if sentence:
-            self.audio.speak(sentence)
-            
-    def load_kinyarwanda_signs(self):
-        """Load Kinyarwanda signs data from the dataset directory"""
-        try:
-            # Path to Kinyarwanda signs dataset
-            kinyarwanda_signs_path = os.path.join('model', 'KinyarwandaSigns', 'Data')
-            
-            # Check if directory exists
-            if os.path.exists(kinyarwanda_signs_path) and os.path.isdir(kinyarwanda_signs_path):
-                print(f"Loading Kinyarwanda signs from {kinyarwanda_signs_path}")
-                
-                # Get all sign categories (folders)
-                sign_categories = [d for d in os.listdir(kinyarwanda_signs_path) 
-                                if os.path.isdir(os.path.join(kinyarwanda_signs_path, d))]
-                
-                # Add each sign category to translations
-                for category in sign_categories:
-                    # Convert folder name to proper case for display
-                    display_name = category.replace('_', ' ').title()
-                    
-                    # Add to translations if not already present
-                    if category not in self.word_translations:
-                        self.word_translations[category] = display_name
-                        
-                        # Also add to Kinyarwanda translations if appropriate
-                        if display_name not in self.english_to_kinyarwanda:
-                            self.english_to_kinyarwanda[display_name] = category
-                
-                print(f"Successfully loaded {len(sign_categories)} Kinyarwanda sign categories")
-            else:
-                print(f"Warning: Kinyarwanda signs directory not found at {kinyarwanda_signs_path}")
-        except Exception as e:
-            print(f"Error loading Kinyarwanda signs: {str(e)}")
-            # Continue without failing if there's an error loading signs
+            self.audio.speak(sentence, priority=PRIORITY_SENTENCE)
 
 def calc_bounding_rect(image, landmarks):
     image_width, image_height = image.shape[1], image.shape[0]
@@ -347,13 +271,119 @@ def pre_process_point_history(image, point_history):
     
     return list(itertools.chain.from_iterable(temp_point_history))
 
-def logging_csv(number, mode, landmark_list, point_history_list):
-    if mode == 1 and (0 <= number <= 9):
-        with open('model/keypoint_classifier/keypoint.csv', 'a', newline="") as f:
-            csv.writer(f).writerow([number, *landmark_list])
-    elif mode == 2 and (0 <= number <= 9):
-        with open('model/point_history_classifier/point_history.csv', 'a', newline="") as f:
-            csv.writer(f).writerow([number, *point_history_list])
+IGNORED_SIGNS = ("None", "Point", "---")
+
+def classify_hand(keypoint_classifier, pre_processed_landmark_list, num_labels):
+    """Returns (hand_sign_id, confidence, probabilities) for one hand"""
+    probabilities = keypoint_classifier.predict_proba(pre_processed_landmark_list)
+    if probabilities is None:
+        return 0, 0.0, None
+    hand_sign_id = int(np.argmax(probabilities))
+    confidence = float(probabilities[hand_sign_id])
+    if not 0 <= hand_sign_id < num_labels:
+        hand_sign_id = 0  # Default to "None"
+    return hand_sign_id, confidence, probabilities
+
+def create_pipeline_decoder(kind, labels):
+    """Temporal decoder for a pipeline, ignoring the non-word labels"""
+    ignore_ids = [i for i, label in enumerate(labels) if label in IGNORED_SIGNS]
+    return create_sign_decoder(kind, ignore_ids=ignore_ids)
+
+def emit_decoded_sign(sign_decoder, frame_probabilities, labels, sentence_recorder):
+    """Feed one frame to the decoder, returns the word added to the sentence or None"""
+    if sign_decoder is None:
+        return None
+    emitted = sign_decoder.update(frame_probabilities)
+    if emitted is None:
+        return None
+    sign_id, score = emitted
+    if not 0 <= sign_id < len(labels) or labels[sign_id] in IGNORED_SIGNS:
+        return None
+    sentence_recorder.add_word(labels[sign_id], confidence=score, stable=True)
+    return labels[sign_id]
+
+DYNAMIC_SIGN_MODES = ('stream', 'spot')
+DEFAULT_DYNAMIC_SIGN_MODE = os.environ.get('SIGNOVA_DYNAMIC_SIGNS', 'spot')
+
+class DynamicSignRecognizer(object):
+    """Runs hand landmarks through the sign sequence classifier for motion signs.
+
+    'stream' scores the sliding window on every frame and smooths the scores
+    with a temporal decoder. 'spot' only classifies the segments the motion
+    spotter finds, once per segment. One instance per camera session, next to
+    the keypoint classifier.
+    """
+    def __init__(self, classifier, decoder_kind=DEFAULT_DECODER, mode=DEFAULT_DYNAMIC_SIGN_MODE,
+                 min_confidence=0.6):
+        if mode not in DYNAMIC_SIGN_MODES:
+            raise ValueError(f"Unknown dynamic sign mode: {mode}")
+        self.classifier = classifier
+        self.mode = mode
+        self.labels = classifier.labels
+        self.min_confidence = min_confidence
+        self.stream = self.decoder = self.spotter = None
+        if mode == 'spot':
+            self.spotter = SignSpotter(classifier)
+        else:
+            self.stream = classifier.create_stream()
+            ignore_ids = [i for i, label in enumerate(self.labels) if label in IGNORED_SIGNS]
+            # Window scores change every frame, so they are always smoothed
+            kind = decoder_kind if decoder_kind in ('ema', 'vote') else 'ema'
+            self.decoder = TemporalSignDecoder(num_classes=len(self.labels), mode=kind, ignore_ids=ignore_ids)
+        self._features = np.zeros(classifier.input_size, dtype=np.float32)
+
+    def update(self, results, sentence_recorder):
+        """Feed one MediaPipe Hands result, returns the word added to the sentence or None"""
+        features = None
+        if results.multi_hand_landmarks:
+            features = hand_features(results.multi_hand_landmarks, results.multi_handedness, self._features)
+        if self.stream is not None:
+            self.stream.push(features)
+            return emit_decoded_sign(self.decoder, self.stream.predict_proba(), self.labels, sentence_recorder)
+
+        spotted = self.spotter.update(features)
+        if spotted is None:
+            return None
+        sign_id, score = spotted
+        word = self.labels[sign_id]
+        if score < self.min_confidence or word in IGNORED_SIGNS:
+            return None
+        sentence_recorder.add_word(word, confidence=score, stable=True)
+        return word
+
+    def stats(self):
+        if self.spotter is not None:
+            return dict(mode=self.mode, **self.spotter.stats())
+        return {'mode': self.mode, 'frames': self.stream.count, 'classifier_invocations':
+                max(self.stream.count - self.classifier.frames + 1, 0), 'signs_emitted': self.decoder.emitted}
+
+def create_keypoint_classifier():
+    """KeyPointClassifier, or one backed by the inference daemon when SIGNOVA_INFERENCE_SOCKET is set"""
+    client = get_inference_client()
+    return RemoteKeyPointClassifier(client) if client is not None else KeyPointClassifier()
+
+def create_hand_detector(session_id, detector=DEFAULT_HAND_DETECTOR, detect_every=DEFAULT_DETECT_EVERY, **options):
+    """Hands detector for one session: the Tasks LIVE_STREAM landmarker when selected, a worker in the
+    hands pool when SIGNOVA_HANDS_WORKERS is set, else MediaPipe Hands in-process. With detect_every > 1
+    it only runs every N frames and Kalman-predicted landmarks fill the frames in between."""
+    hands = None
+    if detector == 'tasks':
+        try:
+            hands = LiveStreamHands(**options)
+        except (OSError, ImportError) as e:
+            print(f"HandLandmarker unavailable, using MediaPipe Hands: {e}")
+    if hands is None:
+        pool = get_hands_pool(options)
+        if pool is not None:
+            hands = PooledHands(pool, session_id, options=options)  # The session's graph options go with its frames
+        else:
+            hands = mp.solutions.hands.Hands(**options)
+    return SkippingHands(hands, detect_every) if detect_every > 1 else hands
+
+def create_dynamic_sign_recognizer(decoder_kind=DEFAULT_DECODER, mode=DEFAULT_DYNAMIC_SIGN_MODE):
+    """Recognizer for motion signs, None when the sequence model has not been trained"""
+    classifier = get_sign_sequence_classifier()
+    return DynamicSignRecognizer(classifier, decoder_kind, mode) if classifier is not None else None
 
 def draw_landmarks(image, landmark_point):
     if len(landmark_point) > 0:
@@ -466,70 +496,47 @@ def draw_sentence_info(image, sentence_recorder, last_gesture_time, is_audio_pla
     
     return image
 
-def select_mode(key, mode):
-    number = -1
-    if key == 110:  # n
-        mode = 0
-    elif key == 107:  # k
-        mode = 1
-    elif key == 104:  # h
-        mode = 2
-    elif key == 108:  # l
-        mode = 3 if mode != 3 else 0
-        
-    if 48 <= key <= 57:  # 0-9
-        number = key - 48
-        
-    gesture_map = {
-        ord('o'): 0, ord('c'): 1, ord('p'): 2, ord('k'): 3,
-        ord('a'): 4, ord('b'): 5, ord('d'): 6, ord('g'): 7
-    }
-    if key in gesture_map:
-        number = gesture_map[key]
-        mode = 1
-        
-    kinyarwanda_map = {
-        ord('m'): 8, ord('t'): 9, ord('i'): 10,
-        ord('1'): 11, ord('2'): 12, ord('3'): 13, ord('4'): 14,
-        ord('5'): 15, ord('6'): 16, ord('7'): 17, ord('8'): 18, ord('9'): 19
-    }
-    if key in kinyarwanda_map:
-        number = kinyarwanda_map[key]
-        mode = 1
-        
-    return number, mode
-
 def main():
     args = get_args()
+    config = get_pipeline_config(args.profile).override(
+        camera_width=args.width,
+        camera_height=args.height,
+        min_detection_confidence=args.min_detection_confidence,
+        min_tracking_confidence=args.min_tracking_confidence,
+        detect_every=args.detect_every,
+    )
     cap = cv.VideoCapture(args.device)
-    cap.set(cv.CAP_PROP_FRAME_WIDTH, args.width)
-    cap.set(cv.CAP_PROP_FRAME_HEIGHT, args.height)
+    cap.set(cv.CAP_PROP_FRAME_WIDTH, config.camera_width)
+    cap.set(cv.CAP_PROP_FRAME_HEIGHT, config.camera_height)
     
     audio_translator = AudioTranslator(rate=args.speech_rate, voice_id=args.voice)
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(
-        static_image_mode=args.use_static_image_mode,
-        max_num_hands=2,
-        min_detection_confidence=args.min_detection_confidence,
-        min_tracking_confidence=args.min_tracking_confidence,
+    hands = create_hand_detector(
+        'desktop',
+        args.hand_detector,
+        config.detect_every,
+        **dict(config.hands_options(), static_image_mode=args.use_static_image_mode),
     )
 
     # Initialize classifiers
-    keypoint_classifier = KeyPointClassifier()
+    keypoint_classifier = create_keypoint_classifier()
     point_history_classifier = PointHistoryClassifier()
     sentence_recorder = SentenceRecorder(audio_translator)
-    cv_fps_calc = CvFpsCalc(buffer_len=10)
+    cv_fps_calc = CvFpsCalc(buffer_len=config.fps_buffer_len)
 
-    # Load labels
-    with open('model/keypoint_classifier/keypoint_classifier_label.csv', encoding='utf-8-sig') as f:
-        keypoint_classifier_labels = [row[0] for row in csv.reader(f)]
-    
-    with open('model/point_history_classifier/point_history_classifier_label.csv', encoding='utf-8-sig') as f:
-        point_history_classifier_labels = [row[0] for row in csv.reader(f)]
+    # Labels from the shared vocabulary
+    keypoint_classifier_labels = keypoint_classifier.labels
+    point_history_classifier_labels = point_history_classifier.labels
+
+    # Smooths per-frame predictions before signs reach the sentence, None keeps per-frame emission
+    sign_decoder = create_pipeline_decoder(args.decoder, keypoint_classifier_labels)
+    dynamic_recognizer = create_dynamic_sign_recognizer(args.decoder, args.dynamic_signs)
+    # Opt-in capture of ambiguous frames, None when disabled
+    sample_capture = get_sample_capture(True if args.capture_uncertain else None)
 
     # Initialize variables with proper defaults
     mode = 0
     number = 0
+    recording = False  # Training rows are only logged after k/h
     display_scale = 1.0
     last_gesture_time = time.time()
     point_history = deque([[0, 0] for _ in range(16)], maxlen=16)  # Initialize with zeros
@@ -537,7 +544,7 @@ def main():
 
     while True:
         fps = cv_fps_calc.get()
-        key = cv.waitKey(10)
+        key = cv.waitKey(max(1, int(config.loop_sleep * 1000)))
         
         if key == 27:  # ESC
             break
@@ -551,16 +558,14 @@ def main():
             sentence_recorder.speak_sentence()
             audio_indicator_time = time.time()
         elif key == ord('v'):
-            voices = audio_translator.engine.getProperty('voices')
+            voices = audio_translator.list_voices()
             print("Available voices:")
             for i, voice in enumerate(voices):
                 print(f"{i}: {voice.name} ({voice.id})")
         else:
-            new_number, new_mode = select_mode(key, mode)
+            new_number, mode, recording = select_mode(key, mode, recording)
             if new_number != -1:
                 number = new_number
-            if new_mode is not None:
-                mode = new_mode
 
         ret, image = cap.read()
         if not ret:
@@ -576,6 +581,7 @@ def main():
         results = hands.process(image)
         image.flags.writeable = True
 
+        frame_probabilities = None
         if results.multi_hand_landmarks:
             last_gesture_time = time.time()
             for hand_landmarks, handedness in zip(results.multi_hand_landmarks,
@@ -584,17 +590,17 @@ def main():
                 landmark_list = calc_landmark_list(debug_image, hand_landmarks)
                 pre_processed_landmark_list = pre_process_landmark(landmark_list)
                 pre_processed_point_history_list = pre_process_point_history(debug_image, point_history)
+                if recording:
+                    logging_csv(number, mode, pre_processed_landmark_list, pre_processed_point_history_list)
                 
-                # Get classification results with error handling
-                try:
-                    hand_sign_id, confidence = keypoint_classifier(pre_processed_landmark_list)
-                    hand_sign_id = int(hand_sign_id)
-                    if not 0 <= hand_sign_id < len(keypoint_classifier_labels):
-                        hand_sign_id = 0  # Default to "None"
-                except Exception as e:
-                    print(f"Classification error: {e}")
-                    hand_sign_id = 0
-                    confidence = 0.0
+                hand_sign_id, confidence, probabilities = classify_hand(
+                    keypoint_classifier, pre_processed_landmark_list, len(keypoint_classifier_labels))
+                if sample_capture is not None:
+                    sample_capture.offer(pre_processed_landmark_list, probabilities)
+                if probabilities is not None:
+                    # The decoder sees the strongest evidence from either hand
+                    frame_probabilities = probabilities if frame_probabilities is None \
+                        else np.maximum(frame_probabilities, probabilities)
                 
                 # Only update point history if confidence is high enough
                 if confidence > 0.7 and len(landmark_list) > 8:
@@ -602,10 +608,10 @@ def main():
                 else:
                     point_history.append([0, 0])
 
-                if 0 <= hand_sign_id < len(keypoint_classifier_labels):
+                if sign_decoder is None and 0 <= hand_sign_id < len(keypoint_classifier_labels):
                     recognized_word = keypoint_classifier_labels[hand_sign_id]
-                    if recognized_word not in ["None", "Point"]:
-                        if sentence_recorder.add_word(recognized_word):
+                    if recognized_word not in IGNORED_SIGNS:
+                        if sentence_recorder.add_word(recognized_word, confidence):
                             audio_indicator_time = time.time()
 
                 debug_image = draw_bounding_rect(True, debug_image, brect)
@@ -620,6 +626,11 @@ def main():
         else:
             point_history.append([0, 0])  # Append zeros when no hands detected
 
+        if emit_decoded_sign(sign_decoder, frame_probabilities, keypoint_classifier_labels, sentence_recorder):
+            audio_indicator_time = time.time()
+        if dynamic_recognizer is not None and dynamic_recognizer.update(results, sentence_recorder):
+            audio_indicator_time = time.time()
+
         debug_image = draw_point_history(debug_image, point_history)
         debug_image = draw_info(debug_image, fps, mode, number)
         debug_image = draw_sentence_info(
@@ -634,6 +645,9 @@ def main():
     cap.release()
     cv.destroyAllWindows()
     audio_translator.stop()
+    audio_translator.worker.stop()
+    close_csv_writers()
+    close_sample_capture()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
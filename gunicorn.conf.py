@@ -0,0 +1,58 @@
+"""Gunicorn settings for the Django app, loaded automatically from the project root.
+
+With ``preload_app`` the master imports signova.wsgi once. ``when_ready``
+then loads the TFLite model bytes, the sign vocabulary, the translation
+tables and the sequence classifier weights, and freezes the garbage collector
+before any worker is forked. The workers share those pages copy-on-write and
+load the ML stack (TensorFlow, MediaPipe, OpenCV) themselves after the fork,
+see docs/prefork_models.md.
+
+TensorFlow and MediaPipe are not fork-safe once initialised, so importing
+them in the master is an explicit opt-in: SIGNOVA_PRELOAD_ML=True.
+
+Command-line flags (Procfile, render.yaml) still override these values.
+"""
+import gc
+import os
+
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+timeout = 120
+max_requests = 1000
+max_requests_jitter = 50
+preload_app = os.environ.get('SIGNOVA_PRELOAD_MODELS', 'True').lower() in ('1', 'true')
+PRELOAD_ML = os.environ.get('SIGNOVA_PRELOAD_ML', 'False').lower() in ('1', 'true')
+
+# signova.wsgi runs the ML warm-up when it is imported, which is in the master here. A loading
+# thread does not survive the fork, so the warm-up runs in each worker instead (post_fork).
+ML_WARMUP = os.environ.get('SIGNOVA_ML_WARMUP', 'lazy')
+os.environ['SIGNOVA_ML_WARMUP'] = 'lazy'
+
+
+def when_ready(server):
+    """Runs in the master after the app was imported and before the first fork"""
+    if not server.cfg.preload_app:
+        return
+    from model.shared_models import preload_models
+    from signova_app.ml_runtime import get_ml_runtime, current_rss_mb, STATE_DISABLED
+
+    runtime = get_ml_runtime()
+    preload_ml = PRELOAD_ML and runtime.state != STATE_DISABLED
+    if preload_ml:
+        runtime.require(timeout=None)
+        server.log.info("ML runtime %s in %.2f s", runtime.state, runtime.load_seconds or 0.0)
+    timings = preload_models(import_classifiers=preload_ml)
+    server.log.info("Preloaded %s in %.2f s", ', '.join(timings), sum(timings.values()))
+
+    # Keep everything allocated so far out of the collector, a collection in a
+    # worker would otherwise write to (and un-share) every tracked object's page
+    gc.collect()
+    gc.freeze()
+    server.log.info("Master RSS %.0f MB, %d objects frozen", current_rss_mb() or 0.0, gc.get_freeze_count())
+
+
+def post_fork(server, worker):
+    os.environ['SIGNOVA_ML_WARMUP'] = ML_WARMUP  # Read by signova.wsgi when the worker imports it itself
+    from signova_app.ml_runtime import current_rss_mb, warm_up
+    server.log.info("Worker %s started, RSS %.0f MB", worker.pid, current_rss_mb() or 0.0)
+    if server.cfg.preload_app:
+        warm_up(ML_WARMUP)  # The app and its settings were loaded in the master
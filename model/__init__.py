@@ -1,2 +1,14 @@
-from model.keypoint_classifier.keypoint_classifier import KeyPointClassifier
-from model.point_history_classifier.point_history_classifier import PointHistoryClassifier
\ No newline at end of file
+import importlib
+
+# The classifiers load TensorFlow, so they are only imported when first used.
+# Importing a lightweight submodule such as model.translations stays cheap.
+_LAZY_EXPORTS = {
+    'KeyPointClassifier': 'model.keypoint_classifier.keypoint_classifier',
+    'PointHistoryClassifier': 'model.point_history_classifier.point_history_classifier',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+    raise AttributeError(f"module 'model' has no attribute {name!r}")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Background CSV appender for data-collection logging.
+
+Capture loops hand rows to ``write()``, which only appends to a bounded
+in-memory buffer. A daemon thread appends the buffered rows to the file in
+one batch once ``flush_rows`` rows are waiting or ``flush_interval`` seconds
+have passed. When the buffer is full new rows are dropped and counted rather
+than blocking the caller, with a warning at most every
+``DROP_WARNING_INTERVAL`` seconds. Writers are flushed and fsynced on
+``close()`` and at interpreter exit, where writers that dropped rows or hit
+errors print their stats.
+"""
+import atexit
+import csv
+import os
+import threading
+import time
+
+DROP_WARNING_INTERVAL = 10.0  # Seconds between overflow warnings of one writer
+
+
+class BufferedCsvWriter(object):
+    def __init__(self, path, max_rows=10000, flush_rows=256, flush_interval=1.0):
+        self.path = path
+        self.max_rows = max_rows
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self._rows = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.errors = 0
+        self._last_drop_warning = None
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f"csv-writer:{os.path.basename(path)}")
+        self._thread.start()
+
+    def write(self, row):
+        """Queue one row, returns False when it was dropped"""
+        with self._condition:
+            if self._closed or len(self._rows) >= self.max_rows:
+                self.dropped += 1
+                dropped = self.dropped
+                now = time.monotonic()
+                warn = self._last_drop_warning is None or now - self._last_drop_warning >= DROP_WARNING_INTERVAL
+                if warn:
+                    self._last_drop_warning = now
+            else:
+                self._rows.append(row)
+                if len(self._rows) >= self.flush_rows:
+                    self._condition.notify()
+                return True
+        if warn:
+            print(f"Warning: {self.path} buffer is full, dropping rows ({dropped} dropped so far)")
+        return False
+
+    def _run(self):
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self.flush_interval
+                while not self._closed and len(self._rows) < self.flush_rows:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                rows, self._rows = self._rows, []
+                closed = self._closed
+            if rows:
+                self._append(rows, sync=closed)
+            if closed:
+                return
+
+    def _append(self, rows, sync=False):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', newline='') as f:
+                csv.writer(f).writerows(rows)
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            with self._condition:
+                self.written += len(rows)
+                self.flushes += 1
+        except OSError as e:
+            print(f"Error writing {self.path}: {e}")
+            with self._condition:
+                self.errors += 1
+                self.dropped += len(rows)
+
+    def close(self, timeout=10.0):
+        """Write out every buffered row and stop the thread"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout)
+
+    def stats(self):
+        with self._condition:
+            return {
+                'path': self.path,
+                'pending': len(self._rows),
+                'written': self.written,
+                'dropped': self.dropped,
+                'flushes': self.flushes,
+                'errors': self.errors,
+            }
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_csv_writer(path, **options):
+    """The process-wide writer for a file, so every logger of a file shares one buffer"""
+    key = os.path.abspath(path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or writer._closed:
+            writer = _writers[key] = BufferedCsvWriter(path, **options)
+        return writer
+
+
+def close_csv_writers():
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+        stats = writer.stats()
+        if stats['dropped'] or stats['errors']:
+            print(f"CSV writer lost rows: {stats}")
+
+
+atexit.register(close_csv_writers)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Typed columnar storage for the keypoint and point-history training data.
+
+A store is a directory of immutable chunks, each a pair of ``.npy`` files
+(int16 labels and float32 features), plus ``schema.json`` listing the chunks
+in order. Appending writes a new chunk and then swaps the schema, so readers
+never see a half-written chunk, and every chunk can be memory-mapped.
+
+    python -m model.columnar_store convert model/point_history_classifier/point_history.csv
+    python -m model.columnar_store info model/point_history_classifier/point_history.columnar
+"""
+import argparse
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+SCHEMA_FILE = 'schema.json'
+SCHEMA_VERSION = 1
+LABEL_DTYPE = np.int16
+FEATURE_DTYPE = np.float32
+
+
+def store_path_for(csv_path):
+    """Default store directory next to a CSV, e.g. point_history.csv -> point_history.columnar"""
+    return os.path.splitext(csv_path)[0] + '.columnar'
+
+
+def _is_number(field):
+    try:
+        float(field)
+        return True
+    except ValueError:
+        return False
+
+
+def read_csv_dataset(path):
+    """Parse a label-first training CSV, returns (labels, features, skipped_rows).
+
+    Fields may be whitespace padded. Leading rows that are not numeric, such
+    as the pandas header at the top of point_history1.csv, are skipped.
+    """
+    skipped = 0
+    with open(path, encoding='utf-8-sig') as f:
+        for line in f:
+            fields = [field.strip() for field in line.split(',')]
+            if line.strip() and all(_is_number(field) for field in fields if field):
+                break
+            skipped += 1
+    table = np.loadtxt(path, delimiter=',', dtype=np.float64, skiprows=skipped, ndmin=2, encoding='utf-8-sig')
+    return table[:, 0].astype(LABEL_DTYPE), table[:, 1:].astype(FEATURE_DTYPE), skipped
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+class ColumnarWriter(object):
+    """Appends rows to a store, buffering them into chunks of ``chunk_rows``.
+
+    Thread-safe. Rows are only durable once ``flush()`` (or ``close()``) has
+    written their chunk.
+    """
+
+    def __init__(self, store_path, num_features=None, chunk_rows=4096, source=None, columns=None):
+        self.store_path = store_path
+        self.chunk_rows = chunk_rows
+        self._lock = threading.Lock()
+        os.makedirs(store_path, exist_ok=True)
+        schema_path = os.path.join(store_path, SCHEMA_FILE)
+        if os.path.exists(schema_path):
+            with open(schema_path, encoding='utf-8') as f:
+                self.schema = json.load(f)
+            if num_features is not None and num_features != self.schema['num_features']:
+                raise ValueError(f"{store_path} holds {self.schema['num_features']} features, not {num_features}")
+        else:
+            if num_features is None:
+                raise ValueError("num_features is required for a new store")
+            self.schema = {
+                'version': SCHEMA_VERSION,
+                'label_dtype': np.dtype(LABEL_DTYPE).name,
+                'feature_dtype': np.dtype(FEATURE_DTYPE).name,
+                'num_features': num_features,
+                'source': source,
+                # Optional named feature ranges, e.g. {"landmarks": [0, 42]}
+                'columns': columns or {},
+                'chunks': [],
+            }
+        self.num_features = self.schema['num_features']
+        self._labels = np.empty(chunk_rows, dtype=LABEL_DTYPE)
+        self._features = np.empty((chunk_rows, self.num_features), dtype=FEATURE_DTYPE)
+        self._pending = 0
+
+    @property
+    def rows(self):
+        return sum(chunk['rows'] for chunk in self.schema['chunks']) + self._pending
+
+    def append(self, label, features):
+        with self._lock:
+            self._labels[self._pending] = label
+            self._features[self._pending] = features
+            self._pending += 1
+            if self._pending == self.chunk_rows:
+                self._flush_locked()
+
+    def extend(self, labels, features):
+        """Append many rows at once, full chunks are written directly"""
+        labels = np.asarray(labels, dtype=LABEL_DTYPE)
+        features = np.asarray(features, dtype=FEATURE_DTYPE).reshape(len(labels), self.num_features)
+        with self._lock:
+            start = 0
+            while start < len(labels):
+                take = min(self.chunk_rows - self._pending, len(labels) - start)
+                self._labels[self._pending:self._pending + take] = labels[start:start + take]
+                self._features[self._pending:self._pending + take] = features[start:start + take]
+                self._pending += take
+                start += take
+                if self._pending == self.chunk_rows:
+                    self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        index = len(self.schema['chunks'])
+        names = {'labels': f"labels-{index:05d}.npy", 'features': f"features-{index:05d}.npy"}
+        np.save(os.path.join(self.store_path, names['labels']), self._labels[:self._pending])
+        np.save(os.path.join(self.store_path, names['features']), self._features[:self._pending])
+        self.schema['chunks'].append(dict(rows=self._pending, **names))
+        _write_json(os.path.join(self.store_path, SCHEMA_FILE), self.schema)
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+
+
+class ColumnarDataset(object):
+    """Memory-mapped reader over every chunk of a store"""
+
+    def __init__(self, store_path):
+        self.store_path = store_path
+        with open(os.path.join(store_path, SCHEMA_FILE), encoding='utf-8') as f:
+            self.schema = json.load(f)
+        if self.schema.get('version') != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported store version: {self.schema.get('version')}")
+        self.num_features = self.schema['num_features']
+        self._chunks = [
+            (np.load(os.path.join(store_path, chunk['labels']), mmap_mode='r'),
+             np.load(os.path.join(store_path, chunk['features']), mmap_mode='r'))
+            for chunk in self.schema['chunks']
+        ]
+
+    def __len__(self):
+        return sum(len(labels) for labels, _ in self._chunks)
+
+    def chunks(self):
+        """(labels, features) memory maps, one pair per chunk"""
+        return list(self._chunks)
+
+    def load(self):
+        """All rows as in-memory (labels, features) arrays"""
+        if not self._chunks:
+            return (np.empty(0, dtype=LABEL_DTYPE),
+                    np.empty((0, self.num_features), dtype=FEATURE_DTYPE))
+        if len(self._chunks) == 1:
+            labels, features = self._chunks[0]
+            return np.array(labels), np.array(features)
+        return (np.concatenate([labels for labels, _ in self._chunks]),
+                np.concatenate([features for _, features in self._chunks]))
+
+
+def convert_csv(csv_path, store_path=None, chunk_rows=4096):
+    """Write a CSV's rows into a new store, returns (store_path, rows, skipped_rows)"""
+    store_path = store_path or store_path_for(csv_path)
+    if os.path.exists(os.path.join(store_path, SCHEMA_FILE)):
+        raise ValueError(f"{store_path} already exists")
+    labels, features, skipped = read_csv_dataset(csv_path)
+    writer = ColumnarWriter(store_path, features.shape[1], chunk_rows=max(chunk_rows, 1),
+                            source=os.path.basename(csv_path))
+    writer.extend(labels, features)
+    writer.close()
+    return store_path, len(labels), skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar storage for training CSVs")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    convert = subparsers.add_parser('convert')
+    convert.add_argument('csv', nargs='+')
+    convert.add_argument('--chunk-rows', type=int, default=4096)
+    info = subparsers.add_parser('info')
+    info.add_argument('store')
+    args = parser.parse_args()
+
+    if args.command == 'info':
+        dataset = ColumnarDataset(args.store)
+        labels, _ = dataset.load()
+        counts = dict(zip(*np.unique(labels, return_counts=True)))
+        print(f"{len(dataset)} rows x {dataset.num_features} features in {len(dataset.chunks())} chunks")
+        print("Rows per label: " + ', '.join(f"{label}: {count}" for label, count in counts.items()))
+        return
+
+    for csv_path in args.csv:
+        start = time.perf_counter()
+        store_path, rows, skipped = convert_csv(csv_path, chunk_rows=args.chunk_rows)
+        converted = time.perf_counter() - start
+
+        start = time.perf_counter()
+        labels, features = ColumnarDataset(store_path).load()
+        loaded = time.perf_counter() - start
+        reference_labels, reference_features, _ = read_csv_dataset(csv_path)
+        assert np.array_equal(labels, reference_labels) and np.array_equal(features, reference_features)
+        note = f", skipped {skipped} header rows" if skipped else ""
+        print(f"{csv_path}: {rows} rows x {features.shape[1]} features{note}. "
+              f"CSV parse + write {converted * 1000:.0f} ms, columnar load {loaded * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Keyboard-driven training data logging for the desktop app.
+
+``k`` starts logging key points and ``h`` point history, ``n`` stops. While
+logging, the number keys and the gesture shortcuts pick the class a row is
+labelled with. The shortcuts never start logging themselves, they are also
+used during normal translation and must not append rows to the training set.
+"""
+from model.buffered_csv_writer import get_csv_writer
+
+KEYPOINT_CSV_PATH = 'model/keypoint_classifier/keypoint.csv'
+POINT_HISTORY_CSV_PATH = 'model/point_history_classifier/point_history.csv'
+
+MODE_NORMAL = 0
+MODE_KEYPOINT = 1
+MODE_POINT_HISTORY = 2
+
+GESTURE_KEYS = {
+    ord('o'): 0, ord('c'): 1, ord('p'): 2, ord('k'): 3,
+    ord('a'): 4, ord('b'): 5, ord('d'): 6, ord('g'): 7
+}
+KINYARWANDA_KEYS = {
+    ord('m'): 8, ord('t'): 9, ord('i'): 10,
+    ord('1'): 11, ord('2'): 12, ord('3'): 13, ord('4'): 14,
+    ord('5'): 15, ord('6'): 16, ord('7'): 17, ord('8'): 18, ord('9'): 19
+}
+
+
+def select_mode(key, mode, recording):
+    """Returns (number, mode, recording) after a key press, number is -1 when the key picks no class"""
+    number = -1
+    if key == 110:  # n
+        mode = MODE_NORMAL
+        recording = False
+    elif key == 107:  # k
+        mode = MODE_KEYPOINT
+        recording = True
+    elif key == 104:  # h
+        mode = MODE_POINT_HISTORY
+        recording = True
+    elif key == 108:  # l
+        mode = 3 if mode != 3 else MODE_NORMAL
+
+    if 48 <= key <= 57:  # 0-9
+        number = key - 48
+
+    # Shortcuts only choose the label, logging is turned on with k/h alone
+    if key in GESTURE_KEYS:
+        number = GESTURE_KEYS[key]
+    if key in KINYARWANDA_KEYS:
+        number = KINYARWANDA_KEYS[key]
+
+    return number, mode, recording
+
+
+def logging_csv(number, mode, landmark_list, point_history_list):
+    # Rows are buffered and appended on a background thread, the capture loop never waits on disk
+    if mode == MODE_KEYPOINT and (0 <= number <= 9):
+        get_csv_writer(KEYPOINT_CSV_PATH).write([number, *landmark_list])
+    elif mode == MODE_POINT_HISTORY and (0 <= number <= 9):
+        get_csv_writer(POINT_HISTORY_CSV_PATH).write([number, *point_history_list])
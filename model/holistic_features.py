@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Live feature extraction in the KinyarwandaSigns 1518-d frame layout.
+
+A frame is 33 pose landmarks (x, y, z, visibility) followed by the left and
+right hand landmarks (x, y, z) repeated 11 times, see model/sign_dataset.py.
+The layout has no face mesh, so nothing here ever runs one.
+
+Each component is switched independently:
+
+    'on'    detected and written
+    'zero'  not detected, its slots are left zero so the full layout is kept
+    'skip'  not detected and left out, the output only holds enabled parts
+
+With both hands on and pose skipped the output is the 126 hand features the
+sign sequence classifier reads.
+
+    python -m model.holistic_features [--video clip.mp4] [--frames 200]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from model.sign_dataset import (
+    FEATURE_SIZE, POSE_LANDMARKS, POSE_SIZE, HAND_LANDMARKS, HAND_SIZE, HAND_REPEATS,
+)
+
+COMPONENT_MODES = ('on', 'zero', 'skip')
+# 'holistic' runs one Holistic graph (which always tracks the face as well),
+# 'split' runs the Pose and Hands solutions only for the enabled components
+BACKENDS = ('split', 'holistic')
+
+
+def _write_landmarks(landmarks, out, with_visibility):
+    """Copy a landmark list into an (n, 3) or (n, 4) float32 view"""
+    for i, landmark in enumerate(landmarks.landmark):
+        row = out[i]
+        row[0] = landmark.x
+        row[1] = landmark.y
+        row[2] = landmark.z
+        if with_visibility:
+            row[3] = landmark.visibility
+
+
+class HolisticFeatureExtractor(object):
+    """Writes one frame of features per call into a preallocated float32 buffer.
+
+    ``timings()`` reports the mean cost of each stage in milliseconds so a
+    deployment can pick the cheapest layout its model still works with.
+    """
+
+    def __init__(self, pose='on', hands='on', backend='split', model_complexity=1,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5, graphs=None):
+        if pose not in COMPONENT_MODES or hands not in COMPONENT_MODES:
+            raise ValueError(f"Component modes must be one of {COMPONENT_MODES}")
+        if pose == hands == 'skip':
+            raise ValueError("At least one component must be kept")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        self.modes = {'pose': pose, 'hands': hands}
+        self.backend = backend
+
+        size = 0
+        self._pose = self._hands = None
+        if pose != 'skip':
+            self._pose = slice(size, size + POSE_SIZE)
+            size += POSE_SIZE
+        if hands != 'skip':
+            # The repeated hand blocks are only kept in the full layout
+            repeats = HAND_REPEATS if pose != 'skip' else 1
+            self._hands = slice(size, size + 2 * HAND_SIZE * repeats)
+            size += 2 * HAND_SIZE * repeats
+        self.buffer = np.zeros(size, dtype=np.float32)
+        self.pose_view = self.buffer[self._pose].reshape(POSE_LANDMARKS, 4) if self._pose else None
+        self.hand_blocks = self.buffer[self._hands].reshape(-1, 2 * HAND_SIZE) if self._hands else None
+
+        self._totals = {}
+        self._frames = 0
+        # graphs: already created MediaPipe solutions keyed by 'holistic', 'pose' or 'hands'
+        if graphs is None:
+            graphs = self._create_graphs(model_complexity, min_detection_confidence, min_tracking_confidence)
+        self._graphs = graphs
+
+    @property
+    def size(self):
+        return self.buffer.shape[0]
+
+    @property
+    def full_layout(self):
+        return self.size == FEATURE_SIZE
+
+    def _create_graphs(self, model_complexity, min_detection_confidence, min_tracking_confidence):
+        import mediapipe as mp
+        options = dict(min_detection_confidence=min_detection_confidence,
+                       min_tracking_confidence=min_tracking_confidence)
+        pose_on, hands_on = self.modes['pose'] == 'on', self.modes['hands'] == 'on'
+        graphs = {}
+        if self.backend == 'holistic':
+            if pose_on or hands_on:
+                graphs['holistic'] = mp.solutions.holistic.Holistic(model_complexity=model_complexity, **options)
+            return graphs
+        if pose_on:
+            graphs['pose'] = mp.solutions.pose.Pose(model_complexity=model_complexity, **options)
+        if hands_on:
+            graphs['hands'] = mp.solutions.hands.Hands(
+                max_num_hands=2, model_complexity=min(model_complexity, 1), **options)
+        return graphs
+
+    def _timed(self, stage, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        self._totals[stage] = self._totals.get(stage, 0.0) + time.perf_counter() - start
+        return result
+
+    def extract(self, rgb_image):
+        """Features for one RGB frame, returns the (reused) buffer.
+
+        The returned array is overwritten by the next call, copy it to keep it.
+        """
+        self._frames += 1
+        pose_landmarks = left_hand = right_hand = None
+        multi_hand = None
+        if 'holistic' in self._graphs:
+            results = self._timed('holistic', self._graphs['holistic'].process, rgb_image)
+            pose_landmarks = results.pose_landmarks
+            left_hand, right_hand = results.left_hand_landmarks, results.right_hand_landmarks
+        if 'pose' in self._graphs:
+            pose_landmarks = self._timed('pose', self._graphs['pose'].process, rgb_image).pose_landmarks
+        if 'hands' in self._graphs:
+            multi_hand = self._timed('hands', self._graphs['hands'].process, rgb_image)
+
+        start = time.perf_counter()
+        self.buffer[:] = 0.0
+        if self.modes['pose'] == 'on' and pose_landmarks is not None:
+            _write_landmarks(pose_landmarks, self.pose_view, True)
+        if self.modes['hands'] == 'on':
+            hands = self.hand_blocks[0].reshape(2, HAND_LANDMARKS, 3)
+            if multi_hand is not None and multi_hand.multi_hand_landmarks:
+                for landmarks, handedness in zip(multi_hand.multi_hand_landmarks, multi_hand.multi_handedness):
+                    side = 0 if handedness.classification[0].label == 'Left' else 1
+                    _write_landmarks(landmarks, hands[side], False)
+            for side, landmarks in enumerate((left_hand, right_hand)):
+                if landmarks is not None:
+                    _write_landmarks(landmarks, hands[side], False)
+            if len(self.hand_blocks) > 1:
+                self.hand_blocks[1:] = self.hand_blocks[0]
+        self._totals['pack'] = self._totals.get('pack', 0.0) + time.perf_counter() - start
+        return self.buffer
+
+    def timings(self):
+        """Mean milliseconds per frame for each stage"""
+        frames = max(self._frames, 1)
+        return {stage: total * 1000.0 / frames for stage, total in self._totals.items()}
+
+    def reset_timings(self):
+        self._totals = {}
+        self._frames = 0
+
+    def close(self):
+        for graph in self._graphs.values():
+            graph.close()
+        self._graphs = {}
+
+
+PROFILE_CONFIGS = (
+    ('holistic, full layout', dict(backend='holistic')),
+    ('pose + hands, full layout', dict()),
+    ('hands only, pose zero-filled', dict(pose='zero')),
+    ('hands only, compact', dict(pose='skip')),
+    ('pose only, hands zero-filled', dict(hands='zero')),
+)
+
+
+def profile(frames, configs=PROFILE_CONFIGS):
+    """Run every configuration over the same RGB frames, returns [(name, size, {stage: ms})]"""
+    report = []
+    for name, options in configs:
+        extractor = HolisticFeatureExtractor(**options)
+        extractor.extract(frames[0])  # Graph warm-up
+        extractor.reset_timings()
+        for frame in frames:
+            extractor.extract(frame)
+        report.append((name, extractor.size, extractor.timings()))
+        extractor.close()
+    return report
+
+
+def main():
+    import cv2 as cv
+
+    parser = argparse.ArgumentParser(description="Profile holistic feature extraction per component")
+    parser.add_argument('--video', default=None, help="Recorded clip, the camera is used when omitted")
+    parser.add_argument('--device', type=int, default=0)
+    parser.add_argument('--frames', type=int, default=200)
+    args = parser.parse_args()
+
+    cap = cv.VideoCapture(args.video if args.video else args.device)
+    frames = []
+    while len(frames) < args.frames:
+        ret, image = cap.read()
+        if not ret:
+            break
+        frames.append(cv.cvtColor(cv.flip(image, 1), cv.COLOR_BGR2RGB))
+    cap.release()
+    if not frames:
+        raise SystemExit("No frames could be read")
+
+    for name, size, timings in profile(frames):
+        total = sum(timings.values())
+        stages = ', '.join(f"{stage} {ms:.2f} ms" for stage, ms in sorted(timings.items()))
+        print(f"{name:32s} {size:5d} features  {total:7.2f} ms/frame  ({stages})")
+
+
+if __name__ == '__main__':
+    main()
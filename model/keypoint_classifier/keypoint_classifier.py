@@ -1,20 +1,22 @@
 import numpy as np
-import csv
 import os
 
+from model.buffered_csv_writer import get_csv_writer
+from model.shared_models import get_model_bytes
+from model.sign_vocabulary import get_sign_vocabulary, read_label_csv, KEYPOINT_LABEL_PATH
+
 # Check if we're on Render deployment
 RENDER_DEPLOYMENT = (os.environ.get('RENDER_EXTERNAL_HOSTNAME') is not None or 
                     os.environ.get('RENDER', 'False').lower() == 'true' or
                     os.environ.get('SIGNOVA_DISABLE_ML', 'False').lower() == 'true')
 
 # Conditionally import TensorFlow
+tf = None
 if not RENDER_DEPLOYMENT:
     try:
         import tensorflow as tf
     except ImportError:
         print("TensorFlow not available")
-else:
-    tf = None
 
 class KeyPointClassifier:
     def __init__(
@@ -29,8 +31,9 @@ class KeyPointClassifier:
         # Only initialize TensorFlow if not on Render
         if not RENDER_DEPLOYMENT and tf is not None:
             try:
+                # Built from the process-wide model bytes, shared with other interpreters
                 self.interpreter = tf.lite.Interpreter(
-                    model_path=model_path,
+                    model_content=get_model_bytes(model_path),
                     num_threads=num_threads
                 )
                 self.interpreter.allocate_tensors()
@@ -39,19 +42,28 @@ class KeyPointClassifier:
             except Exception as e:
                 print(f"Error initializing TensorFlow: {e}")
         
-        # Load labels
+        # Labels come from the shared vocabulary unless the model ships its own
         try:
             label_path = os.path.join(os.path.dirname(model_path), 'keypoint_classifier_label.csv')
-            with open(label_path, encoding='utf-8-sig') as f:
-                self.labels = [row[0] for row in csv.reader(f)]
+            if os.path.abspath(label_path) == KEYPOINT_LABEL_PATH:
+                self.labels = get_sign_vocabulary().keypoint_labels
+            else:
+                self.labels = tuple(read_label_csv(label_path)[0])
         except Exception as e:
             print(f"Error loading labels: {e}")
-            self.labels = []
+            self.labels = ()
 
     def __call__(self, landmark_list):
         # If we're on Render or TensorFlow is not available, return a default value
-        if RENDER_DEPLOYMENT or self.interpreter is None:
+        probabilities = self.predict_proba(landmark_list)
+        if probabilities is None:
             return 0  # Return default gesture (e.g., "Open" or "Unknown")
+        return np.argmax(probabilities)
+
+    def predict_proba(self, landmark_list):
+        """Class probabilities for one landmark vector, None when no model is loaded"""
+        if RENDER_DEPLOYMENT or self.interpreter is None:
+            return None
             
         try:
             input_details_tensor_index = self.input_details[0]['index']
@@ -62,15 +74,11 @@ class KeyPointClassifier:
 
             output_details_tensor_index = self.output_details[0]['index']
             result = self.interpreter.get_tensor(output_details_tensor_index)
-            result_index = np.argmax(np.squeeze(result))
-            return result_index
+            return np.squeeze(result).astype(np.float32)
         except Exception as e:
             print(f"Error in KeyPointClassifier inference: {e}")
-            return 0  # Return default gesture on error
+            return None
 
     def save_landmark(self, landmark_list, label, save_path='model/keypoint_classifier/keypoint.csv'):
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        with open(save_path, 'a', newline='') as f:
-            writer = csv.writer(f)
-            row = [label] + landmark_list
-            writer.writerow(row)
\ No newline at end of file
+        # Buffered and appended in batches on a background thread
+        get_csv_writer(save_path).write([label] + landmark_list)
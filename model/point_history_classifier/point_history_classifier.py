@@ -1,6 +1,9 @@
 import os
 import numpy as np
-import csv
+
+from model.buffered_csv_writer import get_csv_writer
+from model.shared_models import get_model_bytes
+from model.sign_vocabulary import get_sign_vocabulary, read_label_csv, POINT_HISTORY_LABEL_PATH
 
 # Check if we're on Render deployment
 RENDER_DEPLOYMENT = (os.environ.get('RENDER_EXTERNAL_HOSTNAME') is not None or 
@@ -33,13 +36,25 @@ class PointHistoryClassifier(object):
         # Only initialize TensorFlow if not on Render
         if not RENDER_DEPLOYMENT and tf is not None:
             try:
-                self.interpreter = tf.lite.Interpreter(model_path=model_path,
+                # Built from the process-wide model bytes, shared with other interpreters
+                self.interpreter = tf.lite.Interpreter(model_content=get_model_bytes(model_path),
                                                    num_threads=num_threads)
                 self.interpreter.allocate_tensors()
                 self.input_details = self.interpreter.get_input_details()
                 self.output_details = self.interpreter.get_output_details()
             except Exception as e:
                 print(f"Error initializing TensorFlow: {e}")
+        
+        # Labels come from the shared vocabulary unless the model ships its own
+        try:
+            label_path = os.path.join(os.path.dirname(model_path), 'point_history_classifier_label.csv')
+            if os.path.abspath(label_path) == POINT_HISTORY_LABEL_PATH:
+                self.labels = get_sign_vocabulary().point_history_labels
+            else:
+                self.labels = tuple(read_label_csv(label_path)[0])
+        except Exception as e:
+            print(f"Error loading labels: {e}")
+            self.labels = ()
 
     def __call__(self, point_history):
         # If we're on Render or TensorFlow is not available, return a default value
@@ -65,8 +80,5 @@ class PointHistoryClassifier(object):
 
     def save_point_history(self, point_history, label, save_path='dataset/point_history.csv'):
         """Append new point history with label to dataset."""
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        with open(save_path, 'a', newline='') as f:
-            writer = csv.writer(f)
-            row = [label] + point_history
-            writer.writerow(row)
+        # Buffered and appended in batches on a background thread
+        get_csv_writer(save_path).write([label] + point_history)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Capture of ambiguous keypoint classifications for active learning.
+
+Frames whose top keypoint probability falls inside [low, high) keep their
+pre-processed landmarks and full probability vector in a fixed-size ring of
+NumPy arrays. A background thread spills the ring to a columnar store
+(model/columnar_store.py) in batches: the predicted class is the label and
+the features are the landmarks followed by the probabilities.
+
+Opt in with SIGNOVA_CAPTURE_UNCERTAIN=1 (or app3 --capture_uncertain). The
+live loop only pays for an argmax and, inside the band, one row copy.
+
+A store has a single writer, so each process (e.g. every gunicorn worker)
+spills to its own ``process-<pid>`` store under SIGNOVA_CAPTURE_PATH and
+load_captured_samples() reads them all back.
+"""
+import atexit
+import os
+import threading
+import time
+
+import numpy as np
+
+from model.columnar_store import ColumnarDataset, ColumnarWriter, SCHEMA_FILE
+
+CAPTURE_ENABLED = os.environ.get('SIGNOVA_CAPTURE_UNCERTAIN', 'False').lower() in ('1', 'true')
+DEFAULT_CAPTURE_PATH = os.environ.get(
+    'SIGNOVA_CAPTURE_PATH', os.path.join('instance', 'uncertain_samples.columnar'))
+LANDMARK_FEATURES = 42
+
+
+def process_store_path(root=None):
+    """This process's store under the capture root"""
+    return os.path.join(root or DEFAULT_CAPTURE_PATH, f'process-{os.getpid()}')
+
+
+class UncertainSampleCapture(object):
+    def __init__(self, store_path=None, num_classes=None, low=0.4, high=0.7,
+                 capacity=1024, spill_rows=128, spill_interval=5.0):
+        self.store_path = store_path
+        self.low = low
+        self.high = high
+        self.capacity = capacity
+        self.spill_rows = spill_rows
+        self.spill_interval = spill_interval
+        self.num_classes = num_classes
+        self._landmarks = np.zeros((capacity, LANDMARK_FEATURES), dtype=np.float32)
+        self._probabilities = None
+        self._predicted = np.zeros(capacity, dtype=np.int16)
+        self._head = 0  # Samples captured so far, the next slot is head % capacity
+        self._spilled = 0  # Samples handed to the store so far
+        self.offered = 0
+        self.overwritten = 0
+        self._writer = None
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True, name='uncertain-capture')
+        self._thread.start()
+        if num_classes:
+            self._allocate(num_classes)
+
+    def _allocate(self, num_classes):
+        self.num_classes = num_classes
+        self._probabilities = np.zeros((self.capacity, num_classes), dtype=np.float32)
+
+    def offer(self, landmarks, probabilities):
+        """Keep the frame if its confidence is ambiguous, returns True when captured"""
+        if probabilities is None:
+            return False
+        self.offered += 1
+        predicted = int(np.argmax(probabilities))
+        confidence = probabilities[predicted]
+        if not self.low <= confidence < self.high:
+            return False
+        with self._condition:
+            if self._closed:
+                return False
+            if self._probabilities is None or len(probabilities) != self.num_classes:
+                if self._head != self._spilled:
+                    return False  # Keep the ring consistent until it has been spilled
+                self._allocate(len(probabilities))
+            slot = self._head % self.capacity
+            self._landmarks[slot] = landmarks
+            self._probabilities[slot] = probabilities
+            self._predicted[slot] = predicted
+            self._head += 1
+            if self._head - self._spilled > self.capacity:
+                # The spill thread fell behind, the oldest sample is gone
+                self._spilled = self._head - self.capacity
+                self.overwritten += 1
+            if self._head - self._spilled >= self.spill_rows:
+                self._condition.notify()
+        return True
+
+    def _take(self):
+        """Copy the unspilled samples out of the ring, called with the lock held"""
+        start, end = self._spilled, self._head
+        slots = np.arange(start, end) % self.capacity
+        self._spilled = end
+        return self._predicted[slots], np.hstack([self._landmarks[slots], self._probabilities[slots]])
+
+    def _run(self):
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self.spill_interval
+                while not self._closed and self._head - self._spilled < self.spill_rows:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._take() if self._head > self._spilled else None
+                closed = self._closed
+            if batch is not None:
+                self._spill(*batch)
+            if closed:
+                if self._writer is not None:
+                    self._writer.close()
+                return
+
+    def _spill(self, labels, features):
+        try:
+            if self._writer is None:
+                # Resolved on the first spill, after any fork, so workers never share a store
+                if self.store_path is None:
+                    self.store_path = process_store_path()
+                columns = {'landmarks': [0, LANDMARK_FEATURES],
+                           'probabilities': [LANDMARK_FEATURES, features.shape[1]]}
+                self._writer = ColumnarWriter(self.store_path, features.shape[1], chunk_rows=self.spill_rows,
+                                              source='uncertain keypoint samples', columns=columns)
+            self._writer.extend(labels, features)
+            self._writer.flush()
+        except (OSError, ValueError) as e:
+            print(f"Error spilling uncertain samples: {e}")
+
+    def close(self, timeout=10.0):
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout)
+
+    def stats(self):
+        with self._condition:
+            return {
+                'offered': self.offered,
+                'captured': self._head,
+                'spilled': self._spilled,
+                'overwritten': self.overwritten,
+                'band': [self.low, self.high],
+            }
+
+
+def captured_store_paths(store_path=DEFAULT_CAPTURE_PATH):
+    """The store itself, or every per-process store under a capture root"""
+    if os.path.exists(os.path.join(store_path, SCHEMA_FILE)):
+        return [store_path]
+    if not os.path.isdir(store_path):
+        return []
+    return [os.path.join(store_path, name) for name in sorted(os.listdir(store_path))
+            if os.path.exists(os.path.join(store_path, name, SCHEMA_FILE))]
+
+
+def load_captured_samples(store_path=DEFAULT_CAPTURE_PATH):
+    """Returns (predicted, landmarks, probabilities) arrays of every spilled sample"""
+    predicted, features = [], []
+    for path in captured_store_paths(store_path):
+        labels, rows = ColumnarDataset(path).load()
+        if features and rows.shape[1] != features[0].shape[1]:
+            print(f"Skipping {path}: {rows.shape[1]} features, not {features[0].shape[1]}")
+            continue
+        predicted.append(labels)
+        features.append(rows)
+    if not features:
+        predicted = [np.empty(0, dtype=np.int16)]
+        features = [np.empty((0, LANDMARK_FEATURES), dtype=np.float32)]
+    features = np.concatenate(features)
+    return np.concatenate(predicted), features[:, :LANDMARK_FEATURES], features[:, LANDMARK_FEATURES:]
+
+
+_capture = None
+_capture_lock = threading.Lock()
+
+
+def get_sample_capture(enabled=None, **options):
+    """The process-wide capture stage, None unless enabled.
+
+    Every pipeline in the process shares it, so they append to one store.
+    Other processes get their own, see process_store_path().
+    """
+    global _capture
+    if not (CAPTURE_ENABLED if enabled is None else enabled):
+        return None
+    with _capture_lock:
+        if _capture is None or _capture._closed:
+            _capture = UncertainSampleCapture(**options)
+        return _capture
+
+
+def close_sample_capture():
+    global _capture
+    with _capture_lock:
+        capture, _capture = _capture, None
+    if capture is not None:
+        capture.close()
+
+
+atexit.register(close_sample_capture)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Streaming training batches over the packed sign-sequence dataset.
+
+Batches are gathered by index straight from the memory-mapped pack, so only
+the batch being built is ever resident. A background thread can prefetch
+batches while the caller trains, and augmentation runs as whole-batch NumPy
+operations.
+
+    python -m model.sequence_loader [--batch-size 32] [--step-ms 5]
+"""
+import argparse
+import queue
+import threading
+import time
+
+import numpy as np
+
+from model.sign_dataset import (
+    DEFAULT_PACKED_DIR, FEATURE_SIZE, POSE_LANDMARKS, POSE_SIZE, HAND_LANDMARKS, HAND_REPEATS,
+    load_packed_dataset,
+)
+
+# MediaPipe pose landmark index of the mirrored body part
+POSE_MIRROR = np.array([0, 4, 5, 6, 1, 2, 3, 8, 7, 10, 9, 12, 11, 14, 13, 16, 15, 18, 17, 20, 19,
+                        22, 21, 24, 23, 26, 25, 28, 27, 30, 29, 32, 31])
+
+
+def _feature_tables():
+    """Per-feature lookup tables so augmentation runs over whole contiguous frames.
+
+    Returns (mirror permutation, x coordinate mask, x/y/z coordinate mask,
+    scaling centre), each of length FEATURE_SIZE.
+    """
+    pose = np.arange(POSE_SIZE).reshape(POSE_LANDMARKS, 4)
+    hands = np.arange(POSE_SIZE, FEATURE_SIZE).reshape(HAND_REPEATS, 2, HAND_LANDMARKS * 3)
+    permutation = np.concatenate([pose[POSE_MIRROR].ravel(), hands[:, ::-1].ravel()])
+    axis = np.concatenate([np.tile([0, 1, 2, 3], POSE_LANDMARKS),
+                           np.tile([0, 1, 2], HAND_REPEATS * 2 * HAND_LANDMARKS)])
+    centre = np.where(axis < 2, 0.5, 0.0).astype(np.float32)
+    return permutation, axis == 0, axis < 3, centre
+
+
+MIRROR_PERMUTATION, X_FEATURES, COORDINATE_FEATURES, SCALE_CENTRE = _feature_tables()
+
+
+def stratified_split(labels, val_fraction=0.2, seed=0):
+    """Train and validation indices with every sign in both, in the same proportion"""
+    labels = np.asarray(labels)
+    rng = np.random.default_rng(seed)
+    train, val = [], []
+    for label in np.unique(labels):
+        members = rng.permutation(np.flatnonzero(labels == label))
+        n_val = int(round(len(members) * val_fraction))
+        if 0 < val_fraction and len(members) > 1:
+            n_val = min(max(n_val, 1), len(members) - 1)
+        val.append(members[:n_val])
+        train.append(members[n_val:])
+    return np.sort(np.concatenate(train)), np.sort(np.concatenate(val))
+
+
+class SequenceAugmenter(object):
+    """Random temporal jitter, scale and mirror applied to a whole batch.
+
+    Coordinates are scaled and mirrored around the image centre, landmarks
+    that were not detected (all zeros) stay zero. Mirroring also swaps the
+    left and right hand blocks and the left and right pose landmarks.
+    """
+
+    def __init__(self, max_shift=2, scale_range=(0.9, 1.1), mirror_probability=0.5, seed=None):
+        self.max_shift = max_shift
+        self.scale_range = scale_range
+        self.mirror_probability = mirror_probability
+        self.rng = np.random.default_rng(seed)
+
+    def __call__(self, batch):
+        """Augment a (batch, frames, features) float32 array, returns the augmented array"""
+        batch_size, frames = batch.shape[:2]
+        if self.max_shift:
+            shifts = self.rng.integers(-self.max_shift, self.max_shift + 1, size=(batch_size, 1))
+            frame_index = np.clip(np.arange(frames) + shifts, 0, frames - 1)
+            batch = batch[np.arange(batch_size)[:, None], frame_index]
+
+        if self.scale_range:
+            scale = self.rng.uniform(*self.scale_range, size=(batch_size, 1, 1)).astype(batch.dtype)
+            # Visibility keeps a factor of 1, undetected landmarks (zeros) stay zero
+            factors = 1.0 + (scale - 1.0) * COORDINATE_FEATURES
+            scaled = (batch - SCALE_CENTRE) * factors + SCALE_CENTRE
+            np.copyto(batch, scaled, where=batch != 0)
+
+        if self.mirror_probability:
+            mirrored = np.flatnonzero(self.rng.random(batch_size) < self.mirror_probability)
+            if len(mirrored):
+                flipped = batch[mirrored][..., MIRROR_PERMUTATION]
+                np.subtract(1.0, flipped, out=flipped, where=X_FEATURES & (flipped != 0))
+                batch[mirrored] = flipped
+        return batch
+
+
+class SequenceBatchLoader(object):
+    """Iterable of (sequences, labels) batches over part of a packed dataset.
+
+    Each pass over the loader is one epoch, reshuffled when ``shuffle`` is
+    set. With ``prefetch`` > 0 batches are built on a background thread up to
+    ``prefetch`` batches ahead of the consumer.
+    """
+
+    def __init__(self, dataset, indices=None, batch_size=32, shuffle=True, augment=None,
+                 prefetch=2, drop_last=False, seed=None):
+        self.dataset = dataset
+        self.indices = np.arange(len(dataset)) if indices is None else np.asarray(indices)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.augment = augment
+        self.prefetch = prefetch
+        self.drop_last = drop_last
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        if self.drop_last:
+            return len(self.indices) // self.batch_size
+        return -(-len(self.indices) // self.batch_size)
+
+    def _batches(self):
+        order = self.rng.permutation(self.indices) if self.shuffle else self.indices
+        for start in range(0, len(self) * self.batch_size, self.batch_size):
+            # Sorted gathers read the mmap front to back, the batch order is random anyway
+            batch_indices = np.sort(order[start:start + self.batch_size])
+            sequences, labels = self.dataset.batch(batch_indices)
+            if self.augment is not None:
+                sequences = self.augment(sequences)
+            yield sequences, labels.astype(np.int32)
+
+    def __iter__(self):
+        if not self.prefetch:
+            return self._batches()
+        return self._prefetched()
+
+    def _prefetched(self):
+        batches = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        done = object()
+
+        def produce():
+            try:
+                for batch in self._batches():
+                    while not stop.is_set():
+                        try:
+                            batches.put(batch, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        return
+            except Exception as e:
+                batches.put(e)
+                return
+            batches.put(done)
+
+        thread = threading.Thread(target=produce, daemon=True, name='sequence-prefetch')
+        thread.start()
+        try:
+            while True:
+                batch = batches.get()
+                if batch is done:
+                    return
+                if isinstance(batch, Exception):
+                    raise batch
+                yield batch
+        finally:
+            # The consumer stopped early, let the producer exit
+            stop.set()
+
+    def as_tf_dataset(self):
+        """The same batches as a ``tf.data.Dataset``, one epoch per iteration"""
+        import tensorflow as tf
+        frames, features = self.dataset.shape[1:]
+        return tf.data.Dataset.from_generator(
+            lambda: iter(self),
+            output_signature=(
+                tf.TensorSpec(shape=(None, frames, features), dtype=tf.float32),
+                tf.TensorSpec(shape=(None,), dtype=tf.int32),
+            ),
+        )
+
+
+def create_loaders(packed_dir=DEFAULT_PACKED_DIR, batch_size=32, val_fraction=0.2, augment=True,
+                   prefetch=2, seed=0):
+    """Train and validation loaders split by sign, augmentation on the train side only"""
+    dataset = load_packed_dataset(packed_dir)
+    train_indices, val_indices = stratified_split(dataset.labels, val_fraction, seed)
+    augmenter = SequenceAugmenter(seed=seed) if augment else None
+    train = SequenceBatchLoader(dataset, train_indices, batch_size, shuffle=True, augment=augmenter,
+                                prefetch=prefetch, seed=seed)
+    val = SequenceBatchLoader(dataset, val_indices, batch_size, shuffle=False, prefetch=prefetch)
+    return train, val
+
+
+def measure_throughput(loader, epochs=3, step_seconds=0.0):
+    """Sequences per second through the loader, sleeping step_seconds per batch to stand in for training"""
+    sequences = 0
+    start = time.perf_counter()
+    for _ in range(epochs):
+        for batch, _ in loader:
+            sequences += len(batch)
+            if step_seconds:
+                time.sleep(step_seconds)
+    return sequences / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure input pipeline throughput over the packed dataset")
+    parser.add_argument('--packed', default=DEFAULT_PACKED_DIR)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--step-ms', type=float, default=5.0, help="Simulated training time per batch")
+    args = parser.parse_args()
+
+    for augment in (False, True):
+        for prefetch in (0, 2):
+            train, _ = create_loaders(args.packed, args.batch_size, augment=augment, prefetch=prefetch)
+            rate = measure_throughput(train, args.epochs, args.step_ms / 1000.0)
+            print(f"augment={'on ' if augment else 'off'} prefetch={prefetch}: {rate:8.0f} sequences/s")
+
+
+if __name__ == '__main__':
+    main()
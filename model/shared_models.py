@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Read-only model state that can be loaded once and shared by forked workers.
+
+TFLite interpreters are neither thread-safe nor safe to carry across a fork,
+but the flatbuffer they execute is read-only. Each ``.tflite`` file is read
+once per process into a bytes object and every interpreter is built from it
+with ``model_content``. When gunicorn's master calls ``preload_models()``
+before forking, the workers share those pages copy-on-write and only
+allocate their own interpreters and tensor arenas.
+"""
+import os
+import threading
+import time
+
+KEYPOINT_MODEL_PATH = 'model/keypoint_classifier/keypoint_classifier.tflite'
+POINT_HISTORY_MODEL_PATH = 'model/point_history_classifier/point_history_classifier.tflite'
+
+_model_bytes = {}
+_model_bytes_lock = threading.Lock()
+
+
+def get_model_bytes(model_path):
+    """Contents of a model file, read once per process"""
+    key = os.path.abspath(model_path)
+    with _model_bytes_lock:
+        content = _model_bytes.get(key)
+        if content is None:
+            with open(key, 'rb') as f:
+                content = _model_bytes[key] = f.read()
+        return content
+
+
+def preload_models(model_paths=(KEYPOINT_MODEL_PATH, POINT_HISTORY_MODEL_PATH), import_classifiers=False):
+    """Load every shareable piece of model state, returns {name: seconds}.
+
+    Covers the TFLite flatbuffers, the sign vocabulary, the translation
+    tables and the sign sequence classifier weights. ``import_classifiers``
+    also imports the classifier modules, and with them TensorFlow unless ML
+    is disabled. Nothing here starts a thread.
+    """
+    timings = {}
+
+    def timed(name, function, *args):
+        start = time.perf_counter()
+        function(*args)
+        timings[name] = time.perf_counter() - start
+
+    from model.sign_vocabulary import get_sign_vocabulary
+    from model.translations import get_translation_tables
+    from model.sign_sequence_classifier.sign_sequence_classifier import get_sign_sequence_classifier
+
+    if import_classifiers:
+        timed('classifier modules', _import_classifiers)
+    for path in model_paths:
+        if os.path.exists(path):
+            timed(os.path.basename(path), get_model_bytes, path)
+    timed('sign vocabulary', get_sign_vocabulary)
+    timed('translation tables', get_translation_tables)
+    timed('sign sequence classifier', get_sign_sequence_classifier)
+    return timings
+
+
+def _import_classifiers():
+    import model.keypoint_classifier.keypoint_classifier  # noqa: F401
+    import model.point_history_classifier.point_history_classifier  # noqa: F401
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Packed KinyarwandaSigns sequence dataset.
+
+The raw dataset is one ``(1518,)`` float64 ``.npy`` file per frame laid out as
+``Data/<sign>/<sequence>/<frame>.npy``. Packing writes every sequence into one
+contiguous ``(sequences, 30, 1518)`` array file plus a JSON index, so the whole
+dataset is opened with a single memory map.
+
+Some sequence folders also hold ``<frame>-<suffix>.npy`` copies of the frames,
+only the canonical ``<frame>.npy`` files are packed.
+
+    python -m model.sign_dataset pack [--dtype float16]
+    python -m model.sign_dataset verify
+"""
+import argparse
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+from model.sign_vocabulary import KINYARWANDA_SIGNS_PATH, MODEL_DIR
+
+SEQUENCE_LENGTH = 30
+# Frame layout: 33 pose landmarks (x, y, z, visibility), then the left and
+# right hand landmarks (21 x, y, z each) repeated 11 times
+POSE_LANDMARKS = 33
+POSE_SIZE = POSE_LANDMARKS * 4
+HAND_LANDMARKS = 21
+HAND_SIZE = HAND_LANDMARKS * 3
+HAND_REPEATS = 11
+FEATURE_SIZE = POSE_SIZE + 2 * HAND_SIZE * HAND_REPEATS
+PACKED_DTYPES = ('float32', 'float16')
+DEFAULT_PACKED_DIR = os.environ.get(
+    'SIGNOVA_PACKED_SIGNS', os.path.join(MODEL_DIR, 'KinyarwandaSigns', 'packed'))
+SEQUENCES_FILE = 'sequences.npy'
+INDEX_FILE = 'index.json'
+
+_FRAME_RE = re.compile(r'^(\d+)\.npy$')
+
+
+def _sort_key(name):
+    return (0, int(name), '') if name.isdigit() else (1, 0, name)
+
+
+def discover_sequences(data_path=KINYARWANDA_SIGNS_PATH, sequence_length=SEQUENCE_LENGTH):
+    """Returns ([(sign, sequence_id, [frame paths])], skipped) in a stable order.
+
+    Sequences missing any of the ``sequence_length`` canonical frames are
+    reported in ``skipped`` instead of being packed.
+    """
+    sequences, skipped = [], []
+    for sign in sorted(os.listdir(data_path)):
+        sign_path = os.path.join(data_path, sign)
+        if not os.path.isdir(sign_path):
+            continue
+        for sequence_id in sorted(os.listdir(sign_path), key=_sort_key):
+            sequence_path = os.path.join(sign_path, sequence_id)
+            if not os.path.isdir(sequence_path):
+                continue
+            frames = {}
+            for name in os.listdir(sequence_path):
+                match = _FRAME_RE.match(name)
+                if match:
+                    frames[int(match.group(1))] = os.path.join(sequence_path, name)
+            if all(i in frames for i in range(sequence_length)):
+                sequences.append((sign, sequence_id, [frames[i] for i in range(sequence_length)]))
+            else:
+                skipped.append((sign, sequence_id, len(frames)))
+    return sequences, skipped
+
+
+class PackedSignDataset(object):
+    """Read-only view of a packed dataset.
+
+    ``sequences`` is an ``np.memmap`` of shape (sequences, frames, features),
+    ``labels`` holds the index of each sequence's sign in ``signs``.
+    """
+
+    def __init__(self, packed_dir=DEFAULT_PACKED_DIR):
+        self.packed_dir = packed_dir
+        with open(os.path.join(packed_dir, INDEX_FILE), encoding='utf-8') as f:
+            index = json.load(f)
+        self.signs = tuple(index['signs'])
+        self.labels = np.asarray(index['labels'], dtype=np.int16)
+        self.sequence_ids = tuple(index['sequence_ids'])
+        self.sequences = np.load(os.path.join(packed_dir, SEQUENCES_FILE), mmap_mode='r')
+        if self.sequences.shape[0] != len(self.labels):
+            raise ValueError(f"Index has {len(self.labels)} entries but {packed_dir} holds "
+                             f"{self.sequences.shape[0]} sequences")
+
+    def __len__(self):
+        return self.sequences.shape[0]
+
+    def __getitem__(self, i):
+        return self.sequences[i], int(self.labels[i])
+
+    @property
+    def shape(self):
+        return self.sequences.shape
+
+    def batch(self, indices, dtype=np.float32, out=None):
+        """Gather sequences by index into a float array (``out`` is reused when given)"""
+        indices = np.asarray(indices)
+        if out is None:
+            out = np.empty((len(indices),) + self.sequences.shape[1:], dtype=dtype)
+        for k, i in enumerate(indices):
+            out[k] = self.sequences[i]  # Row copies cast straight into out, no temporaries
+        return out, self.labels[indices]
+
+
+def load_packed_dataset(packed_dir=DEFAULT_PACKED_DIR):
+    return PackedSignDataset(packed_dir)
+
+
+def pack_dataset(data_path=KINYARWANDA_SIGNS_PATH, packed_dir=DEFAULT_PACKED_DIR, dtype='float32',
+                 sequence_length=SEQUENCE_LENGTH):
+    """Write the packed array and index, returns the index dict"""
+    if dtype not in PACKED_DTYPES:
+        raise ValueError(f"Unsupported dtype: {dtype}")
+    sequences, skipped = discover_sequences(data_path, sequence_length)
+    if not sequences:
+        raise ValueError(f"No complete sequences found in {data_path}")
+    for sign, sequence_id, found in skipped:
+        print(f"Skipping {sign}/{sequence_id}: {found} of {sequence_length} frames")
+    feature_size = np.load(sequences[0][2][0]).shape[-1]
+
+    os.makedirs(packed_dir, exist_ok=True)
+    signs = sorted({sign for sign, _, _ in sequences})
+    sign_ids = {sign: i for i, sign in enumerate(signs)}
+    tmp_path = os.path.join(packed_dir, SEQUENCES_FILE + '.tmp')
+    packed = np.lib.format.open_memmap(
+        tmp_path, mode='w+', dtype=dtype, shape=(len(sequences), sequence_length, feature_size))
+    for i, (_, _, frames) in enumerate(sequences):
+        for j, path in enumerate(frames):
+            packed[i, j] = np.load(path)
+    packed.flush()
+    del packed
+    os.replace(tmp_path, os.path.join(packed_dir, SEQUENCES_FILE))
+
+    index = {
+        'dtype': dtype,
+        'shape': [len(sequences), sequence_length, feature_size],
+        'signs': signs,
+        'labels': [sign_ids[sign] for sign, _, _ in sequences],
+        'sequence_ids': [f"{sign}/{sequence_id}" for sign, sequence_id, _ in sequences],
+    }
+    with open(os.path.join(packed_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1)
+    return index
+
+
+def verify_packed(data_path=KINYARWANDA_SIGNS_PATH, packed_dir=DEFAULT_PACKED_DIR):
+    """Compare every packed frame with its source file, returns the mismatching sequence ids.
+
+    Frames must equal the originals cast to the packed dtype exactly.
+    """
+    dataset = PackedSignDataset(packed_dir)
+    sequences, _ = discover_sequences(data_path, dataset.shape[1])
+    mismatches = []
+    if [f"{sign}/{sequence_id}" for sign, sequence_id, _ in sequences] != list(dataset.sequence_ids):
+        return ['<index>']
+    for i, (sign, sequence_id, frames) in enumerate(sequences):
+        original = np.stack([np.load(path) for path in frames]).astype(dataset.sequences.dtype)
+        if not np.array_equal(original, dataset.sequences[i], equal_nan=True) \
+                or dataset.signs[dataset.labels[i]] != sign:
+            mismatches.append(f"{sign}/{sequence_id}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack the KinyarwandaSigns dataset into one array file")
+    parser.add_argument('command', choices=('pack', 'verify'))
+    parser.add_argument('--data', default=KINYARWANDA_SIGNS_PATH)
+    parser.add_argument('--out', default=DEFAULT_PACKED_DIR)
+    parser.add_argument('--dtype', choices=PACKED_DTYPES, default='float32')
+    parser.add_argument('--no-verify', action='store_true')
+    args = parser.parse_args()
+
+    if args.command == 'pack':
+        start = time.perf_counter()
+        index = pack_dataset(args.data, args.out, args.dtype)
+        size = os.path.getsize(os.path.join(args.out, SEQUENCES_FILE))
+        print(f"Packed {index['shape'][0]} sequences of {len(index['signs'])} signs "
+              f"({size / 1e6:.1f} MB {args.dtype}) in {time.perf_counter() - start:.1f}s")
+        if args.no_verify:
+            return
+
+    start = time.perf_counter()
+    dataset = load_packed_dataset(args.out)
+    print(f"Opened {dataset.shape} in {(time.perf_counter() - start) * 1000:.2f} ms")
+    mismatches = verify_packed(args.data, args.out)
+    if mismatches:
+        print(f"{len(mismatches)} sequences differ from the originals: {', '.join(mismatches[:10])}")
+        raise SystemExit(1)
+    print("All sequences match the originals")
+
+
+if __name__ == '__main__':
+    main()
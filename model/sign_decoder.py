@@ -0,0 +1,116 @@
+import os
+import numpy as np
+
+DECODER_KINDS = ('none', 'ema', 'vote')
+DEFAULT_DECODER = os.environ.get('SIGNOVA_SIGN_DECODER', 'ema')
+
+
+class TemporalSignDecoder(object):
+    """Turns per-frame class probabilities into stable sign emissions.
+
+    Scores are smoothed either with an exponential moving average or a vote
+    over a fixed window of per-frame winners, both kept in preallocated
+    arrays so each frame costs O(classes). A sign is emitted once when its
+    score has been the peak above ``enter_threshold`` for ``min_stable_frames``
+    frames, and can only be emitted again after its score falls below
+    ``exit_threshold``.
+    """
+
+    def __init__(
+        self,
+        num_classes=None,
+        mode='ema',
+        alpha=0.3,
+        window=8,
+        enter_threshold=0.6,
+        exit_threshold=0.35,
+        min_stable_frames=3,
+        ignore_ids=(),
+    ):
+        if mode not in ('ema', 'vote'):
+            raise ValueError(f"Unknown decoder mode: {mode}")
+        if exit_threshold > enter_threshold:
+            raise ValueError("exit_threshold must not exceed enter_threshold")
+        self.mode = mode
+        self.alpha = alpha
+        self.window = window
+        self.enter_threshold = enter_threshold
+        self.exit_threshold = exit_threshold
+        self.min_stable_frames = min_stable_frames
+        self.ignore_ids = set(ignore_ids)
+        self.num_classes = None
+        self.frames = 0
+        self.emitted = 0
+        if num_classes:
+            self._allocate(num_classes)
+
+    def _allocate(self, num_classes):
+        self.num_classes = num_classes
+        self._scores = np.zeros(num_classes, dtype=np.float32)
+        self._votes = np.zeros(num_classes, dtype=np.int32)
+        self._ring = np.full(self.window, -1, dtype=np.int32)  # Per-frame winners for vote mode
+        self._ring_pos = 0
+        self._active = -1  # Latched class, released below exit_threshold
+        self._candidate = -1
+        self._candidate_frames = 0
+
+    def reset(self):
+        if self.num_classes:
+            self._allocate(self.num_classes)
+
+    def update(self, probabilities):
+        """Feed one frame, None when no hand was seen.
+
+        Returns (class_id, score) when a sign is emitted, otherwise None.
+        """
+        if probabilities is not None:
+            probabilities = np.asarray(probabilities, dtype=np.float32).reshape(-1)
+            if probabilities.shape[0] != self.num_classes:
+                self._allocate(probabilities.shape[0])
+        elif self.num_classes is None:
+            return None
+        self.frames += 1
+
+        if self.mode == 'ema':
+            self._scores *= (1.0 - self.alpha)
+            if probabilities is not None:
+                self._scores += self.alpha * probabilities
+            scores = self._scores
+        else:
+            winner = int(np.argmax(probabilities)) if probabilities is not None else -1
+            old = self._ring[self._ring_pos]
+            if old >= 0:
+                self._votes[old] -= 1
+            if winner >= 0:
+                self._votes[winner] += 1
+            self._ring[self._ring_pos] = winner
+            self._ring_pos = (self._ring_pos + 1) % self.window
+            scores = np.divide(self._votes, float(self.window), out=self._scores)
+
+        if self._active >= 0 and scores[self._active] < self.exit_threshold:
+            self._active = -1
+
+        peak = int(np.argmax(scores))
+        score = float(scores[peak])
+        if self._active >= 0 or score < self.enter_threshold or peak in self.ignore_ids:
+            self._candidate, self._candidate_frames = -1, 0
+            return None
+
+        if peak == self._candidate:
+            self._candidate_frames += 1
+        else:
+            self._candidate, self._candidate_frames = peak, 1
+        if self._candidate_frames < self.min_stable_frames:
+            return None
+
+        self._active = peak
+        self._candidate, self._candidate_frames = -1, 0
+        self.emitted += 1
+        return peak, score
+
+
+def create_sign_decoder(kind=DEFAULT_DECODER, num_classes=None, ignore_ids=()):
+    """Decoder for the given kind, None for 'none' to keep per-frame emission"""
+    if kind in (None, '', 'none'):
+        return None
+    return TemporalSignDecoder(num_classes=num_classes, mode=kind, ignore_ids=ignore_ids)
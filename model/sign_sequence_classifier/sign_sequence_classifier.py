@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Streaming classifier for dynamic signs from the KinyarwandaSigns dataset.
+
+Every frame is encoded once into a small embedding that is kept in a ring of
+the last ``frames`` embeddings, the window head then scores the ring as one
+flattened vector. A new frame therefore costs one frame encoding and one
+matrix-vector product instead of re-encoding the whole 30-frame window.
+
+The model is plain NumPy, trained with
+
+    python -m model.sign_sequence_classifier.sign_sequence_classifier [--epochs 80]
+
+and stored as sign_sequence_classifier.npz next to this file.
+"""
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+
+from model.sign_dataset import DEFAULT_PACKED_DIR, POSE_SIZE, HAND_LANDMARKS, HAND_SIZE
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sign_sequence_classifier.npz')
+# Left and right hand landmarks, the first hand block of a dataset frame
+HAND_FEATURES = np.arange(POSE_SIZE, POSE_SIZE + 2 * HAND_SIZE)
+NO_SIGN_LABELS = ('---',)
+
+
+def sign_label(sign):
+    """Recorder word for a dataset folder, e.g. 'umujyi wa kigali' -> 'Umujyi wa kigali'"""
+    return sign if sign in NO_SIGN_LABELS else sign[:1].upper() + sign[1:]
+
+
+def hand_features(multi_hand_landmarks, multi_handedness, out):
+    """Fill ``out`` (126 floats) with MediaPipe Hands results in the dataset's left/right layout.
+
+    Missing hands are zero-filled. Returns ``out``.
+    """
+    out[:] = 0.0
+    if not multi_hand_landmarks:
+        return out
+    hands = out.reshape(2, HAND_LANDMARKS, 3)
+    for hand_landmarks, handedness in zip(multi_hand_landmarks, multi_handedness):
+        side = 0 if handedness.classification[0].label == 'Left' else 1
+        for i, landmark in enumerate(hand_landmarks.landmark):
+            hands[side, i, 0] = landmark.x
+            hands[side, i, 1] = landmark.y
+            hands[side, i, 2] = landmark.z
+    return out
+
+
+def _softmax(logits):
+    logits = logits - logits.max(axis=-1, keepdims=True)
+    np.exp(logits, out=logits)
+    logits /= logits.sum(axis=-1, keepdims=True)
+    return logits
+
+
+class SequenceStream(object):
+    """Per-session streaming state: a ring of the last frame embeddings.
+
+    The ring is stored twice over so the current window is always one
+    contiguous slice and never has to be rotated.
+    """
+
+    def __init__(self, classifier):
+        self.classifier = classifier
+        frames, hidden = classifier.frames, classifier.hidden_size
+        self._ring = np.zeros((2 * frames, hidden), dtype=np.float32)
+        self._pos = 0
+        self.count = 0  # Frames pushed since the last reset
+        self.idle = 0  # Consecutive frames without a detection
+
+    def reset(self):
+        self._ring[:] = 0.0
+        self._pos = 0
+        self.count = 0
+        self.idle = 0
+
+    def push(self, features):
+        """Add one frame of features (None when nothing was detected)"""
+        frames = self.classifier.frames
+        embedding = self.classifier.encode(features)
+        self._ring[self._pos] = embedding
+        self._ring[self._pos + frames] = embedding
+        self._pos = (self._pos + 1) % frames
+        self.count += 1
+        self.idle = self.idle + 1 if features is None else 0
+
+    @property
+    def window(self):
+        """The last ``frames`` embeddings, oldest first"""
+        return self._ring[self._pos:self._pos + self.classifier.frames]
+
+    def predict_proba(self):
+        """Class probabilities for the current window.
+
+        None until the window is full and once it holds no detection at all.
+        """
+        if self.count < self.classifier.frames or self.idle >= self.classifier.frames:
+            return None
+        return self.classifier.score_window(self.window)
+
+
+class SignSequenceClassifier(object):
+    def __init__(self, model_path=MODEL_PATH):
+        with np.load(model_path) as model:
+            self.encoder_weights = model['encoder_weights']
+            self.encoder_bias = model['encoder_bias']
+            self.head_weights = model['head_weights']
+            self.head_bias = model['head_bias']
+            self.feature_mean = model['feature_mean']
+            self.feature_scale = model['feature_scale']
+            self.input_indices = model['input_indices']
+            self.signs = tuple(str(sign) for sign in model['signs'])
+        self.frames = self.head_weights.shape[0] // self.encoder_weights.shape[1]
+        self.hidden_size = self.encoder_weights.shape[1]
+        self.input_size = self.encoder_weights.shape[0]
+        self.labels = tuple(sign_label(sign) for sign in self.signs)
+        self._empty = self._encode(np.zeros(self.input_size, dtype=np.float32))
+
+    def _encode(self, features):
+        hidden = ((features - self.feature_mean) * self.feature_scale) @ self.encoder_weights
+        hidden += self.encoder_bias
+        return np.maximum(hidden, 0.0, out=hidden)
+
+    def encode(self, features):
+        """Embedding of one frame, given either model inputs or a full dataset frame"""
+        if features is None:
+            return self._empty
+        features = np.asarray(features, dtype=np.float32)
+        if features.shape[-1] != self.input_size:
+            features = features[..., self.input_indices]
+        return self._encode(features)
+
+    def score_window(self, window):
+        return _softmax(window.reshape(-1) @ self.head_weights + self.head_bias)
+
+    def create_stream(self):
+        return SequenceStream(self)
+
+    def predict_sequences(self, sequences):
+        """Probabilities for whole (batch, frames, features) sequences"""
+        embeddings = self.encode(sequences)
+        logits = embeddings.reshape(len(sequences), -1) @ self.head_weights + self.head_bias
+        return _softmax(logits)
+
+
+def load_sign_sequence_classifier(model_path=MODEL_PATH):
+    """The trained classifier, None when no weights have been trained yet"""
+    if not os.path.exists(model_path):
+        return None
+    try:
+        return SignSequenceClassifier(model_path)
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Error loading sign sequence classifier: {e}")
+        return None
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def get_sign_sequence_classifier(model_path=MODEL_PATH):
+    """The process-wide classifier for a weights file.
+
+    The classifier only holds read-only weights (streams keep the per-session
+    state), so every session shares one instance. Loaded before a fork, the
+    weights are shared copy-on-write by the workers.
+    """
+    key = os.path.abspath(model_path)
+    with _shared_lock:
+        classifier = _shared.get(key)
+        if classifier is None:
+            classifier = load_sign_sequence_classifier(model_path)
+            if classifier is not None:
+                _shared[key] = classifier
+        return classifier
+
+
+def train(packed_dir=DEFAULT_PACKED_DIR, model_path=MODEL_PATH, hidden_size=32, epochs=80,
+          batch_size=32, learning_rate=2e-3, weight_decay=1e-4, seed=0):
+    """Train the encoder and window head with Adam on the packed dataset, returns validation accuracy"""
+    from model.sign_dataset import load_packed_dataset
+    from model.sequence_loader import SequenceAugmenter, SequenceBatchLoader, stratified_split
+
+    dataset = load_packed_dataset(packed_dir)
+    frames = dataset.shape[1]
+    num_classes = len(dataset.signs)
+    train_indices, val_indices = stratified_split(dataset.labels, 0.2, seed)
+    loader = SequenceBatchLoader(dataset, train_indices, batch_size, augment=SequenceAugmenter(seed=seed),
+                                 prefetch=2, seed=seed)
+    val_x, val_y = dataset.batch(val_indices)
+    val_x = val_x[..., HAND_FEATURES]
+
+    train_x, _ = dataset.batch(train_indices)
+    train_x = train_x[..., HAND_FEATURES].reshape(-1, len(HAND_FEATURES))
+    feature_mean = train_x.mean(axis=0).astype(np.float32)
+    feature_scale = (1.0 / (train_x.std(axis=0) + 1e-3)).astype(np.float32)
+
+    rng = np.random.default_rng(seed)
+    input_size = len(HAND_FEATURES)
+    params = {
+        'encoder_weights': rng.normal(0, np.sqrt(2.0 / input_size), (input_size, hidden_size)).astype(np.float32),
+        'encoder_bias': np.zeros(hidden_size, dtype=np.float32),
+        'head_weights': rng.normal(0, np.sqrt(1.0 / (frames * hidden_size)),
+                                   (frames * hidden_size, num_classes)).astype(np.float32),
+        'head_bias': np.zeros(num_classes, dtype=np.float32),
+    }
+    moments = {name: (np.zeros_like(p), np.zeros_like(p)) for name, p in params.items()}
+    beta1, beta2, step = 0.9, 0.999, 0
+
+    def forward(x):
+        normalized = (x - feature_mean) * feature_scale
+        pre = normalized @ params['encoder_weights'] + params['encoder_bias']
+        hidden = np.maximum(pre, 0.0)
+        flat = hidden.reshape(len(x), -1)
+        return normalized, pre, flat, flat @ params['head_weights'] + params['head_bias']
+
+    for epoch in range(epochs):
+        for x, y in loader:
+            x = x[..., HAND_FEATURES]
+            normalized, pre, flat, logits = forward(x)
+            probabilities = _softmax(logits)
+            probabilities[np.arange(len(y)), y] -= 1.0
+            d_logits = probabilities / len(y)
+            grads = {
+                'head_weights': flat.T @ d_logits,
+                'head_bias': d_logits.sum(axis=0),
+            }
+            d_hidden = (d_logits @ params['head_weights'].T).reshape(pre.shape) * (pre > 0)
+            grads['encoder_weights'] = normalized.reshape(-1, input_size).T @ d_hidden.reshape(-1, hidden_size)
+            grads['encoder_bias'] = d_hidden.reshape(-1, hidden_size).sum(axis=0)
+
+            step += 1
+            for name, grad in grads.items():
+                grad = grad + weight_decay * params[name]
+                m, v = moments[name]
+                m *= beta1
+                m += (1 - beta1) * grad
+                v *= beta2
+                v += (1 - beta2) * grad * grad
+                m_hat = m / (1 - beta1 ** step)
+                v_hat = v / (1 - beta2 ** step)
+                params[name] -= (learning_rate * m_hat / (np.sqrt(v_hat) + 1e-8)).astype(np.float32)
+
+        if (epoch + 1) % 10 == 0 or epoch == epochs - 1:
+            accuracy = float(np.mean(np.argmax(forward(val_x)[3], axis=1) == val_y))
+            print(f"Epoch {epoch + 1}/{epochs}: validation accuracy {accuracy:.3f}")
+
+    np.savez(model_path, feature_mean=feature_mean, feature_scale=feature_scale,
+             input_indices=HAND_FEATURES, signs=np.array(dataset.signs), **params)
+    return accuracy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the streaming sign sequence classifier")
+    parser.add_argument('--packed', default=DEFAULT_PACKED_DIR)
+    parser.add_argument('--out', default=MODEL_PATH)
+    parser.add_argument('--epochs', type=int, default=80)
+    parser.add_argument('--hidden', type=int, default=32)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    train(args.packed, args.out, hidden_size=args.hidden, epochs=args.epochs)
+    print(f"Trained in {time.perf_counter() - start:.1f}s, saved to {args.out}")
+
+    classifier = SignSequenceClassifier(args.out)
+    stream = classifier.create_stream()
+    frame = np.zeros(classifier.input_size, dtype=np.float32)
+    for _ in range(classifier.frames):
+        stream.push(frame)
+    start = time.perf_counter()
+    for _ in range(1000):
+        stream.push(frame)
+        stream.predict_proba()
+    print(f"Streaming step: {(time.perf_counter() - start):.3f} ms per frame")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Motion-energy sign spotting.
+
+Between signs the hands are at rest, so the sequence classifier only needs to
+run on the stretches where they move. The spotter tracks the speed of the
+wrists and fingertips, opens a candidate segment when it stays above
+``start_threshold`` and closes it once it has stayed below ``end_threshold``
+(or the hands are gone) for ``end_frames`` frames. Closed segments are
+resampled to the classifier's 30 frames and classified once.
+"""
+import numpy as np
+
+from model.sign_dataset import HAND_LANDMARKS
+
+# Wrist and the five fingertips
+MOTION_LANDMARKS = np.array([0, 4, 8, 12, 16, 20])
+
+
+def resample_segment(segment, frames, out=None):
+    """Linearly resample a (length, features) segment to (frames, features)"""
+    length = len(segment)
+    if out is None:
+        out = np.empty((frames, segment.shape[1]), dtype=np.float32)
+    position = np.linspace(0.0, length - 1, frames)
+    low = np.floor(position).astype(np.int64)
+    high = np.minimum(low + 1, length - 1)
+    weight = (position - low).astype(np.float32)[:, None]
+    np.multiply(segment[low], 1.0 - weight, out=out)
+    out += segment[high] * weight
+    return out
+
+
+class SignSpotter(object):
+    """Finds candidate sign segments in a stream of hand feature frames.
+
+    Frames are the 126 left/right hand features of the sequence classifier
+    (None when no hand is visible).
+    """
+
+    def __init__(self, classifier, start_threshold=0.012, end_threshold=0.006, start_frames=2,
+                 end_frames=10, min_frames=8, max_frames=90, pre_roll=8, smoothing=0.5):
+        if end_threshold > start_threshold:
+            raise ValueError("end_threshold must not exceed start_threshold")
+        self.classifier = classifier
+        self.start_threshold = start_threshold
+        self.end_threshold = end_threshold
+        self.start_frames = start_frames
+        self.end_frames = end_frames
+        self.min_frames = min_frames
+        self.max_frames = max_frames
+        self.pre_roll = pre_roll
+        self.smoothing = smoothing
+
+        size = classifier.input_size
+        self._segment = np.zeros((max_frames + pre_roll, size), dtype=np.float32)
+        self._recent = np.zeros((pre_roll + 1, size), dtype=np.float32)  # Frames before a start
+        self._window = np.empty((classifier.frames, size), dtype=np.float32)
+        self.reset()
+
+        self.frames = 0
+        self.segments = 0
+        self.invocations = 0
+
+    def reset(self):
+        self.energy = 0.0
+        self.active = False
+        self._length = 0
+        self._recent_count = 0
+        self._above = 0
+        self._below = 0
+        self._previous = None
+
+    def _motion(self, features):
+        """Mean per-frame displacement of the wrists and fingertips present in both frames"""
+        points = features.reshape(2, HAND_LANDMARKS, 3)[:, MOTION_LANDMARKS, :2]
+        previous, self._previous = self._previous, points.copy()
+        if previous is None:
+            return 0.0
+        present = (points != 0).any(axis=-1) & (previous != 0).any(axis=-1)
+        if not present.any():
+            return 0.0
+        return float(np.linalg.norm(points - previous, axis=-1)[present].mean())
+
+    def update(self, features):
+        """Feed one frame, returns (class_id, score) when a segment was classified, else None"""
+        self.frames += 1
+        if features is None:
+            self._previous = None
+            self.energy *= 1.0 - self.smoothing
+            speed_low = True
+        else:
+            self.energy += self.smoothing * (self._motion(features) - self.energy)
+            speed_low = self.energy < self.end_threshold
+
+        if not self.active:
+            if features is not None:
+                self._recent[self._recent_count % len(self._recent)] = features
+                self._recent_count += 1
+            self._above = self._above + 1 if self.energy > self.start_threshold else 0
+            if self._above >= self.start_frames:
+                self._start()
+            return None
+
+        # Frames without hands stay in the segment as zeros, as in the dataset
+        self._segment[self._length] = 0.0 if features is None else features
+        self._length += 1
+        self._below = self._below + 1 if speed_low else 0
+        if self._below >= self.end_frames or self._length >= len(self._segment):
+            return self._finish()
+        return None
+
+    def _start(self):
+        self.active = True
+        self._below = 0
+        # Carry the frames that led up to the start into the segment
+        count = min(self._recent_count, len(self._recent))
+        first = self._recent_count - count
+        for i in range(count):
+            self._segment[i] = self._recent[(first + i) % len(self._recent)]
+        self._length = count
+
+    def _finish(self):
+        # Keep as many rest frames after the motion as were carried before it
+        length = self._length - max(self._below - self.pre_roll, 0)
+        self.active = False
+        self._above = self._below = 0
+        self._length = self._recent_count = 0
+        if length < self.min_frames:
+            return None
+        self.segments += 1
+        self.invocations += 1
+        window = resample_segment(self._segment[:length], self.classifier.frames, out=self._window)
+        probabilities = self.classifier.predict_sequences(window[None])[0]
+        class_id = int(np.argmax(probabilities))
+        return class_id, float(probabilities[class_id])
+
+    def stats(self):
+        """Counters, invocations_saved compares with classifying the window on every frame"""
+        return {
+            'frames': self.frames,
+            'segments_found': self.segments,
+            'classifier_invocations': self.invocations,
+            'invocations_saved': max(self.frames - self.invocations, 0),
+            'active': self.active,
+            'energy': round(self.energy, 5),
+        }
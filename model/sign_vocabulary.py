@@ -0,0 +1,160 @@
+import marshal
+import os
+import sys
+import threading
+from types import MappingProxyType
+
+from model.translations import WORD_TRANSLATIONS, ENGLISH_TO_KINYARWANDA
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+KEYPOINT_LABEL_PATH = os.path.join(MODEL_DIR, 'keypoint_classifier', 'keypoint_classifier_label.csv')
+POINT_HISTORY_LABEL_PATH = os.path.join(MODEL_DIR, 'point_history_classifier', 'point_history_classifier_label.csv')
+RSL_LABEL_PATH = os.path.join(MODEL_DIR, 'rsl_labels.csv')
+KINYARWANDA_SIGNS_PATH = os.path.join(MODEL_DIR, 'KinyarwandaSigns', 'Data')
+CACHE_PATH = os.environ.get('SIGNOVA_VOCABULARY_CACHE', os.path.join(MODEL_DIR, 'sign_vocabulary.cache'))
+CACHE_VERSION = 1
+
+
+def parse_label_line(line):
+    """Split a label row into (label, display).
+
+    keypoint_classifier_label.csv holds rows such as ``Open: "Open",`` and
+    ``Muraho": "Hello",`` instead of plain labels, the part before the colon
+    is the label the model index maps to. Plain rows give (label, None).
+    """
+    text = line.strip().rstrip(',').strip()
+    if not text:
+        return None, None
+    if ':' in text:
+        label, _, display = text.partition(':')
+        return label.strip().strip('"').strip(), display.strip().strip('"').strip() or None
+    return text.strip('"').strip(), None
+
+
+def read_label_csv(path):
+    """Returns ([labels in model index order], {label: display})"""
+    labels, displays = [], {}
+    with open(path, encoding='utf-8-sig') as f:
+        for line in f:
+            label, display = parse_label_line(line)
+            if label is None:
+                continue
+            labels.append(label)
+            if display:
+                displays[label] = display
+    return labels, displays
+
+
+def list_dataset_signs(signs_path=KINYARWANDA_SIGNS_PATH):
+    if not os.path.isdir(signs_path):
+        return []
+    return sorted(d for d in os.listdir(signs_path) if os.path.isdir(os.path.join(signs_path, d)))
+
+
+def _intern_all(values):
+    return tuple(sys.intern(v) for v in values)
+
+
+class SignVocabulary(object):
+    """Label, display and translation tables shared by classifiers and recorders.
+
+    Built once per process from the label CSVs, model/rsl_labels.csv, the
+    KinyarwandaSigns dataset folders and the static translation tables.
+    Every string is interned and every table is read-only.
+    """
+
+    def __init__(self, keypoint_labels, point_history_labels, rsl_labels, dataset_signs,
+                 label_to_display, display_to_kinyarwanda):
+        # id -> label, in model output order
+        self.keypoint_labels = _intern_all(keypoint_labels)
+        self.point_history_labels = _intern_all(point_history_labels)
+        self.rsl_labels = _intern_all(rsl_labels)
+        self.dataset_signs = _intern_all(dataset_signs)
+        # label -> display and display -> kinyarwanda
+        self.label_to_display = MappingProxyType(
+            {sys.intern(k): sys.intern(v) for k, v in label_to_display.items()})
+        self.display_to_kinyarwanda = MappingProxyType(
+            {sys.intern(k): sys.intern(v) for k, v in display_to_kinyarwanda.items()})
+        # id -> display and id -> kinyarwanda for the keypoint classifier
+        self.keypoint_display = tuple(self.display(label) for label in self.keypoint_labels)
+        self.keypoint_kinyarwanda = tuple(
+            self.display_to_kinyarwanda.get(display, display) for display in self.keypoint_display)
+
+    def display(self, label):
+        return self.label_to_display.get(label, label)
+
+    def kinyarwanda(self, display):
+        return self.display_to_kinyarwanda.get(display, display)
+
+    def to_record(self):
+        return (self.keypoint_labels, self.point_history_labels, self.rsl_labels, self.dataset_signs,
+                dict(self.label_to_display), dict(self.display_to_kinyarwanda))
+
+
+def build_vocabulary():
+    keypoint_labels, keypoint_displays = read_label_csv(KEYPOINT_LABEL_PATH)
+    point_history_labels, _ = read_label_csv(POINT_HISTORY_LABEL_PATH)
+    rsl_labels, _ = read_label_csv(RSL_LABEL_PATH)
+    dataset_signs = list_dataset_signs()
+
+    label_to_display = dict(WORD_TRANSLATIONS)
+    for label, display in keypoint_displays.items():
+        label_to_display.setdefault(label, display)
+    display_to_kinyarwanda = dict(ENGLISH_TO_KINYARWANDA)
+    for category in dataset_signs:
+        # Folder names are Kinyarwanda, shown in title case when no translation is known
+        display_name = category.replace('_', ' ').title()
+        if category not in label_to_display:
+            label_to_display[category] = display_name
+            display_to_kinyarwanda.setdefault(display_name, category)
+
+    return SignVocabulary(keypoint_labels, point_history_labels, rsl_labels, dataset_signs,
+                          label_to_display, display_to_kinyarwanda)
+
+
+def source_signature():
+    """Modification times of everything the vocabulary is built from"""
+    from model import translations
+    paths = [KEYPOINT_LABEL_PATH, POINT_HISTORY_LABEL_PATH, RSL_LABEL_PATH,
+             KINYARWANDA_SIGNS_PATH, translations.__file__, __file__]
+    signature = [CACHE_VERSION]
+    for path in paths:
+        try:
+            signature.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            signature.append(0)
+    return tuple(signature)
+
+
+def load_vocabulary(cache_path=CACHE_PATH):
+    """Load the vocabulary from the binary cache, rebuilding it when a source changed"""
+    signature = source_signature()
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_signature, record = marshal.load(f)
+        if cached_signature == signature:
+            return SignVocabulary(*record)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    vocabulary = build_vocabulary()
+    try:
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            marshal.dump((signature, vocabulary.to_record()), f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not write vocabulary cache: {e}")
+    return vocabulary
+
+
+_vocabulary = None
+_vocabulary_lock = threading.Lock()
+
+
+def get_sign_vocabulary():
+    """The process-wide vocabulary, loaded on first use"""
+    global _vocabulary
+    with _vocabulary_lock:
+        if _vocabulary is None:
+            _vocabulary = load_vocabulary()
+        return _vocabulary
@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Few-shot sign recognition by nearest-neighbour DTW over reference sequences.
+
+Frames are standardized and projected with PCA, and every template is
+resampled to a fixed length so the whole index is one (templates, frames,
+components) array. A query is first compared with every template's LB_Keogh
+lower bound in one vectorized pass. Only templates whose bound beats the best
+distance found so far get a full banded DTW, in chunks evaluated together.
+
+New signs are added at runtime from a few recorded samples, no retraining.
+The projection should be fit on representative frames first (from_dataset,
+or fit_projection on the packed dataset). An index started from recorded
+signs alone fits it provisionally on them, and refits and reprojects every
+template as signs are added until ``refit_signs`` signs are in.
+
+    python -m model.template_recognizer
+"""
+import argparse
+import time
+
+import numpy as np
+
+from model.sign_dataset import DEFAULT_PACKED_DIR, SEQUENCE_LENGTH
+from model.sign_sequence_classifier.sign_sequence_classifier import HAND_FEATURES
+from model.sign_spotter import resample_segment
+
+DTW_CHUNK = 16
+
+
+def envelope(sequences, band):
+    """Running (lower, upper) envelopes of (..., frames, dims) sequences within +-band frames"""
+    frames = sequences.shape[-2]
+    lower, upper = sequences.copy(), sequences.copy()
+    for shift in range(1, band + 1):
+        if shift >= frames:
+            break
+        np.minimum(lower[..., shift:, :], sequences[..., :-shift, :], out=lower[..., shift:, :])
+        np.minimum(lower[..., :-shift, :], sequences[..., shift:, :], out=lower[..., :-shift, :])
+        np.maximum(upper[..., shift:, :], sequences[..., :-shift, :], out=upper[..., shift:, :])
+        np.maximum(upper[..., :-shift, :], sequences[..., shift:, :], out=upper[..., :-shift, :])
+    return lower, upper
+
+
+def lb_keogh(query, lower, upper):
+    """LB_Keogh of one (frames, dims) query against (templates, frames, dims) envelopes"""
+    above = np.maximum(query - upper, 0.0)
+    below = np.maximum(lower - query, 0.0)
+    return np.einsum('ntd,ntd->n', above, above) + np.einsum('ntd,ntd->n', below, below)
+
+
+def banded_dtw(query, templates, band):
+    """DTW distances of one query against (chunk, frames, dims) templates, Sakoe-Chiba band"""
+    frames = query.shape[0]
+    # Squared frame distances for every template, (chunk, query frame, template frame)
+    cost = (np.einsum('td,td->t', query, query)[None, :, None]
+            + np.einsum('ntd,ntd->nt', templates, templates)[:, None, :]
+            - 2.0 * np.einsum('qd,ntd->nqt', query, templates))
+    np.maximum(cost, 0.0, out=cost)
+    total = np.full((len(templates), frames + 1, frames + 1), np.inf, dtype=np.float32)
+    total[:, 0, 0] = 0.0
+    for i in range(1, frames + 1):
+        for j in range(max(1, i - band), min(frames, i + band) + 1):
+            best = np.minimum(np.minimum(total[:, i - 1, j], total[:, i, j - 1]), total[:, i - 1, j - 1])
+            total[:, i, j] = cost[:, i - 1, j - 1] + best
+    return total[:, frames, frames]
+
+
+class TemplateRecognizer(object):
+    def __init__(self, n_components=16, band=3, frames=SEQUENCE_LENGTH, feature_indices=HAND_FEATURES,
+                 refit_signs=8):
+        self.n_components = n_components
+        self.band = band
+        self.frames = frames
+        self.feature_indices = np.asarray(feature_indices)
+        self.refit_signs = refit_signs
+        self.mean = self.scale = self.components = None
+        self._raw = None  # Resampled frames of every template while the projection is provisional
+        self.labels = []
+        self._templates = np.empty((0, frames, n_components), dtype=np.float32)
+        self._lower = self._upper = self._templates
+        self._count = 0
+        self._recording = None
+        self.last_query = {}
+
+    def __len__(self):
+        return self._count
+
+    # Projection
+
+    @property
+    def provisional(self):
+        """True while the projection was only fit on the signs recorded so far"""
+        return self._raw is not None
+
+    def fit_projection(self, frames):
+        """Fit standardization and PCA on (n, features) frames in the full or selected layout.
+
+        Templates added under a provisional projection are reprojected, the
+        projection is fixed from then on.
+        """
+        if self._count and not self.provisional:
+            raise ValueError("Templates were projected with the current fit and cannot be reprojected")
+        self._fit(self._select(np.asarray(frames, dtype=np.float32)))
+        if self._count:
+            self._reproject()
+        self._raw = None
+
+    def _fit(self, frames):
+        self.mean = frames.mean(axis=0)
+        self.scale = 1.0 / (frames.std(axis=0) + 1e-3)
+        _, _, vt = np.linalg.svd((frames - self.mean) * self.scale, full_matrices=False)
+        self.components = np.ascontiguousarray(vt[:self.n_components].T, dtype=np.float32)
+
+    def _select(self, frames):
+        if frames.shape[-1] != len(self.feature_indices):
+            frames = frames[..., self.feature_indices]
+        return frames
+
+    def _resample(self, sequence):
+        sequence = self._select(np.asarray(sequence, dtype=np.float32))
+        if len(sequence) != self.frames:
+            sequence = resample_segment(sequence, self.frames)
+        return sequence
+
+    def project(self, sequence):
+        """Resample a (length, features) sequence to ``frames`` and project it"""
+        return ((self._resample(sequence) - self.mean) * self.scale) @ self.components
+
+    def _reproject(self):
+        raw = np.stack(self._raw)
+        self._templates[:self._count] = ((raw - self.mean) * self.scale) @ self.components
+        self._lower[:self._count], self._upper[:self._count] = envelope(self._templates[:self._count], self.band)
+
+    # Index
+
+    def add_template(self, label, sequence):
+        resampled = self._resample(sequence)
+        projected = ((resampled - self.mean) * self.scale) @ self.components
+        if self._count == len(self._templates):
+            capacity = max(2 * len(self._templates), 16)
+            self._templates, self._lower, self._upper = (
+                self._grow(array, capacity) for array in (self._templates, self._lower, self._upper))
+        self._templates[self._count] = projected
+        self._lower[self._count], self._upper[self._count] = envelope(projected, self.band)
+        self.labels.append(label)
+        self._count += 1
+        if self._raw is not None:
+            self._raw.append(resampled)
+
+    def _grow(self, array, capacity):
+        # Existing envelopes are copied, only the new template's is computed
+        grown = np.empty((capacity, self.frames, self.n_components), dtype=np.float32)
+        grown[:self._count] = array[:self._count]
+        return grown
+
+    def add_sign(self, label, samples):
+        """Add a new sign from a few recorded (length, features) samples"""
+        refit = self.provisional and label not in self.labels
+        if self.components is None:
+            # Features constant within one sign would get a 1/1e-3 scale, refit as more signs come in
+            self._fit(np.concatenate([self._resample(sample) for sample in samples]))
+            self._raw = []
+        for sample in samples:
+            self.add_template(label, sample)
+        if refit:
+            self._fit(np.concatenate(self._raw))
+            self._reproject()
+            if len(set(self.labels)) >= self.refit_signs:
+                self._raw = None
+
+    def start_recording(self, label):
+        self._recording = (label, [])
+
+    def record_frame(self, features):
+        if self._recording is not None and features is not None:
+            self._recording[1].append(np.array(features, dtype=np.float32))
+
+    def finish_recording(self, min_frames=8):
+        """Store the recorded frames as one sample, returns True when it was long enough"""
+        label, frames = self._recording or (None, [])
+        self._recording = None
+        if len(frames) < min_frames:
+            return False
+        self.add_sign(label, [np.stack(frames)])
+        return True
+
+    # Query
+
+    def query(self, sequence, k=1, prune=True):
+        """Nearest templates to a sequence, [(label, distance)] closest first.
+
+        prune=False aligns every template, for comparison.
+        """
+        if not self._count:
+            return []
+        query = self.project(sequence)
+        bounds = lb_keogh(query, self._lower[:self._count], self._upper[:self._count])
+        order = np.argsort(bounds)
+        best = []  # (distance, index), at most k
+        computed = 0
+        for start in range(0, self._count, DTW_CHUNK):
+            chunk = order[start:start + DTW_CHUNK]
+            if prune and len(best) == k:
+                chunk = chunk[bounds[chunk] < best[-1][0]]
+                if not len(chunk):
+                    break
+            distances = banded_dtw(query, self._templates[chunk], self.band)
+            computed += len(chunk)
+            best = sorted(best + list(zip(distances.tolist(), chunk.tolist())))[:k]
+        self.last_query = {'templates': self._count, 'dtw_computed': computed,
+                           'pruned': self._count - computed}
+        return [(self.labels[i], distance) for distance, i in best]
+
+    def classify(self, sequence, k=3, prune=True):
+        """Majority label of the k nearest templates, ties go to the closest"""
+        neighbours = self.query(sequence, k, prune)
+        if not neighbours:
+            return None
+        votes = {}
+        for rank, (label, _) in enumerate(neighbours):
+            count, first = votes.get(label, (0, rank))
+            votes[label] = (count + 1, first)
+        return max(votes, key=lambda label: (votes[label][0], -votes[label][1]))
+
+    # Storage
+
+    def save(self, path):
+        np.savez(path, mean=self.mean, scale=self.scale, components=self.components,
+                 templates=self._templates[:self._count], labels=np.array(self.labels),
+                 band=self.band, feature_indices=self.feature_indices)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            templates = data['templates']
+            recognizer = cls(n_components=templates.shape[2], band=int(data['band']),
+                             frames=templates.shape[1], feature_indices=data['feature_indices'])
+            recognizer.mean, recognizer.scale = data['mean'], data['scale']
+            recognizer.components = data['components']
+            recognizer._templates = templates.copy()
+            recognizer._lower, recognizer._upper = envelope(recognizer._templates, recognizer.band)
+            recognizer._count = len(templates)
+            recognizer.labels = [str(label) for label in data['labels']]
+        return recognizer
+
+
+def from_dataset(dataset, indices, **options):
+    """Recognizer indexing the given sequences of a packed dataset"""
+    recognizer = TemplateRecognizer(**options)
+    sequences, labels = dataset.batch(indices)
+    recognizer.fit_projection(sequences.reshape(-1, sequences.shape[-1]))
+    for sequence, label in zip(sequences, labels):
+        recognizer.add_template(dataset.signs[label], sequence)
+    return recognizer
+
+
+def main():
+    from model.sign_dataset import load_packed_dataset
+    from model.sequence_loader import stratified_split
+
+    parser = argparse.ArgumentParser(description="Query latency of the DTW template recognizer")
+    parser.add_argument('--packed', default=DEFAULT_PACKED_DIR)
+    parser.add_argument('--components', type=int, default=16)
+    parser.add_argument('--band', type=int, default=3)
+    args = parser.parse_args()
+
+    dataset = load_packed_dataset(args.packed)
+    train, val = stratified_split(dataset.labels, 0.2, seed=0)
+    queries, query_labels = dataset.batch(val)
+    rng = np.random.default_rng(0)
+    for per_sign in (1, 4, 8, 16, 32):
+        chosen = np.concatenate([rng.permutation(train[dataset.labels[train] == label])[:per_sign]
+                                 for label in np.unique(dataset.labels)])
+        recognizer = from_dataset(dataset, chosen, n_components=args.components, band=args.band)
+        latencies, full_latencies, pruned, correct = [], [], 0, 0
+        for query, label in zip(queries, query_labels):
+            start = time.perf_counter()
+            predicted = recognizer.classify(query, k=1)
+            latencies.append(time.perf_counter() - start)
+            pruned += recognizer.last_query['pruned']
+            correct += predicted == dataset.signs[label]
+            start = time.perf_counter()
+            recognizer.classify(query, k=1, prune=False)
+            full_latencies.append(time.perf_counter() - start)
+        print(f"{len(recognizer):4d} templates: {np.mean(latencies) * 1000:6.2f} ms/query "
+              f"(p95 {np.percentile(latencies, 95) * 1000:6.2f} ms, "
+              f"{np.mean(full_latencies) * 1000:6.2f} ms without pruning), "
+              f"{pruned / (len(queries) * len(recognizer)):5.1%} pruned, accuracy {correct / len(queries):.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+
+# RSL sign to English translations
+WORD_TRANSLATIONS = {
+    "Open": "Open",
+    "Close": "Close",
+    "Pointer": "Pointer",
+    "OK": "OK",
+    "ASL A": "A",
+    "ASL B": "B",
+    "ASL C": "C",
+    "ASL D": "D",
+    "Byiza": "Good",
+    "Muraho": "Hello",
+    "Murakoze": "Thank you",
+    "Ndi": "I am",
+    "Amata": "Milk",
+    "Icyayi": "Tea",
+    "Ifunga": "Bread",
+    "Uburo": "Sorghum",
+    "Amazi": "Water",
+    "Ndabizi": "I know",
+    "Simbyumva": "I don't understand",
+    "Nshaka": "I want",
+    "Nta": "No",
+    "Muraho_Neza": "Hello well",
+    "Murakoze_Cyane": "Thank you very much",
+    "Ndi_Umunyarwanda": "I am Rwandan",
+    "Ndashaka_Amazi": "I want water",
+    # Additional Kinyarwanda signs from the dataset
+    "Akarere": "District",
+    "Akazi": "Work",
+    "Amakuru": "News",
+    "Bayi": "Bye",
+    "Bibi": "Grandmother",
+    "Igihugu": "Country",
+    "Neza": "Good",
+    "Nyarugenge": "Nyarugenge",
+    "Oya": "No",
+    "Papa": "Father",
+    "Umujyi wa kigali": "Kigali City",
+    "Umurenge": "Sector",
+    "Urakoze": "Thank you",
+    "Yego": "Yes"
+}
+
+# English to Kinyarwanda translations
+ENGLISH_TO_KINYARWANDA = {
+    "Open": "Gufungura",
+    "Close": "Gufunga",
+    "Pointer": "Kwerekana",
+    "OK": "Nibyo",
+    "A": "A",
+    "B": "B",
+    "C": "C",
+    "D": "D",
+    "Good": "Byiza",
+    "Hello": "Muraho",
+    "Thank you": "Murakoze",
+    "I am": "Ndi",
+    "Milk": "Amata",
+    "Tea": "Icyayi",
+    "Bread": "Ifunga",
+    "Sorghum": "Uburo",
+    "Water": "Amazi",
+    "I know": "Ndabizi",
+    "I don't understand": "Simbyumva",
+    "I want": "Nshaka",
+    "No": "Nta",
+    "Hello well": "Muraho Neza",
+    "Thank you very much": "Murakoze Cyane",
+    "I am Rwandan": "Ndi Umunyarwanda",
+    "I want water": "Ndashaka Amazi"
+}
+
+TRANSLATION_CACHE_SIZE = 1024
+
+
+class PhraseTranslator(object):
+    """Longest-match phrase translation over a token trie.
+
+    Phrases are split into case-folded tokens and compiled once, so a
+    sentence is translated in a single left-to-right pass and multi-word
+    entries such as "Thank you very much" win over their prefixes. Results
+    are memoized in a bounded LRU.
+    """
+
+    def __init__(self, table, cache_size=TRANSLATION_CACHE_SIZE):
+        self._root = {}
+        for phrase, translation in table.items():
+            node = self._root
+            for token in phrase.casefold().split():
+                node = node.setdefault(token, {})
+            node[''] = translation  # Tokens are never empty, '' marks a phrase end
+        self.translate = lru_cache(maxsize=cache_size)(self._translate)
+
+    def _translate(self, sentence):
+        tokens = sentence.split()
+        folded = [token.casefold() for token in tokens]
+        translated = []
+        i = 0
+        while i < len(tokens):
+            node = self._root
+            match, match_end = None, i
+            j = i
+            while j < len(tokens) and folded[j] in node:
+                node = node[folded[j]]
+                j += 1
+                if '' in node:
+                    match, match_end = node[''], j
+            if match is None:
+                translated.append(tokens[i])
+                i += 1
+            else:
+                translated.append(match)
+                i = match_end
+        return ' '.join(translated)
+
+
+class TranslationTables(object):
+    """Sign, display and translation tables shared by every SentenceRecorder"""
+
+    def __init__(self, word_translations, english_to_kinyarwanda):
+        self.word_translations = MappingProxyType(dict(word_translations))
+        self.english_to_kinyarwanda = MappingProxyType(dict(english_to_kinyarwanda))
+        self._translators = {'kinyarwanda': PhraseTranslator(self.english_to_kinyarwanda)}
+        self._vocabulary = None
+
+    def translate(self, sentence, target_language):
+        translator = self._translators.get(target_language)
+        if not sentence or translator is None:
+            return sentence
+        return translator.translate(sentence)
+
+    def vocabulary(self):
+        """Every phrase that can be displayed or translated to"""
+        if self._vocabulary is None:
+            phrases = set(self.word_translations.values())
+            phrases.update(self.english_to_kinyarwanda.keys())
+            phrases.update(self.english_to_kinyarwanda.values())
+            self._vocabulary = tuple(sorted(phrases))
+        return self._vocabulary
+
+
+_tables = None
+_tables_lock = threading.Lock()
+
+
+def get_translation_tables():
+    """Compile the translation tables once per process from the shared vocabulary"""
+    global _tables
+    from model.sign_vocabulary import get_sign_vocabulary
+    with _tables_lock:
+        if _tables is None:
+            vocabulary = get_sign_vocabulary()
+            _tables = TranslationTables(vocabulary.label_to_display, vocabulary.display_to_kinyarwanda)
+        return _tables
@@ -0,0 +1 @@
+"""Process and transport infrastructure for running the sign pipeline at scale"""
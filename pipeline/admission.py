@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Admission control for camera sessions.
+
+Every running pipeline reports each frame's CPU time (``time.thread_time``
+around the frame's work) and wall time to the process-wide controller. A new
+session is admitted only while all of these hold:
+
+    sessions      fewer than SIGNOVA_MAX_SESSIONS running
+    cpu           pipeline CPU seconds per second, plus what an average session
+                  adds, stays under SIGNOVA_MAX_PIPELINE_CPU cores
+    lag           no session's frame time exceeds the frame budget at
+                  SIGNOVA_TARGET_FPS by more than SIGNOVA_MAX_FRAME_LAG_MS
+
+A rejected session gets a 503 with ``Retry-After`` and the reason, so the
+sessions already running keep their frame rate. ``admit(wait=...)`` queues
+the request for up to ``wait`` seconds first (SIGNOVA_ADMISSION_WAIT).
+
+Limits are per web process, each worker admits against the sessions it runs.
+CPU spent in the hands pool or inference daemon processes is not counted,
+their slowdown still shows up as lag.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+MAX_SESSIONS = int(os.environ.get('SIGNOVA_MAX_SESSIONS', '0')) or os.cpu_count() or 1
+MAX_PIPELINE_CPU = float(os.environ.get('SIGNOVA_MAX_PIPELINE_CPU', '0')) or 0.9 * (os.cpu_count() or 1)
+MAX_FRAME_LAG_MS = float(os.environ.get('SIGNOVA_MAX_FRAME_LAG_MS', '100'))
+TARGET_FPS = float(os.environ.get('SIGNOVA_TARGET_FPS', '30'))
+ADMISSION_WAIT = float(os.environ.get('SIGNOVA_ADMISSION_WAIT', '0'))
+
+REASON_ADMITTED = 'admitted'
+REASON_SESSIONS = 'sessions'
+REASON_CPU = 'cpu'
+REASON_LAG = 'lag'
+
+
+class _Session(object):
+    def __init__(self, now):
+        self.started = now
+        self.frame_seconds = None  # Moving average of the wall time per frame
+        self.frames = 0
+
+
+class AdmissionController(object):
+    def __init__(self, max_sessions=MAX_SESSIONS, max_cpu=MAX_PIPELINE_CPU, max_lag_ms=MAX_FRAME_LAG_MS,
+                 target_fps=TARGET_FPS, window=5.0, retry_after=5, smoothing=0.1, clock=time.monotonic):
+        self.max_sessions = max_sessions
+        self.max_cpu = max_cpu
+        self.max_lag_ms = max_lag_ms
+        self.target_fps = target_fps
+        self.window = window
+        self.retry_after = retry_after
+        self.smoothing = smoothing
+        self._clock = clock
+        self._lock = threading.Condition()
+        self._sessions = {}
+        self._cpu = deque()  # (time, cpu seconds) per frame within the window
+        self._cpu_total = 0.0
+        self.admitted = 0
+        self.rejected = {REASON_SESSIONS: 0, REASON_CPU: 0, REASON_LAG: 0}
+
+    # Pipelines
+
+    def record_frame(self, session_id, cpu_seconds, frame_seconds):
+        """Account one processed frame of a running session"""
+        now = self._clock()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            session.frames += 1
+            if session.frame_seconds is None:
+                session.frame_seconds = frame_seconds
+            else:
+                session.frame_seconds += self.smoothing * (frame_seconds - session.frame_seconds)
+            self._cpu.append((now, cpu_seconds))
+            self._cpu_total += cpu_seconds
+            self._expire(now)
+
+    def _expire(self, now):
+        while self._cpu and self._cpu[0][0] < now - self.window:
+            self._cpu_total -= self._cpu.popleft()[1]
+
+    # Sessions
+
+    def load(self):
+        """Current inputs of the admission decision"""
+        now = self._clock()
+        with self._lock:
+            return self._load(now)
+
+    def _load(self, now):
+        self._expire(now)
+        # Sessions younger than the window have not filled it yet
+        span = min(self.window, max((now - min((s.started for s in self._sessions.values()), default=now)), 1.0))
+        cpu = self._cpu_total / span
+        budget_ms = 1000.0 / self.target_fps
+        lags = [max(0.0, s.frame_seconds * 1000.0 - budget_ms) for s in self._sessions.values()
+                if s.frame_seconds is not None]
+        return {
+            'sessions': len(self._sessions),
+            'cpu_per_second': round(cpu, 3),
+            'lag_ms': round(max(lags), 1) if lags else 0.0,
+            'max_sessions': self.max_sessions,
+            'max_cpu': round(self.max_cpu, 3),
+            'max_lag_ms': self.max_lag_ms,
+        }
+
+    def _decide(self, now):
+        load = self._load(now)
+        sessions = load['sessions']
+        if sessions >= self.max_sessions:
+            return REASON_SESSIONS, f"{sessions} sessions running, the limit is {self.max_sessions}", load
+        projected = load['cpu_per_second'] * (sessions + 1) / sessions if sessions else 0.0
+        if projected > self.max_cpu:
+            return (REASON_CPU, f"pipelines use {load['cpu_per_second']:.2f} CPU s/s, another session would "
+                    f"need about {projected:.2f} of {self.max_cpu:.2f}", load)
+        if load['lag_ms'] > self.max_lag_ms:
+            return (REASON_LAG, f"a session is {load['lag_ms']:.0f} ms behind its frame budget, "
+                    f"the limit is {self.max_lag_ms:.0f} ms", load)
+        return REASON_ADMITTED, "capacity available", load
+
+    def admit(self, session_id, wait=ADMISSION_WAIT):
+        """Admit a session, waiting up to ``wait`` seconds for capacity.
+
+        Returns a decision dict: admitted, reason, message, retry_after and
+        the load it was based on. A session already running is admitted again.
+        """
+        deadline = self._clock() + wait
+        with self._lock:
+            while True:
+                now = self._clock()
+                if session_id in self._sessions:
+                    reason, message, load = REASON_ADMITTED, "session already running", self._load(now)
+                    break
+                reason, message, load = self._decide(now)
+                if reason == REASON_ADMITTED:
+                    self._sessions[session_id] = _Session(now)
+                    self.admitted += 1
+                    break
+                if now >= deadline:
+                    self.rejected[reason] += 1
+                    break
+                # Woken by release, otherwise re-checked as the CPU window moves
+                self._lock.wait(min(deadline - now, 0.5))
+        admitted = reason == REASON_ADMITTED
+        return {'admitted': admitted, 'reason': reason, 'message': message,
+                'retry_after': None if admitted else self.retry_after, 'load': load}
+
+    def release(self, session_id):
+        """Forget a session that stopped, safe to call more than once"""
+        with self._lock:
+            if self._sessions.pop(session_id, None) is not None:
+                self._lock.notify_all()
+
+    def stats(self):
+        with self._lock:
+            stats = self._load(self._clock())
+            stats.update(admitted=self.admitted, rejected=dict(self.rejected))
+        return stats
+
+
+class FrameMeter(object):
+    """Times one pipeline's frames and reports them to the controller.
+
+    Call ``start()`` before a frame's work and ``stop()`` after it, any
+    pacing sleep stays outside.
+    """
+
+    def __init__(self, controller, session_id):
+        self.controller = controller
+        self.session_id = session_id
+        self._cpu = self._wall = None
+
+    def start(self):
+        self._cpu, self._wall = time.thread_time(), time.perf_counter()
+
+    def stop(self):
+        """Report the frame, returns its wall time in seconds, None without a matching start"""
+        if self._cpu is None:
+            return None
+        frame_seconds = time.perf_counter() - self._wall
+        self.controller.record_frame(self.session_id, time.thread_time() - self._cpu, frame_seconds)
+        self._cpu = None
+        return frame_seconds
+
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller():
+    """The process-wide controller, configured from the SIGNOVA_* environment"""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdmissionController()
+        return _controller
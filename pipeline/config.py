@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Named performance profiles for the sign recognition pipelines.
+
+app3.main, the Flask process_camera_feed and the Django process_frames all
+read camera size, hands detector settings, loop pacing and the adaptive
+features from one ``PipelineConfig``. A profile is chosen by name, from
+SIGNOVA_PIPELINE_PROFILE (Django: ``settings.SIGNOVA_PIPELINE_PROFILE``,
+app3: ``--profile``). The per-feature variables SIGNOVA_DETECT_EVERY,
+SIGNOVA_ADAPTIVE_QUALITY and SIGNOVA_TARGET_FPS still override the profile
+when they are set.
+
+    python -m pipeline.config show
+    python -m pipeline.config bench --video clip.mp4 [--profiles low-power balanced accuracy]
+"""
+import argparse
+import dataclasses
+import os
+import statistics
+import time
+from dataclasses import dataclass
+
+DEFAULT_PROFILE = 'balanced'
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    name: str
+    camera_width: int = 1280
+    camera_height: int = 720
+    max_num_hands: int = 2
+    model_complexity: int = 1
+    min_detection_confidence: float = 0.7
+    min_tracking_confidence: float = 0.5
+    detect_every: int = 1  # Kalman-predicted landmarks in between, see landmark_tracker.py
+    target_fps: float = 30.0
+    adaptive_quality: bool = False  # See quality.py
+    loop_sleep: float = 0.01  # Seconds the processing loop yields after each frame
+    stream_interval: float = 0.033  # Seconds between MJPEG frames sent to the browser
+    fps_buffer_len: int = 10
+
+    def override(self, **values):
+        """A copy with the given fields replaced, None values are ignored"""
+        values = {field: value for field, value in values.items() if value is not None}
+        return dataclasses.replace(self, **values) if values else self
+
+    def hands_options(self):
+        """Keyword arguments for ``create_hand_detector`` / ``mp.solutions.hands.Hands``"""
+        return {
+            'static_image_mode': False,
+            'max_num_hands': self.max_num_hands,
+            'model_complexity': self.model_complexity,
+            'min_detection_confidence': self.min_detection_confidence,
+            'min_tracking_confidence': self.min_tracking_confidence,
+        }
+
+
+PROFILES = {
+    # Half the pixels, one hand on the lite model, detection every third frame, 15 FPS
+    'low-power': PipelineConfig('low-power', camera_width=640, camera_height=360, max_num_hands=1,
+                                model_complexity=0, min_detection_confidence=0.6, detect_every=3,
+                                target_fps=15.0, adaptive_quality=True, loop_sleep=0.02, stream_interval=0.066),
+    # The settings the pipelines used before profiles existed, with two hands everywhere
+    'balanced': PipelineConfig('balanced'),
+    # Tracking re-detects sooner, no yielding between frames
+    'accuracy': PipelineConfig('accuracy', min_detection_confidence=0.75, min_tracking_confidence=0.7,
+                               loop_sleep=0.0),
+}
+
+
+def get_pipeline_config(profile=None):
+    """The named profile (default SIGNOVA_PIPELINE_PROFILE), with per-feature environment overrides.
+
+    Unknown names fall back to the default profile with a message.
+    """
+    name = profile or os.environ.get('SIGNOVA_PIPELINE_PROFILE') or DEFAULT_PROFILE
+    config = PROFILES.get(name)
+    if config is None:
+        print(f"Unknown pipeline profile {name!r}, using {DEFAULT_PROFILE}. Known: {', '.join(PROFILES)}")
+        config = PROFILES[DEFAULT_PROFILE]
+    detect_every = os.environ.get('SIGNOVA_DETECT_EVERY')
+    adaptive_quality = os.environ.get('SIGNOVA_ADAPTIVE_QUALITY')
+    target_fps = os.environ.get('SIGNOVA_TARGET_FPS')
+    return config.override(
+        detect_every=int(detect_every) if detect_every else None,
+        adaptive_quality=adaptive_quality.lower() in ('1', 'true') if adaptive_quality else None,
+        target_fps=float(target_fps) if target_fps else None,
+    )
+
+
+# Benchmark
+
+def run_profile(config, frames):
+    """Process recorded BGR frames headless as the pipelines do, returns FPS, CPU and latency"""
+    import cv2 as cv
+    import app3
+
+    hands = app3.create_hand_detector('benchmark', detect_every=config.detect_every, **config.hands_options())
+    classifier = app3.create_keypoint_classifier()
+    latencies = []
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for frame in frames:
+        start = time.perf_counter()
+        image = cv.flip(cv.resize(frame, (config.camera_width, config.camera_height)), 1)
+        results = hands.process(cv.cvtColor(image, cv.COLOR_BGR2RGB))
+        for hand_landmarks in results.multi_hand_landmarks or ():
+            landmark_list = app3.calc_landmark_list(image, hand_landmarks)
+            app3.classify_hand(classifier, app3.pre_process_landmark(landmark_list), len(classifier.labels))
+            image = app3.draw_landmarks(image, landmark_list)
+        cv.imencode('.jpg', image)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    hands.close()
+    latencies.sort()
+    return {
+        'fps': len(frames) / wall,
+        'cpu_per_second': cpu / wall,
+        'cpu_ms_per_frame': cpu / len(frames) * 1000.0,
+        'latency_ms': statistics.mean(latencies),
+        'p95_latency_ms': latencies[int(0.95 * (len(latencies) - 1))],
+        'frames': len(frames),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline performance profiles")
+    parser.add_argument('command', choices=('show', 'bench'))
+    parser.add_argument('--video', default=None, help="Recorded clip for bench")
+    parser.add_argument('--profiles', nargs='+', choices=sorted(PROFILES), default=list(PROFILES))
+    parser.add_argument('--max_frames', type=int, default=600)
+    args = parser.parse_args()
+
+    if args.command == 'show':
+        for name in args.profiles:
+            print(get_pipeline_config(name))
+        return
+    if not args.video:
+        parser.error("bench needs --video")
+
+    import cv2 as cv
+    cap = cv.VideoCapture(args.video)
+    frames = []
+    while len(frames) < args.max_frames:
+        ret, image = cap.read()
+        if not ret:
+            break
+        frames.append(image)
+    cap.release()
+    if not frames:
+        print(f"No frames read from {args.video}")
+        return
+
+    run_profile(get_pipeline_config(args.profiles[0]), frames[:10])  # Load models and graphs once
+    print(f"{len(frames)} frames of {args.video}, processed back to back ({os.cpu_count()} CPUs)")
+    print(f"{'profile':10s} {'FPS':>7s} {'CPU s/s':>8s} {'CPU ms/frame':>13s} {'latency ms':>11s} {'p95':>7s}")
+    for name in args.profiles:
+        r = run_profile(get_pipeline_config(name), frames)
+        print(f"{name:10s} {r['fps']:7.1f} {r['cpu_per_second']:8.2f} {r['cpu_ms_per_frame']:13.2f} "
+              f"{r['latency_ms']:11.2f} {r['p95_latency_ms']:7.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Shared-memory frame transport between a capture process and an inference process.
+
+Frames live in a ring of fixed slots inside one ``multiprocessing.shared_memory``
+block. The capture side writes a frame in place (``cap.read(view)`` or
+``cv.flip(frame, 1, dst=view)``) and sends only ``(slot, sequence)`` through a
+pipe. The inference side reads the slot as an ``np.ndarray`` view, no frame is
+ever pickled or copied between processes.
+
+Each slot has a sequence word, used as a seqlock: it holds ``2 * seq + 1``
+while the slot is being written and ``2 * seq + 2`` once frame ``seq`` is
+complete. A reader checks the word before and after using a slot, so a frame
+the writer lapped mid-read is detected and dropped instead of locked against.
+The reader always skips to the newest frame waiting in the pipe.
+
+    python -m pipeline.frame_ring [--video clip.mp4] [--seconds 10]
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+HEADER_BYTES = 64  # Keeps the frame data cache-line aligned
+
+
+class FrameRing(object):
+    def __init__(self, shape, dtype=np.uint8, slots=4, name=None, create=True):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+        frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        header_bytes = -(-8 * (slots + 1) // HEADER_BYTES) * HEADER_BYTES
+        size = header_bytes + frame_bytes * slots
+        self._owner = create
+        self._shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self.name = self._shm.name
+        header = np.ndarray((slots + 1,), dtype=np.int64, buffer=self._shm.buf)
+        self._sequences = header[:slots]
+        self._reading = header[slots:]  # Slot the reader is using, -1 when idle
+        self._frames = np.ndarray((slots,) + self.shape, dtype=self.dtype, buffer=self._shm.buf,
+                                  offset=header_bytes)
+        if create:
+            self._sequences[:] = 0
+            self._reading[0] = -1
+        self._next = 0  # Writer side only
+        self._slot = -1
+
+    @property
+    def spec(self):
+        """Picklable arguments for ``FrameRing.attach`` in another process"""
+        return {'name': self.name, 'shape': self.shape, 'dtype': self.dtype.str, 'slots': self.slots}
+
+    @classmethod
+    def attach(cls, spec):
+        return cls(spec['shape'], np.dtype(spec['dtype']), spec['slots'], name=spec['name'], create=False)
+
+    # Writer
+
+    def begin_write(self):
+        """Claim the next slot, returns (slot, seq, view) to fill in place.
+
+        The slot the reader is using is skipped, so a slow reader is not
+        lapped on every frame. The seqlock still catches the rare race.
+        """
+        seq = self._next
+        self._next += 1
+        slot = (self._slot + 1) % self.slots
+        if slot == self._reading[0] and self.slots > 1:
+            slot = (slot + 1) % self.slots
+        self._slot = slot
+        self._sequences[slot] = 2 * seq + 1
+        return slot, seq, self._frames[slot]
+
+    def publish(self, slot, seq):
+        self._sequences[slot] = 2 * seq + 2
+
+    def write(self, frame):
+        """Copy a frame into the next slot, returns (slot, seq)"""
+        slot, seq, view = self.begin_write()
+        np.copyto(view, frame)
+        self.publish(slot, seq)
+        return slot, seq
+
+    # Reader
+
+    def read(self, slot, seq):
+        """View of frame ``seq``, None when the writer has already reused its slot.
+
+        Marks the slot as in use until ``release``.
+        """
+        self._reading[0] = slot
+        if self._sequences[slot] != 2 * seq + 2:
+            self._reading[0] = -1
+            return None
+        return self._frames[slot]
+
+    def release(self, slot, seq):
+        """Stop using a slot, returns whether frame ``seq`` was not overwritten meanwhile"""
+        intact = self._sequences[slot] == 2 * seq + 2
+        self._reading[0] = -1
+        return intact
+
+    def close(self):
+        self._sequences = self._reading = self._frames = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _inference_worker(spec, frames_in, results_out, processor_factory):
+    """Child process: read the newest announced frame, process it, send the result back"""
+    ring = FrameRing.attach(spec)
+    process = processor_factory()
+    try:
+        while True:
+            message = frames_in.recv()
+            while message is not None and frames_in.poll():
+                message = frames_in.recv()  # Skip to the newest frame
+            if message is None:
+                break
+            slot, seq = message
+            frame = ring.read(slot, seq)
+            result = None
+            if frame is not None:
+                result = process(frame)
+                # A frame the writer overwrote mid-read may be torn, its result is dropped
+                if not ring.release(slot, seq):
+                    result = None
+            results_out.send((seq, result))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        ring.close()
+
+
+class FramePipeline(object):
+    """Capture-side handle on an inference process fed through a FrameRing.
+
+    ``processor_factory`` runs in the child (it must be picklable, e.g. a
+    module-level function) and returns ``process(frame) -> result``. Results
+    should be small (landmarks, probabilities), they are the only thing
+    pickled.
+    """
+
+    def __init__(self, shape, processor_factory, slots=4, dtype=np.uint8):
+        self.ring = FrameRing(shape, dtype, slots)
+        # Spawned, forking a process that already runs camera and UI threads is not safe
+        context = multiprocessing.get_context('spawn')
+        frames_in, self._frames_out = context.Pipe(duplex=False)
+        self._results_in, results_out = context.Pipe(duplex=False)
+        self._process = context.Process(target=_inference_worker, name='frame-inference', daemon=True,
+                                        args=(self.ring.spec, frames_in, results_out, processor_factory))
+        self._process.start()
+        frames_in.close()
+        results_out.close()
+        self.latest = None  # (seq, result) of the newest processed frame
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+
+    def begin_write(self):
+        return self.ring.begin_write()
+
+    def submit(self, slot, seq):
+        """Publish a frame written with begin_write and announce it to the inference process"""
+        self.ring.publish(slot, seq)
+        self._frames_out.send((slot, seq))
+        self.submitted += 1
+
+    def submit_frame(self, frame):
+        slot, seq, view = self.ring.begin_write()
+        np.copyto(view, frame)
+        self.submit(slot, seq)
+        return seq
+
+    def poll(self):
+        """Collect finished results without blocking, returns the newest (seq, result) or None"""
+        while self._results_in.poll():
+            seq, result = self._results_in.recv()
+            if result is None:
+                self.dropped += 1
+            else:
+                self.processed += 1
+                self.latest = (seq, result)
+        return self.latest
+
+    def close(self, timeout=5.0):
+        try:
+            self._frames_out.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+        self.ring.close()
+
+
+# Benchmark
+
+FRAME_SHAPE = (720, 1280, 3)
+
+
+def synthetic_processor():
+    """Stand-in for MediaPipe and the classifier when they are not installed"""
+    def process(frame):
+        small = frame[::2, ::2].astype(np.float32)
+        for _ in range(3):
+            small = 0.5 * small + 0.25 * (np.roll(small, 1, axis=0) + np.roll(small, 1, axis=1))
+        return small.mean(axis=(0, 1))
+    return process
+
+
+def mediapipe_processor():
+    """MediaPipe Hands and the keypoint classifier, as in process_frames"""
+    import cv2 as cv
+    import mediapipe as mp
+    import app3
+
+    hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=2,
+                                     min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    classifier = app3.create_keypoint_classifier()
+
+    def process(frame):
+        results = hands.process(cv.cvtColor(frame, cv.COLOR_BGR2RGB))
+        detections = []
+        for hand_landmarks in results.multi_hand_landmarks or ():
+            landmark_list = app3.calc_landmark_list(frame, hand_landmarks)
+            probabilities = classifier.predict_proba(app3.pre_process_landmark(landmark_list))
+            detections.append((np.array(landmark_list, dtype=np.int32), probabilities))
+        return detections
+    return process
+
+
+def _draw(frame, result, draw_landmarks):
+    if draw_landmarks is None:
+        return frame[::4, ::4].copy()  # Stand-in for overlay drawing and JPEG encoding
+    for landmark_list, _ in result or ():
+        frame = draw_landmarks(frame, landmark_list.tolist())
+    return frame
+
+
+def benchmark(frames, processor_factory, draw_landmarks=None, seconds=10.0):
+    """Frames per second of the single-thread loop and of the split capture/inference pipeline"""
+    process = processor_factory()
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        frame = frames[count % len(frames)].copy()  # Capture
+        _draw(frame, process(frame), draw_landmarks)
+        count += 1
+    single = count / (time.perf_counter() - start)
+
+    pipeline = FramePipeline(frames[0].shape, processor_factory)
+    try:
+        pipeline.submit_frame(frames[0])
+        while pipeline.poll() is None:  # Child start-up and graph loading
+            time.sleep(0.01)
+        pipeline.processed = 0
+        count, start = 0, time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            slot, seq, view = pipeline.begin_write()
+            np.copyto(view, frames[count % len(frames)])  # Capture straight into shared memory
+            pipeline.submit(slot, seq)
+            latest = pipeline.poll()
+            _draw(view.copy(), latest[1] if latest else None, draw_landmarks)
+            count += 1
+        elapsed = time.perf_counter() - start
+        display, inference = count / elapsed, pipeline.processed / elapsed
+    finally:
+        pipeline.close()
+    return single, display, inference
+
+
+def transport_benchmark(frame, count=200):
+    """Seconds per frame handed to another process through a pickling queue and through the ring"""
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue(maxsize=4)
+    receiver = context.Process(target=_drain_queue, args=(queue, count), daemon=True)
+    receiver.start()
+    start = time.perf_counter()
+    for _ in range(count):
+        queue.put(frame)
+    receiver.join()
+    pickled = (time.perf_counter() - start) / count
+
+    pipeline = FramePipeline(frame.shape, _identity_processor)
+    try:
+        start = time.perf_counter()
+        for _ in range(count):
+            pipeline.submit_frame(frame)
+        while pipeline.latest is None or pipeline.latest[0] < count - 1:
+            pipeline.poll()
+            time.sleep(0.0005)
+        shared = (time.perf_counter() - start) / count
+    finally:
+        pipeline.close()
+    return pickled, shared
+
+
+def _drain_queue(queue, count):
+    for _ in range(count):
+        queue.get()
+
+
+def _identity_processor():
+    return lambda frame: int(frame[0, 0, 0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-thread loop vs capture/inference processes")
+    parser.add_argument('--video', default=None, help="Recorded clip, synthetic frames and work when omitted")
+    parser.add_argument('--seconds', type=float, default=10.0)
+    args = parser.parse_args()
+
+    if args.video:
+        import cv2 as cv
+        import app3
+        cap = cv.VideoCapture(args.video)
+        frames = []
+        while len(frames) < 300:
+            ret, image = cap.read()
+            if not ret:
+                break
+            frames.append(cv.resize(cv.flip(image, 1), (FRAME_SHAPE[1], FRAME_SHAPE[0])))
+        cap.release()
+        processor_factory, draw_landmarks = mediapipe_processor, app3.draw_landmarks
+    else:
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 256, FRAME_SHAPE, dtype=np.uint8) for _ in range(8)]
+        processor_factory, draw_landmarks = synthetic_processor, None
+
+    pickled, shared = transport_benchmark(frames[0])
+    print(f"Handoff of one {FRAME_SHAPE[1]}x{FRAME_SHAPE[0]} frame: pickling queue {pickled * 1000:.2f} ms, "
+          f"shared-memory ring {shared * 1000:.3f} ms")
+    single, display, inference = benchmark(frames, processor_factory, draw_landmarks, args.seconds)
+    print(f"Single thread: {single:.1f} FPS. Split processes: {display:.1f} FPS displayed, "
+          f"{inference:.1f} FPS inferred ({os.cpu_count()} CPUs)")
+
+
+if __name__ == '__main__':
+    main()
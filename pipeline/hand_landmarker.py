@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""MediaPipe Tasks HandLandmarker in LIVE_STREAM mode as a non-blocking hands detector.
+
+``mp.solutions.hands.Hands.process`` holds the calling thread for the whole
+graph run. ``LiveStreamHands.process`` hands the frame to ``detect_async``
+and returns at once with the newest result the graph has delivered. Results
+come back on MediaPipe's callback thread and are matched to their frame by
+timestamp. The graph drops frames while it is busy, and the frames that never
+get a result are counted as dropped.
+
+The results are shaped like the solutions API's (``multi_hand_landmarks``,
+``multi_handedness``), so the pipelines read them unchanged, plus
+``frame_id``, ``timestamp_ms`` and ``latency_ms`` of the frame they belong to.
+Because the result lags, a pipeline draws landmarks from a recent frame over
+the current one.
+
+The model is not bundled, download it to HAND_LANDMARKER_MODEL_PATH from
+https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task
+
+    SIGNOVA_HAND_DETECTOR=solutions|tasks      # Flask and Django, app3 --hand_detector
+    python -m pipeline.hand_landmarker --video clip.mp4 [--fps 30]    # side-by-side comparison
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from pipeline.hands_pool import solution_results
+
+HAND_DETECTORS = ('solutions', 'tasks')
+DEFAULT_HAND_DETECTOR = os.environ.get('SIGNOVA_HAND_DETECTOR', 'solutions')
+HAND_LANDMARKER_MODEL_PATH = os.environ.get('SIGNOVA_HAND_LANDMARKER_MODEL') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'model', 'hand_landmarker', 'hand_landmarker.task')
+
+
+def tasks_detections(result):
+    """HandLandmarkerResult as [(handedness, score, (21, 3) landmarks)]"""
+    detections = []
+    for landmarks, handedness in zip(result.hand_landmarks or (), result.handedness or ()):
+        points = np.array([(p.x, p.y, p.z) for p in landmarks], dtype=np.float32)
+        category = handedness[0]
+        detections.append((category.category_name, float(category.score), points))
+    return detections
+
+
+class _TasksLandmarker(object):
+    """HandLandmarker in LIVE_STREAM mode, delivering (detections, timestamp_ms) to ``on_result``"""
+
+    def __init__(self, on_result, model_path, num_hands, min_detection_confidence, min_tracking_confidence):
+        import mediapipe as mp
+        from mediapipe.tasks import python as mp_tasks
+        from mediapipe.tasks.python import vision
+
+        self._mp = mp
+        options = vision.HandLandmarkerOptions(
+            base_options=mp_tasks.BaseOptions(model_asset_path=model_path),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=num_hands,
+            min_hand_detection_confidence=min_detection_confidence,
+            min_hand_presence_confidence=min_tracking_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            result_callback=lambda result, image, timestamp_ms: on_result(tasks_detections(result), timestamp_ms))
+        self._landmarker = vision.HandLandmarker.create_from_options(options)
+
+    def detect_async(self, rgb_frame, timestamp_ms):
+        # mp.Image copies the pixels, the caller may reuse its buffer right away
+        image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=np.ascontiguousarray(rgb_frame))
+        self._landmarker.detect_async(image, timestamp_ms)
+
+    def close(self):
+        self._landmarker.close()
+
+
+class LiveStreamHands(object):
+    """Drop-in for ``mp.solutions.hands.Hands`` whose ``process`` never waits on the graph.
+
+    ``landmarker_factory(on_result)`` builds the detector, the Tasks
+    HandLandmarker by default.
+    """
+
+    def __init__(self, model_path=HAND_LANDMARKER_MODEL_PATH, max_num_hands=2, min_detection_confidence=0.5,
+                 min_tracking_confidence=0.5, static_image_mode=False, model_complexity=1, history=64,
+                 landmarker_factory=None):
+        # static_image_mode and model_complexity are accepted for the Hands signature, LIVE_STREAM always
+        # tracks and the .task bundle fixes the model
+        self.max_num_hands = max_num_hands
+        if landmarker_factory is None:
+            if not os.path.exists(model_path):
+                raise FileNotFoundError(f"HandLandmarker model not found: {model_path}")
+            landmarker_factory = lambda on_result: _TasksLandmarker(
+                on_result, model_path, self.max_num_hands, min_detection_confidence, min_tracking_confidence)
+        self._landmarker_factory = landmarker_factory
+        self._lock = threading.Lock()
+        self._submitted = OrderedDict()  # timestamp_ms -> (frame_id, submitted_at), oldest first
+        self._history = history
+        self._last_timestamp = -1
+        self._frame_ids = 0
+        self._latest = solution_results(None, frame_id=None, timestamp_ms=None, latency_ms=None)
+        self._latencies = deque(maxlen=256)
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self._landmarker = landmarker_factory(self._on_result)
+
+    def process(self, rgb_frame, timestamp_ms=None):
+        """Submit a frame without waiting, returns the newest result delivered so far"""
+        now = time.perf_counter()
+        with self._lock:
+            # LIVE_STREAM requires strictly increasing timestamps
+            timestamp = int(now * 1000) if timestamp_ms is None else int(timestamp_ms)
+            timestamp = max(timestamp, self._last_timestamp + 1)
+            self._last_timestamp = timestamp
+            self._frame_ids += 1
+            self._submitted[timestamp] = (self._frame_ids, now)
+            while len(self._submitted) > self._history:
+                self._submitted.popitem(last=False)
+                self.dropped += 1
+            self.submitted += 1
+        try:
+            self._landmarker.detect_async(rgb_frame, timestamp)
+        except Exception as e:
+            print(f"Error submitting frame to HandLandmarker: {e}")
+        return self.latest()
+
+    def _on_result(self, detections, timestamp_ms):
+        done = time.perf_counter()
+        with self._lock:
+            entry = self._submitted.pop(timestamp_ms, None)
+            if entry is None:
+                return  # Pruned from the history, a newer result has been delivered since
+            # Older frames still waiting were skipped by the graph
+            while self._submitted and next(iter(self._submitted)) < timestamp_ms:
+                self._submitted.popitem(last=False)
+                self.dropped += 1
+            frame_id, submitted_at = entry
+            latency_ms = (done - submitted_at) * 1000.0
+            self._latest = solution_results(detections, frame_id=frame_id, timestamp_ms=timestamp_ms,
+                                            latency_ms=latency_ms)
+            self._latencies.append(latency_ms)
+            self.completed += 1
+
+    def reconfigure(self, max_num_hands=None, model_complexity=None):
+        """Apply a new hand count, rebuilding only the landmarker. model_complexity has no effect, returns True"""
+        if max_num_hands is not None and max_num_hands != self.max_num_hands:
+            self.max_num_hands = max_num_hands
+            self._landmarker.close()
+            self._landmarker = self._landmarker_factory(self._on_result)
+        return True
+
+    def latest(self):
+        with self._lock:
+            return self._latest
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'dropped': self.dropped,
+                'latency_ms': round(statistics.mean(latencies), 2) if latencies else None,
+                'p95_latency_ms': round(latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else None,
+            }
+
+    def close(self):
+        self._landmarker.close()
+
+
+# Comparison
+
+def compare(frames, fps=30.0, max_num_hands=2):
+    """Per-frame blocking time, loop FPS and result latency of both backends over the same frames"""
+    import mediapipe as mp
+
+    report = {}
+    for name in HAND_DETECTORS:
+        if name == 'tasks':
+            detector = LiveStreamHands(max_num_hands=max_num_hands, min_detection_confidence=0.7)
+        else:
+            detector = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=max_num_hands,
+                                                min_detection_confidence=0.7, min_tracking_confidence=0.5)
+        blocked, with_hands = [], 0
+        start = time.perf_counter()
+        for index, frame in enumerate(frames):
+            if fps:
+                # Camera pacing, a frame is not available before its capture time
+                delay = start + index / fps - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            call_start = time.perf_counter()
+            results = detector.process(frame)
+            blocked.append((time.perf_counter() - call_start) * 1000.0)
+            with_hands += results.multi_hand_landmarks is not None
+        elapsed = time.perf_counter() - start
+        time.sleep(0.2)  # Let the last asynchronous results arrive
+        entry = {
+            'loop_fps': len(frames) / elapsed,
+            'blocked_ms': statistics.mean(blocked),
+            'p95_blocked_ms': sorted(blocked)[int(0.95 * (len(blocked) - 1))],
+            'frames_with_hands': with_hands / len(frames),
+        }
+        if name == 'tasks':
+            stats = detector.stats()
+            entry.update(latency_ms=stats['latency_ms'], p95_latency_ms=stats['p95_latency_ms'],
+                         results_fps=stats['completed'] / elapsed, dropped=stats['dropped'])
+        else:
+            # A blocking call's result belongs to the frame it was given
+            entry.update(latency_ms=entry['blocked_ms'], p95_latency_ms=entry['p95_blocked_ms'],
+                         results_fps=entry['loop_fps'], dropped=0)
+        detector.close()
+        report[name] = entry
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solutions Hands vs Tasks HandLandmarker LIVE_STREAM on a clip")
+    parser.add_argument('--video', required=True)
+    parser.add_argument('--fps', type=float, default=30.0, help="Capture pacing, 0 to feed frames back to back")
+    parser.add_argument('--max_frames', type=int, default=600)
+    args = parser.parse_args()
+
+    import cv2 as cv
+    cap = cv.VideoCapture(args.video)
+    frames = []
+    while len(frames) < args.max_frames:
+        ret, image = cap.read()
+        if not ret:
+            break
+        frames.append(cv.cvtColor(cv.flip(image, 1), cv.COLOR_BGR2RGB))
+    cap.release()
+    if not frames:
+        print(f"No frames read from {args.video}")
+        return
+
+    report = compare(frames, args.fps)
+    print(f"{len(frames)} frames of {args.video}, paced at {args.fps or 'unlimited'} FPS")
+    print(f"{'':10s} {'loop FPS':>9s} {'result FPS':>11s} {'blocked ms':>11s} {'p95':>7s} "
+          f"{'latency ms':>11s} {'p95':>7s} {'dropped':>8s} {'hands':>6s}")
+    for name, r in report.items():
+        if r['latency_ms'] is None:
+            print(f"{name:10s} delivered no results")
+            continue
+        print(f"{name:10s} {r['loop_fps']:9.1f} {r['results_fps']:11.1f} {r['blocked_ms']:11.2f} "
+              f"{r['p95_blocked_ms']:7.2f} {r['latency_ms']:11.2f} {r['p95_latency_ms']:7.2f} "
+              f"{r['dropped']:8d} {r['frames_with_hands']:6.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,470 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Pool of MediaPipe Hands processes for many concurrent camera sessions.
+
+A ``mp.solutions.hands.Hands`` graph runs on one thread and keeps tracking
+state between frames, so it can neither be shared by sessions nor by
+threads. Each pool worker is a spawned process holding one graph per session
+routed to it. Routing is sticky, a session always goes to the same worker and
+its graph, and new sessions go to the worker with the fewest.
+
+Frames reach a worker through its shared-memory FrameRing
+(pipeline/frame_ring.py). Each worker accepts at most ``queue_size`` frames
+in flight, and further frames are dropped and counted rather than queued. A monitor
+thread restarts workers that died or stopped answering and samples every
+worker's utilization, the CPU seconds per second it spent detecting. The
+utilizations sum to the cores the pool keeps busy, which is what to size the
+pool against.
+
+    python -m pipeline.hands_pool [--workers 1 2 4] [--sessions 8] [--mediapipe --video clip.mp4]
+"""
+import argparse
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from multiprocessing.connection import wait as wait_connections
+from types import SimpleNamespace
+
+import numpy as np
+
+from pipeline.frame_ring import FrameRing
+
+HANDS_WORKERS = int(os.environ.get('SIGNOVA_HANDS_WORKERS', '0'))
+MAX_FRAME_SHAPE = (720, 1280, 3)
+
+
+def mediapipe_hands_detector(max_num_hands=2, model_complexity=1, min_detection_confidence=0.7,
+                             min_tracking_confidence=0.5, static_image_mode=False):
+    """Runs in a worker, returns new_session(**options) -> detect(rgb_frame) backed by its own Hands graph.
+
+    A session's options override the worker's defaults for its graph.
+    """
+    import mediapipe as mp
+
+    defaults = dict(static_image_mode=static_image_mode, max_num_hands=max_num_hands,
+                    model_complexity=model_complexity, min_detection_confidence=min_detection_confidence,
+                    min_tracking_confidence=min_tracking_confidence)
+
+    def new_session(**options):
+        hands = mp.solutions.hands.Hands(**dict(defaults, **options))
+
+        def detect(rgb_frame):
+            results = hands.process(rgb_frame)
+            detections = []
+            for landmarks, handedness in zip(results.multi_hand_landmarks or (), results.multi_handedness or ()):
+                points = np.array([(p.x, p.y, p.z) for p in landmarks.landmark], dtype=np.float32)
+                category = handedness.classification[0]
+                detections.append((category.label, float(category.score), points))
+            return detections
+
+        detect.close = hands.close
+        return detect
+    return new_session
+
+
+def synthetic_detector(work_seconds=0.01):
+    """Stand-in for MediaPipe: a fixed amount of CPU work and one hand at the frame's mean colour"""
+    def new_session(**options):
+        def detect(rgb_frame):
+            deadline = time.process_time() + work_seconds  # CPU time, so workers sharing a core slow down
+            value = float(rgb_frame[::8, ::8].mean()) / 255.0
+            while time.process_time() < deadline:
+                pass
+            return [('Right', 1.0, np.full((21, 3), value, dtype=np.float32))]
+        return detect
+    return new_session
+
+
+def _worker_main(index, spec, requests, results, detector_factory, options, max_sessions):
+    ring = FrameRing.attach(spec)
+    new_session = detector_factory(**options)
+    sessions = OrderedDict()  # session_id -> (detect, graph options)
+
+    def close_session(session_id):
+        detect, _ = sessions.pop(session_id, (None, None))
+        if detect is not None and hasattr(detect, 'close'):
+            detect.close()
+
+    try:
+        while True:
+            message = requests.recv()
+            if message is None:
+                break
+            if message[0] == 'end':
+                close_session(message[1])
+                continue
+            _, request_id, session_id, slot, seq, height, width, session_options = message
+            start = time.process_time()
+            result, error = None, None
+            try:
+                detect, current = sessions.pop(session_id, (None, None))
+                if detect is not None and current != session_options:
+                    # The session's graph options changed, only its own graph is rebuilt
+                    if hasattr(detect, 'close'):
+                        detect.close()
+                    detect = None
+                if detect is None:
+                    detect = new_session(**dict(session_options)) if session_options else new_session()
+                sessions[session_id] = (detect, session_options)  # Most recently used last
+                while len(sessions) > max_sessions:
+                    close_session(next(iter(sessions)))
+                frame = ring.read(slot, seq)
+                if frame is None:
+                    raise RuntimeError("Frame was overwritten before it was read")
+                try:
+                    result = detect(np.ascontiguousarray(frame[:height, :width]))
+                finally:
+                    if not ring.release(slot, seq):
+                        result, error = None, "RuntimeError: Frame was overwritten while it was read"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            results.send((request_id, result, error, time.process_time() - start))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        for session_id in list(sessions):
+            close_session(session_id)
+        ring.close()
+
+
+class _Worker(object):
+    def __init__(self, index):
+        self.index = index
+        self.lock = threading.Lock()  # Serializes ring writes and request sends
+        self.process = None
+        self.ring = None
+        self.requests = None
+        self.results = None
+        self.exited = False  # Results pipe hit EOF, waiting for the monitor to restart it
+        self.pending = {}  # request_id -> (future, submitted_at)
+        self.sessions = set()
+        self.busy_seconds = 0.0
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.restarts = 0
+        self.utilization = 0.0
+        self._sample = (time.monotonic(), 0.0)
+
+
+class HandsPool(object):
+    def __init__(self, workers=None, queue_size=4, detector_factory=mediapipe_hands_detector,
+                 detector_options=None, max_sessions_per_worker=8, frame_shape=MAX_FRAME_SHAPE,
+                 hang_timeout=10.0, monitor_interval=1.0):
+        self.queue_size = queue_size
+        self.detector_factory = detector_factory
+        self.detector_options = detector_options or {}
+        self.max_sessions_per_worker = max_sessions_per_worker
+        self.frame_shape = tuple(frame_shape)
+        self.hang_timeout = hang_timeout
+        self.monitor_interval = monitor_interval
+        self._context = multiprocessing.get_context('spawn')
+        self._lock = threading.Lock()
+        self._routes = {}  # session_id -> worker index
+        self._ids = itertools.count(1)
+        self._closed = False
+        self._workers = [_Worker(i) for i in range(workers or os.cpu_count() or 1)]
+        for worker in self._workers:
+            self._start_worker(worker)
+        self._collector = threading.Thread(target=self._collect, daemon=True, name='hands-pool-results')
+        self._collector.start()
+        self._monitor = threading.Thread(target=self._watch, daemon=True, name='hands-pool-monitor')
+        self._monitor.start()
+
+    def _start_worker(self, worker):
+        # Ring slots beyond the in-flight limit, so a queued frame is never overwritten
+        worker.ring = FrameRing(self.frame_shape, slots=self.queue_size + 2)
+        worker.exited = False
+        requests_in, worker.requests = self._context.Pipe(duplex=False)
+        worker.results, results_out = self._context.Pipe(duplex=False)
+        worker.process = self._context.Process(
+            target=_worker_main, name=f'hands-worker-{worker.index}', daemon=True,
+            args=(worker.index, worker.ring.spec, requests_in, results_out, self.detector_factory,
+                  self.detector_options, self.max_sessions_per_worker))
+        worker.process.start()
+        requests_in.close()
+        results_out.close()
+
+    def _stop_worker(self, worker, reason):
+        """Stop a worker's process and fail its in-flight requests, called with worker.lock held"""
+        if worker.process.is_alive():
+            worker.process.terminate()
+        worker.process.join(5.0)
+        for connection in (worker.requests, worker.results):
+            connection.close()
+        worker.ring.close()
+        pending, worker.pending = worker.pending, {}
+        for future, _ in pending.values():
+            future.set_exception(RuntimeError(reason))
+
+    def _restart_worker(self, worker, reason):
+        print(f"Restarting hands worker {worker.index}: {reason}")
+        with worker.lock:
+            self._stop_worker(worker, reason)
+            worker.restarts += 1
+            self._start_worker(worker)
+
+    # Sessions
+
+    def _route(self, session_id):
+        with self._lock:
+            index = self._routes.get(session_id)
+            if index is None:
+                index = min(range(len(self._workers)), key=lambda i: len(self._workers[i].sessions))
+                self._routes[session_id] = index
+                self._workers[index].sessions.add(session_id)
+            return self._workers[index]
+
+    def end_session(self, session_id):
+        """Forget a session and close its graph in the worker"""
+        with self._lock:
+            index = self._routes.pop(session_id, None)
+        if index is None:
+            return
+        worker = self._workers[index]
+        with worker.lock:
+            worker.sessions.discard(session_id)
+            try:
+                worker.requests.send(('end', session_id))
+            except OSError:
+                pass
+
+    # Requests
+
+    def submit(self, session_id, rgb_frame, options=None):
+        """Queue one RGB frame for a session's worker.
+
+        ``options`` override the pool's detector options for this session's
+        graph, the worker rebuilds the graph when they change. Returns a
+        Future of [(handedness, score, (21, 3) landmarks)], or None when the
+        worker already has ``queue_size`` frames in flight.
+        """
+        height, width = rgb_frame.shape[:2]
+        if height > self.frame_shape[0] or width > self.frame_shape[1]:
+            raise ValueError(f"Frame {width}x{height} exceeds the pool's {self.frame_shape[1]}x{self.frame_shape[0]}")
+        session_options = tuple(sorted(options.items())) if options else ()
+        worker = self._route(session_id)
+        with worker.lock:
+            if self._closed:
+                raise RuntimeError("Hands pool is closed")
+            if len(worker.pending) >= self.queue_size:
+                worker.dropped += 1
+                return None
+            slot, seq, view = worker.ring.begin_write()
+            np.copyto(view[:height, :width], rgb_frame)
+            worker.ring.publish(slot, seq)
+            request_id = next(self._ids)
+            future = Future()
+            worker.pending[request_id] = (future, time.monotonic())
+            try:
+                worker.requests.send(('frame', request_id, session_id, slot, seq, height, width, session_options))
+            except OSError as e:
+                worker.pending.pop(request_id)
+                future.set_exception(RuntimeError(f"Hands worker {worker.index} is unavailable: {e}"))
+        return future
+
+    def process(self, session_id, rgb_frame, timeout=1.0, options=None):
+        """Detections for one frame, None when it was dropped, failed or timed out"""
+        future = self.submit(session_id, rgb_frame, options)
+        if future is None:
+            return None
+        try:
+            return future.result(timeout)
+        except Exception as e:
+            print(f"Hands pool error: {e}")
+            return None
+
+    def _collect(self):
+        while not self._closed:
+            connections = {}
+            for worker in self._workers:
+                with worker.lock:
+                    if not worker.exited and not worker.results.closed:
+                        connections[worker.results] = worker
+            for connection in wait_connections(list(connections), timeout=0.1):
+                worker = connections[connection]
+                with worker.lock:
+                    if connection is not worker.results:
+                        continue  # Restarted meanwhile
+                    try:
+                        request_id, result, error, seconds = connection.recv()
+                    except (EOFError, OSError):
+                        worker.exited = True  # The monitor restarts it
+                        continue
+                    entry = worker.pending.pop(request_id, None)
+                    worker.busy_seconds += seconds
+                    if error is None:
+                        worker.processed += 1
+                    else:
+                        worker.errors += 1
+                if entry is not None:
+                    if error is None:
+                        entry[0].set_result(result)
+                    else:
+                        entry[0].set_exception(RuntimeError(error))
+
+    def _watch(self):
+        while not self._closed:
+            time.sleep(self.monitor_interval)
+            now = time.monotonic()
+            for worker in self._workers:
+                if self._closed:
+                    return
+                with worker.lock:
+                    alive = worker.process.is_alive()
+                    oldest = min((submitted for _, submitted in worker.pending.values()), default=now)
+                    last_time, last_busy = worker._sample
+                    worker.utilization = min((worker.busy_seconds - last_busy) / max(now - last_time, 1e-6), 1.0)
+                    worker._sample = (now, worker.busy_seconds)
+                if not alive:
+                    self._restart_worker(worker, f"exited with code {worker.process.exitcode}")
+                elif now - oldest > self.hang_timeout:
+                    self._restart_worker(worker, f"no answer for {now - oldest:.1f} s")
+
+    def stats(self):
+        """Per-worker counters, utilization is detection CPU seconds per second over the last monitor interval"""
+        report = []
+        for worker in self._workers:
+            with worker.lock:
+                report.append({
+                    'worker': worker.index,
+                    'pid': worker.process.pid,
+                    'alive': worker.process.is_alive(),
+                    'sessions': len(worker.sessions),
+                    'in_flight': len(worker.pending),
+                    'processed': worker.processed,
+                    'dropped': worker.dropped,
+                    'errors': worker.errors,
+                    'restarts': worker.restarts,
+                    'utilization': round(worker.utilization, 3),
+                })
+        return report
+
+    def close(self):
+        self._closed = True
+        self._monitor.join(self.monitor_interval + 1.0)
+        self._collector.join(1.0)
+        for worker in self._workers:
+            with worker.lock:
+                try:
+                    worker.requests.send(None)
+                except OSError:
+                    pass
+                worker.process.join(2.0)
+                self._stop_worker(worker, "Hands pool closed")
+
+
+def solution_results(detections, **extra):
+    """[(handedness, score, (21, 3) landmarks)] as an ``mp.solutions.hands`` results object"""
+    landmarks, handedness = [], []
+    for label, score, points in detections or ():
+        landmarks.append(SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y), z=float(z))
+                                                   for x, y, z in points]))
+        handedness.append(SimpleNamespace(classification=[SimpleNamespace(label=label, score=score)]))
+    return SimpleNamespace(multi_hand_landmarks=landmarks or None, multi_handedness=handedness or None, **extra)
+
+
+class PooledHands(object):
+    """Drop-in for ``mp.solutions.hands.Hands`` in one session, backed by the pool.
+
+    ``process`` returns an object with ``multi_hand_landmarks`` and
+    ``multi_handedness`` shaped like MediaPipe's, as the pipelines read them.
+    """
+
+    def __init__(self, pool, session_id, timeout=1.0, options=None):
+        self.pool = pool
+        self.session_id = session_id
+        self.timeout = timeout
+        self.options = dict(options or {})  # This session's graph options, sent with every frame
+
+    def process(self, rgb_frame):
+        return solution_results(self.pool.process(self.session_id, rgb_frame, self.timeout, self.options))
+
+    def reconfigure(self, **options):
+        """Change this session's graph options from the next frame on, returns True as they always apply"""
+        self.options.update(options)
+        return True
+
+    def close(self):
+        self.pool.end_session(self.session_id)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hands_pool(detector_options=None):
+    """The process-wide pool, None unless SIGNOVA_HANDS_WORKERS is set.
+
+    The first caller's ``detector_options`` are the workers' defaults,
+    sessions pass their own through ``PooledHands``.
+    """
+    global _pool
+    if HANDS_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = HandsPool(HANDS_WORKERS, detector_options=detector_options)
+        return _pool
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and utilization of the hands pool")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--sessions', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--mediapipe', action='store_true', help="Real Hands graphs instead of synthetic work")
+    parser.add_argument('--video', default=None)
+    args = parser.parse_args()
+
+    if args.video:
+        import cv2 as cv
+        cap = cv.VideoCapture(args.video)
+        frames = []
+        while len(frames) < 120:
+            ret, image = cap.read()
+            if not ret:
+                break
+            frames.append(cv.cvtColor(cv.resize(image, (640, 360)), cv.COLOR_BGR2RGB))
+        cap.release()
+    else:
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 256, (360, 640, 3), dtype=np.uint8) for _ in range(8)]
+    factory = mediapipe_hands_detector if args.mediapipe else synthetic_detector
+
+    for workers in args.workers:
+        pool = HandsPool(workers, detector_factory=factory, monitor_interval=args.seconds / 2)
+        done = [0]
+        done_lock = threading.Lock()
+        stop = time.monotonic() + args.seconds
+
+        def session(session_id):
+            count = 0
+            while time.monotonic() < stop:
+                if pool.process(session_id, frames[count % len(frames)], timeout=5.0) is not None:
+                    count += 1
+                else:
+                    time.sleep(0.005)  # Dropped, wait for the next camera frame
+            with done_lock:
+                done[0] += count
+
+        pool.process('warm-up', frames[0], timeout=30.0)
+        threads = [threading.Thread(target=session, args=(f'session-{i}',)) for i in range(args.sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        time.sleep(0.1)
+        stats = pool.stats()
+        pool.close()
+        utilization = ', '.join(f"{s['utilization']:.0%}" for s in stats)
+        print(f"{workers} workers, {args.sessions} sessions: {done[0] / args.seconds:7.1f} frames/s, "
+              f"dropped {sum(s['dropped'] for s in stats)}, utilization [{utilization}] ({os.cpu_count()} CPUs)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Client for the inference daemon (pipeline/inference_server.py).
+
+A pool of persistent Unix socket connections is shared by the threads of a
+web worker: a call borrows a connection, sends one framed batch and reads the
+reply. A connection that fails is discarded and the call is retried once on a
+fresh one, so restarting the daemon costs the workers one reconnect.
+
+Set SIGNOVA_INFERENCE_SOCKET to make the pipelines classify through the
+daemon instead of loading their own interpreters.
+"""
+import itertools
+import os
+import queue
+import socket
+import threading
+
+import numpy as np
+
+from pipeline.inference_protocol import (
+    HEADER, OP_PING, OP_KEYPOINT, OP_POINT_HISTORY, OP_SEQUENCE, STATUS_OK, recv_message, send_array,
+)
+
+INFERENCE_SOCKET = os.environ.get('SIGNOVA_INFERENCE_SOCKET') or None
+
+
+class InferenceClient(object):
+    def __init__(self, socket_path=INFERENCE_SOCKET, pool_size=4, timeout=5.0):
+        if not socket_path:
+            raise ValueError("socket_path is required")
+        self.socket_path = socket_path
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)  # Connections open or being used
+        self._ids = itertools.count(1)
+        self._closed = False
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def call(self, op, batch):
+        """Send one (rows, cols) float32 batch, returns the (rows, cols) result.
+
+        Raises RuntimeError when the server reports an error and OSError when
+        it cannot be reached.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError("No inference connection became free")
+        try:
+            for attempt in (0, 1):
+                try:
+                    sock = self._idle.get_nowait()
+                except queue.Empty:
+                    sock = self._connect()
+                try:
+                    result = self._exchange(sock, op, batch)
+                except RuntimeError:
+                    self._idle.put(sock)  # The error reply was read in full, the connection is still in sync
+                    raise
+                except (OSError, ValueError):
+                    sock.close()
+                    if attempt:
+                        raise
+                    continue  # Stale connection, e.g. the daemon restarted
+                self._idle.put(sock)
+                return result
+        finally:
+            self._slots.release()
+
+    def _exchange(self, sock, op, batch):
+        request_id = next(self._ids) & 0xFFFFFFFF
+        send_array(sock, op, request_id, batch)
+        message = recv_message(sock, bytearray(HEADER.size))
+        if message is None:
+            raise ConnectionError("Inference server closed the connection")
+        _, status, reply_id, payload = message
+        if reply_id != request_id:
+            raise ConnectionError(f"Reply {reply_id} does not match request {request_id}")
+        if status != STATUS_OK:
+            raise RuntimeError(f"Inference server error: {payload}")
+        return payload
+
+    def ping(self):
+        self.call(OP_PING, np.empty((0, 0), dtype=np.float32))
+        return True
+
+    def keypoint_proba(self, landmarks):
+        return self.call(OP_KEYPOINT, np.asarray(landmarks, dtype=np.float32).reshape(-1, 42))
+
+    def point_history_proba(self, point_history):
+        return self.call(OP_POINT_HISTORY, np.asarray(point_history, dtype=np.float32).reshape(-1, 32))
+
+    def sequence_proba(self, sequences):
+        sequences = np.asarray(sequences, dtype=np.float32)
+        return self.call(OP_SEQUENCE, sequences.reshape(len(sequences), -1))
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class RemoteKeyPointClassifier(object):
+    """Drop-in for KeyPointClassifier that classifies through the daemon"""
+
+    def __init__(self, client):
+        from model.sign_vocabulary import get_sign_vocabulary
+        self.client = client
+        self.labels = get_sign_vocabulary().keypoint_labels
+
+    def __call__(self, landmark_list):
+        probabilities = self.predict_proba(landmark_list)
+        if probabilities is None:
+            return 0
+        return np.argmax(probabilities)
+
+    def predict_proba(self, landmark_list):
+        """Class probabilities for one landmark vector, None when the daemon is unavailable"""
+        try:
+            return self.client.keypoint_proba(landmark_list)[0]
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f"Error in remote keypoint inference: {e}")
+            return None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_inference_client():
+    """The process-wide client, None unless SIGNOVA_INFERENCE_SOCKET is set"""
+    global _client
+    if not INFERENCE_SOCKET:
+        return None
+    with _client_lock:
+        if _client is None:
+            _client = InferenceClient(INFERENCE_SOCKET)
+        return _client
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Binary framing for the inference daemon's Unix socket.
+
+Every message is a 16-byte little-endian header followed by a payload:
+
+    version  u8     PROTOCOL_VERSION
+    op       u8     OP_* of the request, echoed in the response
+    status   u16    0 for requests and successful responses, else STATUS_ERROR
+    id       u32    request id, echoed in the response
+    rows     u32    batch size
+    cols     u32    float32 values per row, or error message bytes when rows is 0
+
+The payload is ``rows * cols`` float32 values in C order, or a UTF-8 error
+message. Batches cross the socket as raw array bytes, nothing is pickled.
+"""
+import struct
+
+import numpy as np
+
+PROTOCOL_VERSION = 1
+HEADER = struct.Struct('<BBHIII')
+
+OP_PING = 0
+OP_KEYPOINT = 1  # (rows, 42) pre-processed landmarks -> (rows, classes) probabilities
+OP_POINT_HISTORY = 2  # (rows, 32) pre-processed point history -> (rows, classes) probabilities
+OP_SEQUENCE = 3  # (rows, frames * features) sign sequences -> (rows, signs) probabilities
+OPS = (OP_PING, OP_KEYPOINT, OP_POINT_HISTORY, OP_SEQUENCE)
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+MAX_PAYLOAD = 64 * 1024 * 1024
+
+
+def recv_exact(sock, view):
+    """Fill a writable memoryview from the socket, raises ConnectionError on EOF"""
+    received = 0
+    while received < len(view):
+        count = sock.recv_into(view[received:])
+        if not count:
+            raise ConnectionError("Connection closed mid-message")
+        received += count
+
+
+def send_array(sock, op, request_id, array, status=STATUS_OK):
+    """Send a (rows, cols) float32 array as one framed message"""
+    array = np.ascontiguousarray(array, dtype=np.float32)
+    if array.ndim == 1:
+        array = array[None]
+    rows, cols = array.shape[0], int(np.prod(array.shape[1:]))
+    sock.sendall(HEADER.pack(PROTOCOL_VERSION, op, status, request_id, rows, cols) + array.tobytes())
+
+
+def send_error(sock, op, request_id, message):
+    data = message.encode('utf-8')[:MAX_PAYLOAD]
+    sock.sendall(HEADER.pack(PROTOCOL_VERSION, op, STATUS_ERROR, request_id, 0, len(data)) + data)
+
+
+def recv_message(sock, header_buffer=None):
+    """Read one message, returns (op, status, request_id, payload).
+
+    The payload is a (rows, cols) float32 array, or the error string when
+    status is STATUS_ERROR. Returns None when the peer closed cleanly.
+    """
+    header_buffer = header_buffer or bytearray(HEADER.size)
+    view = memoryview(header_buffer)
+    first = sock.recv_into(view)
+    if not first:
+        return None
+    if first < HEADER.size:
+        recv_exact(sock, view[first:])
+    version, op, status, request_id, rows, cols = HEADER.unpack(header_buffer)
+    if version != PROTOCOL_VERSION:
+        raise ValueError(f"Unsupported protocol version: {version}")
+    if status != STATUS_OK:
+        if cols > MAX_PAYLOAD:
+            raise ValueError(f"Error message too large: {cols} bytes")
+        data = bytearray(cols)
+        recv_exact(sock, memoryview(data))
+        return op, status, request_id, data.decode('utf-8', 'replace')
+    if rows * cols * 4 > MAX_PAYLOAD:
+        raise ValueError(f"Payload too large: {rows} x {cols}")
+    payload = np.empty((rows, cols), dtype=np.float32)
+    if payload.size:
+        recv_exact(sock, memoryview(payload).cast('B'))
+    return op, status, request_id, payload
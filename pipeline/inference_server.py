@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Local inference daemon that owns the classifiers for every web worker.
+
+Web workers keep MediaPipe and landmark pre-processing and send landmark or
+feature batches over a Unix domain socket (see pipeline/inference_protocol.py).
+Each client connection is served by its own thread with its own TFLite
+interpreters, so the daemon's ML thread count is set by the client pools and
+``--interpreter-threads``, not by web concurrency. Web workers can restart
+without reloading any model.
+
+    python -m pipeline.inference_server serve [--socket PATH] [--interpreter-threads 1]
+    python -m pipeline.inference_server bench   # socket round trip vs in-process calls
+"""
+import argparse
+import os
+import socket
+import socketserver
+import threading
+import time
+
+import numpy as np
+
+from pipeline.inference_protocol import (
+    HEADER, OP_PING, OP_KEYPOINT, OP_POINT_HISTORY, OP_SEQUENCE, STATUS_OK, recv_message, send_array, send_error,
+)
+
+DEFAULT_SOCKET_PATH = os.environ.get('SIGNOVA_INFERENCE_SOCKET') or '/tmp/signova-inference.sock'
+
+
+def _per_row(predict_proba):
+    """Batch a per-sample predict_proba, None results become an error"""
+    def run(batch):
+        rows = []
+        for sample in batch:
+            probabilities = predict_proba(sample)
+            if probabilities is None:
+                raise RuntimeError("Model is not loaded in the inference server")
+            rows.append(probabilities)
+        return np.stack(rows) if rows else np.empty((0, 0), dtype=np.float32)
+    return run
+
+
+def _point_history_proba(classifier):
+    """Softmax output of the point-history model, the classifier itself only returns the argmax"""
+    def predict_proba(sample):
+        if classifier.interpreter is None:
+            return None
+        classifier.interpreter.set_tensor(classifier.input_details[0]['index'], sample[None])
+        classifier.interpreter.invoke()
+        return np.squeeze(classifier.interpreter.get_tensor(classifier.output_details[0]['index']))
+    return predict_proba
+
+
+def create_backends(interpreter_threads=1):
+    """{op: batch -> probabilities} for one connection thread.
+
+    The TFLite interpreters are created here, once per connection, and are
+    never shared between threads. The sequence classifier is read-only and
+    shared by all of them.
+    """
+    from model.keypoint_classifier.keypoint_classifier import KeyPointClassifier
+    from model.point_history_classifier.point_history_classifier import PointHistoryClassifier
+    from model.sign_sequence_classifier.sign_sequence_classifier import get_sign_sequence_classifier
+
+    keypoint = KeyPointClassifier(num_threads=interpreter_threads)
+    point_history = PointHistoryClassifier(num_threads=interpreter_threads)
+    backends = {
+        OP_KEYPOINT: _per_row(keypoint.predict_proba),
+        OP_POINT_HISTORY: _per_row(_point_history_proba(point_history)),
+    }
+    sequences = get_sign_sequence_classifier()
+    if sequences is not None:
+        shape = (sequences.frames, sequences.input_size)
+        backends[OP_SEQUENCE] = lambda batch: sequences.predict_sequences(batch.reshape((len(batch),) + shape))
+    return backends
+
+
+class _ConnectionHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server.inference
+        with server._lock:
+            server._connections.add(self.request)
+        try:
+            self._serve(server)
+        finally:
+            with server._lock:
+                server._connections.discard(self.request)
+
+    def _serve(self, server):
+        backends = server.backend_factory()
+        header_buffer = bytearray(HEADER.size)
+        while True:
+            try:
+                message = recv_message(self.request, header_buffer)
+            except (ConnectionError, ValueError) as e:
+                server._count('protocol_errors')
+                print(f"Inference connection dropped: {e}")
+                return
+            if message is None:
+                return
+            op, status, request_id, batch = message
+            start = time.perf_counter()
+            try:
+                if op == OP_PING:
+                    result = np.empty((0, 0), dtype=np.float32)
+                elif op in backends:
+                    result = backends[op](batch)
+                else:
+                    raise ValueError(f"Unsupported op: {op}")
+            except Exception as e:
+                server._count('errors')
+                send_error(self.request, op, request_id, f"{type(e).__name__}: {e}")
+                continue
+            send_array(self.request, op, request_id, result, STATUS_OK)
+            server._record(op, len(batch), time.perf_counter() - start)
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class InferenceServer(object):
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, interpreter_threads=1, backend_factory=None):
+        self.socket_path = socket_path
+        self.backend_factory = backend_factory or (lambda: create_backends(interpreter_threads))
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'rows': 0, 'busy_seconds': 0.0, 'errors': 0, 'protocol_errors': 0}
+        self._connections = set()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)  # Left over from a daemon that did not shut down cleanly
+        self._server = _UnixServer(socket_path, _ConnectionHandler)
+        self._server.inference = self
+        self._thread = None
+
+    def _record(self, op, rows, seconds):
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats['rows'] += rows
+            self._stats['busy_seconds'] += seconds
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def start(self):
+        """Serve on a background thread, returns self"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True, name='inference-server')
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        with self._lock:
+            connections = list(self._connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+def benchmark(socket_path, batch_sizes=(1, 8, 64), calls=300, client_threads=(1, 4)):
+    """Mean per-call latency of socket round trips against direct backend calls, printed"""
+    from pipeline.inference_client import InferenceClient
+    from model.sign_sequence_classifier.sign_sequence_classifier import get_sign_sequence_classifier
+
+    server = InferenceServer(socket_path).start()
+    local = create_backends()
+    probes = [(OP_KEYPOINT, 'keypoint', 42), (OP_POINT_HISTORY, 'point history', 32)]
+    classifier = get_sign_sequence_classifier()
+    if classifier is not None:
+        probes.append((OP_SEQUENCE, 'sequence', classifier.frames * classifier.input_size))
+    rng = np.random.default_rng(0)
+    try:
+        for op, name, cols in probes:
+            for batch_size in batch_sizes:
+                batch = rng.uniform(-1, 1, (batch_size, cols)).astype(np.float32)
+                try:
+                    local[op](batch)
+                except RuntimeError as e:
+                    print(f"{name:14s} skipped: {e}")
+                    break
+                start = time.perf_counter()
+                for _ in range(calls):
+                    local[op](batch)
+                direct = (time.perf_counter() - start) / calls
+                line = f"{name:14s} batch {batch_size:3d}: in-process {direct * 1e6:8.1f} us"
+                for threads in client_threads:
+                    client = InferenceClient(socket_path, pool_size=threads)
+                    client.call(op, batch)  # Connect and warm up the server-side interpreters
+
+                    def run():
+                        for _ in range(calls // threads):
+                            client.call(op, batch)
+
+                    workers = [threading.Thread(target=run) for _ in range(threads)]
+                    start = time.perf_counter()
+                    for worker in workers:
+                        worker.start()
+                    for worker in workers:
+                        worker.join()
+                    elapsed = (time.perf_counter() - start) / (calls // threads * threads)
+                    line += f", socket x{threads} {elapsed * 1e6:8.1f} us/call"
+                    client.close()
+                print(line)
+    finally:
+        server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local inference daemon for the sign classifiers")
+    parser.add_argument('command', choices=('serve', 'bench'))
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH)
+    parser.add_argument('--interpreter-threads', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        benchmark(args.socket if args.socket != DEFAULT_SOCKET_PATH else f"{DEFAULT_SOCKET_PATH}.bench")
+        return
+    server = InferenceServer(args.socket, args.interpreter_threads)
+    print(f"Serving inference on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    main()
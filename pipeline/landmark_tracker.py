@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Run hand detection every N frames and predict landmarks in between.
+
+``SkippingHands`` wraps any hands detector (MediaPipe Hands, PooledHands,
+LiveStreamHands) and calls it on every ``detect_every``-th frame, or on the
+next frame when the last detection disagreed with the prediction by more than
+``error_threshold`` hand sizes. On the frames in between, each tracked hand's
+landmarks come from a constant-velocity Kalman filter. On detection frames the
+filter also smooths the detected landmarks, which removes most of the
+frame-to-frame jitter that flips the keypoint classifier between signs.
+
+The filter tracks x and y of all 21 landmarks as (21, 2) position and velocity
+arrays. Every coordinate has the same motion model and is measured on the
+same frames, so they all share one 2x2 covariance and gain, and a predict or
+update step is a handful of array operations.
+
+    SIGNOVA_DETECT_EVERY=3                     # Flask and Django, app3 --detect_every
+    python -m pipeline.landmark_tracker --video clip.mp4 [--every 1 2 3 4]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from pipeline.hands_pool import solution_results
+
+DEFAULT_DETECT_EVERY = int(os.environ.get('SIGNOVA_DETECT_EVERY', '1'))
+
+
+class LandmarkKalman(object):
+    """Constant-velocity Kalman filter over a (21, 2) landmark array, one step per frame.
+
+    ``process_noise`` is the acceleration variance per frame and
+    ``measurement_noise`` the detector's jitter variance, both in normalized
+    image coordinates.
+    """
+
+    def __init__(self, process_noise=2e-6, measurement_noise=1.6e-5, shape=(21, 2)):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.position = np.zeros(shape)
+        self.velocity = np.zeros(shape)
+        self.covariance = np.eye(2)
+        self._transition = np.array([[1.0, 1.0], [0.0, 1.0]])
+        self._noise = process_noise * np.array([[0.25, 0.5], [0.5, 1.0]])
+
+    def reset(self, measurement):
+        """Start tracking at ``measurement`` with unknown velocity"""
+        self.position = np.array(measurement, dtype=np.float64)
+        self.velocity = np.zeros_like(self.position)
+        self.covariance = np.diag([self.measurement_noise, 100.0 * self.process_noise])
+
+    def predict(self):
+        """Advance one frame, returns the predicted positions"""
+        self.position += self.velocity
+        self.covariance = self._transition @ self.covariance @ self._transition.T + self._noise
+        return self.position
+
+    def update(self, measurement):
+        """Correct with a measured (21, 2) array, returns the innovation (measured - predicted)"""
+        innovation = measurement - self.position
+        gain = self.covariance[:, 0] / (self.covariance[0, 0] + self.measurement_noise)
+        self.position += gain[0] * innovation
+        self.velocity += gain[1] * innovation
+        self.covariance = self.covariance - np.outer(gain, self.covariance[0])
+        return innovation
+
+
+class _Track(object):
+    def __init__(self, label, score, points, kalman_options):
+        self.label = label
+        self.score = score
+        self.depth = points[:, 2].copy()  # z is not filtered, it is carried from the last detection
+        self.filter = LandmarkKalman(**kalman_options)
+        self.filter.reset(points[:, :2])
+
+
+def _hand_size(points):
+    """Diagonal of the landmarks' bounding box, the error scale"""
+    return max(float(np.linalg.norm(points.max(axis=0) - points.min(axis=0))), 1e-3)
+
+
+class SkippingHands(object):
+    """Hands detector that runs the wrapped one every ``detect_every`` frames and predicts in between.
+
+    ``process`` returns solutions-shaped results with a ``predicted`` flag.
+    """
+
+    def __init__(self, hands, detect_every=3, error_threshold=0.15, reset_threshold=1.0, smooth=True,
+                 kalman_options=None):
+        self.hands = hands
+        self.detect_every = max(1, detect_every)
+        self.error_threshold = error_threshold
+        self.reset_threshold = reset_threshold
+        self.smooth = smooth
+        self.kalman_options = kalman_options or {}
+        self._tracks = {}
+        self._since_detection = 0
+        self._force_detection = False
+        self.detected = 0
+        self.predicted = 0
+        self.forced = 0
+        self.last_error = None  # Innovation of the last detection, in hand sizes
+
+    def process(self, rgb_frame):
+        if not self._tracks or self._force_detection or self._since_detection + 1 >= self.detect_every:
+            return self._detect(rgb_frame)
+        self._since_detection += 1
+        self.predicted += 1
+        detections = []
+        for track in self._tracks.values():
+            position = track.filter.predict()
+            detections.append((track.label, track.score, np.column_stack([position, track.depth])))
+        return solution_results(detections, predicted=True)
+
+    def _detect(self, rgb_frame):
+        if self._force_detection:
+            self.forced += 1
+        results = self.hands.process(rgb_frame)
+        self.detected += 1
+        self._since_detection = 0
+        self._force_detection = False
+        tracks, detections, errors = {}, [], []
+        for landmarks, handedness in zip(results.multi_hand_landmarks or (), results.multi_handedness or ()):
+            category = handedness.classification[0]
+            key = category.label if category.label not in tracks else f'{category.label}-{len(tracks)}'
+            points = np.array([(p.x, p.y, p.z) for p in landmarks.landmark], dtype=np.float64)
+            track = self._tracks.get(key)
+            if track is None:
+                track = _Track(category.label, category.score, points, self.kalman_options)
+            else:
+                track.filter.predict()
+                error = float(np.linalg.norm(track.filter.update(points[:, :2]), axis=1).mean()) / _hand_size(points)
+                errors.append(error)
+                if error > self.reset_threshold:
+                    track.filter.reset(points[:, :2])  # A different hand, or it jumped
+                track.score, track.depth = category.score, points[:, 2].copy()
+            tracks[key] = track
+            position = track.filter.position if self.smooth else points[:, :2]
+            detections.append((category.label, category.score, np.column_stack([position, track.depth])))
+        self._tracks = tracks
+        self.last_error = max(errors) if errors else None
+        if self.last_error is not None and self.last_error > self.error_threshold:
+            self._force_detection = True  # Motion the filter does not follow, detect the next frame too
+        return solution_results(detections, predicted=False)
+
+    def stats(self):
+        return {'detected': self.detected, 'predicted': self.predicted, 'forced': self.forced,
+                'last_error': round(self.last_error, 4) if self.last_error is not None else None}
+
+    def reconfigure(self, **options):
+        """Passed on to the wrapped detector, False when it has to be rebuilt instead"""
+        reconfigure = getattr(self.hands, 'reconfigure', None)
+        return reconfigure(**options) if reconfigure is not None else False
+
+    def close(self):
+        self.hands.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost and classifier agreement of detecting every N frames")
+    parser.add_argument('--video', required=True)
+    parser.add_argument('--every', type=int, nargs='+', default=[1, 2, 3, 4])
+    parser.add_argument('--max_frames', type=int, default=600)
+    args = parser.parse_args()
+
+    import cv2 as cv
+    import mediapipe as mp
+    import app3
+
+    cap = cv.VideoCapture(args.video)
+    frames = []
+    while len(frames) < args.max_frames:
+        ret, image = cap.read()
+        if not ret:
+            break
+        frames.append(cv.flip(image, 1))
+    cap.release()
+    classifier = app3.create_keypoint_classifier()
+
+    def run(detect_every):
+        hands = SkippingHands(mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=1,
+                                                       min_detection_confidence=0.7, min_tracking_confidence=0.5),
+                              detect_every=detect_every)
+        signs, start = [], time.perf_counter()
+        for frame in frames:
+            results = hands.process(cv.cvtColor(frame, cv.COLOR_BGR2RGB))
+            sign = None
+            if results.multi_hand_landmarks:
+                landmark_list = app3.calc_landmark_list(frame, results.multi_hand_landmarks[0])
+                sign = classifier(app3.pre_process_landmark(landmark_list))
+            signs.append(sign)
+        elapsed = time.perf_counter() - start
+        stats = hands.stats()
+        hands.close()
+        return signs, elapsed, stats
+
+    reference, reference_elapsed, _ = run(1)
+    changes = sum(a != b for a, b in zip(reference, reference[1:]))
+    print(f"every 1: {reference_elapsed / len(frames) * 1000:6.2f} ms/frame, {changes} sign changes")
+    for detect_every in args.every:
+        if detect_every == 1:
+            continue
+        signs, elapsed, stats = run(detect_every)
+        agreement = np.mean([a == b for a, b in zip(reference, signs)])
+        changes = sum(a != b for a, b in zip(signs, signs[1:]))
+        print(f"every {detect_every}: {elapsed / len(frames) * 1000:6.2f} ms/frame, {changes} sign changes, "
+              f"{agreement:.1%} agree with every-frame detection, {stats['forced']} forced detections")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Adaptive quality ladder for camera sessions.
+
+Each session's ``QualityController`` watches its smoothed frame processing
+time against the frame budget at the target FPS. It steps one rung down the
+ladder after ``down_frames`` consecutive frames over budget. It steps one rung
+up only after ``up_frames`` consecutive frames under ``slack`` times the
+budget, a longer and stricter condition, so the level does not oscillate.
+Every change is followed by a cooldown while the smoothed time settles on the
+new settings.
+
+    level               detection width  max hands  complexity  overlay  JPEG
+    full                native           2          1           on       95
+    reduced-resolution  960              2          1           on       85
+    one-hand            640              1          1           on       80
+    lite-model          640              1          0           on       70
+    minimal             480              1          0           off      60
+
+The pipeline reads ``controller.level`` at the start of each frame, so a
+change applies at a frame boundary. When the hand count or model complexity
+changes, ``AdaptiveHands`` reconfigures detectors that support it (a hands
+pool session, the Tasks landmarker) and rebuilds the others, the session
+keeps running.
+The current level of every session is in ``session_levels()``.
+
+    SIGNOVA_ADAPTIVE_QUALITY=1      # otherwise sessions stay on the top rung
+"""
+import os
+import threading
+
+ADAPTIVE_QUALITY = os.environ.get('SIGNOVA_ADAPTIVE_QUALITY', 'False').lower() in ('1', 'true')
+
+
+class QualityLevel(object):
+    def __init__(self, name, detection_width, max_num_hands, model_complexity, draw_overlay, jpeg_quality):
+        self.name = name
+        self.detection_width = detection_width  # None keeps the camera resolution
+        self.max_num_hands = max_num_hands
+        self.model_complexity = model_complexity
+        self.draw_overlay = draw_overlay
+        self.jpeg_quality = jpeg_quality
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+QUALITY_LADDER = (
+    QualityLevel('full', None, 2, 1, True, 95),
+    QualityLevel('reduced-resolution', 960, 2, 1, True, 85),
+    QualityLevel('one-hand', 640, 1, 1, True, 80),
+    QualityLevel('lite-model', 640, 1, 0, True, 70),
+    QualityLevel('minimal', 480, 1, 0, False, 60),
+)
+
+
+class QualityController(object):
+    def __init__(self, target_fps=30.0, ladder=QUALITY_LADDER, adaptive=True, down_frames=15, up_frames=90,
+                 slack=0.7, cooldown_frames=30, smoothing=0.1):
+        self.ladder = ladder
+        self.budget = 1.0 / target_fps
+        self.adaptive = adaptive
+        self.down_frames = down_frames
+        self.up_frames = up_frames
+        self.slack = slack
+        self.cooldown_frames = cooldown_frames
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self.index = 0
+        self.frame_seconds = None  # Moving average
+        self._behind = 0
+        self._ahead = 0
+        self._cooldown = 0
+        self.changes = 0
+
+    @property
+    def level(self):
+        return self.ladder[self.index]
+
+    def record(self, frame_seconds):
+        """Account one frame's processing time, returns the new level when it changed, else None"""
+        if frame_seconds is None:
+            return None
+        with self._lock:
+            if self.frame_seconds is None:
+                self.frame_seconds = frame_seconds
+            else:
+                self.frame_seconds += self.smoothing * (frame_seconds - self.frame_seconds)
+            if not self.adaptive:
+                return None
+            if self._cooldown > 0:
+                self._cooldown -= 1
+                return None
+            self._behind = self._behind + 1 if self.frame_seconds > self.budget else 0
+            self._ahead = self._ahead + 1 if self.frame_seconds < self.slack * self.budget else 0
+            step = 0
+            if self._behind >= self.down_frames and self.index < len(self.ladder) - 1:
+                step = 1
+            elif self._ahead >= self.up_frames and self.index > 0:
+                step = -1
+            if not step:
+                return None
+            self.index += step
+            self.changes += 1
+            self._behind = self._ahead = 0
+            self._cooldown = self.cooldown_frames
+            return self.ladder[self.index]
+
+    def status(self):
+        with self._lock:
+            return {
+                'level': self.level.name,
+                'index': self.index,
+                'settings': self.level.as_dict(),
+                'frame_ms': round(self.frame_seconds * 1000.0, 2) if self.frame_seconds is not None else None,
+                'budget_ms': round(self.budget * 1000.0, 2),
+                'adaptive': self.adaptive,
+                'changes': self.changes,
+            }
+
+
+class AdaptiveHands(object):
+    """Hands detector that follows a QualityController's level.
+
+    ``factory(max_num_hands, model_complexity)`` builds the wrapped detector.
+    A detector with ``reconfigure(max_num_hands=, model_complexity=)``
+    returning True applies new settings itself and is kept, others are
+    closed and built again. ``max_num_hands`` and ``model_complexity`` are
+    the session's own limits, the ladder never raises them.
+    """
+
+    def __init__(self, factory, controller, max_num_hands=2, model_complexity=1):
+        self.factory = factory
+        self.controller = controller
+        self.max_num_hands = max_num_hands
+        self.model_complexity = model_complexity
+        self.hands = None
+        self._settings = None
+        self.rebuilds = 0
+        self.reconfigures = 0
+
+    def _configure(self, level):
+        settings = (min(self.max_num_hands, level.max_num_hands), min(self.model_complexity, level.model_complexity))
+        if settings == self._settings:
+            return
+        reconfigure = getattr(self.hands, 'reconfigure', None)
+        if reconfigure is not None and reconfigure(max_num_hands=settings[0], model_complexity=settings[1]):
+            self.reconfigures += 1
+        else:
+            if self.hands is not None:
+                self.hands.close()
+                self.rebuilds += 1
+            self.hands = self.factory(*settings)
+        self._settings = settings
+
+    def process(self, rgb_frame):
+        level = self.controller.level  # Read once, the frame uses one level throughout
+        self._configure(level)
+        width = rgb_frame.shape[1]
+        if level.detection_width and width > level.detection_width:
+            import cv2 as cv
+            height = round(rgb_frame.shape[0] * level.detection_width / width)
+            # Landmarks are normalized, detecting on a smaller frame does not move them
+            rgb_frame = cv.resize(rgb_frame, (level.detection_width, height), interpolation=cv.INTER_AREA)
+        return self.hands.process(rgb_frame)
+
+    def close(self):
+        if self.hands is not None:
+            self.hands.close()
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def create_quality_controller(session_id, target_fps=30.0, adaptive=ADAPTIVE_QUALITY):
+    """A session's controller, registered for ``session_levels``"""
+    controller = QualityController(target_fps, adaptive=adaptive)
+    with _sessions_lock:
+        _sessions[session_id] = controller
+    return controller
+
+
+def get_quality_controller(session_id):
+    with _sessions_lock:
+        return _sessions.get(session_id)
+
+
+def release_quality_controller(session_id):
+    with _sessions_lock:
+        _sessions.pop(session_id, None)
+
+
+def session_levels():
+    """{session_id: status} of every running session"""
+    with _sessions_lock:
+        controllers = dict(_sessions)
+    return {session_id: controller.status() for session_id, controller in controllers.items()}
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""Measure per-worker memory of the gunicorn deployment.
+
+Starts gunicorn with 1, 2 and 4 workers, waits for the health check, polls
+/ml_status/ until no worker is still loading the ML stack, and reads the master's and
+workers' RSS, PSS and shared memory from /proc/<pid>/smaps_rollup (Linux).
+PSS splits shared pages between the processes that map them, so the sum of
+PSS is what the deployment really costs.
+
+    python scripts/measure_worker_rss.py [--no-preload] [--port 8765]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def memory_mb(pid):
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:', 'Shared_Clean:', 'Shared_Dirty:'):
+                values[parts[0][:-1]] = int(parts[1]) / 1024.0
+    return values['Rss'], values['Pss'], values['Shared_Clean'] + values['Shared_Dirty']
+
+
+def children(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(child) for child in f.read().split()]
+
+
+def wait_until_up(url, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=2).read()
+            return True
+        except OSError:
+            time.sleep(0.5)
+    return False
+
+
+def measure(workers, port, preload, timeout):
+    # Without preloading every worker loads the ML stack itself, right after it starts
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), SIGNOVA_ML_WARMUP='background',
+               SIGNOVA_PRELOAD_MODELS='True' if preload else 'False')
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'signova.wsgi:application',
+                               '--bind', f'127.0.0.1:{port}'], cwd=ROOT, env=env)
+    try:
+        base = f'http://127.0.0.1:{port}'
+        if not wait_until_up(base + '/simple-health-check/', timeout):
+            raise SystemExit(f"gunicorn with {workers} workers did not come up")
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            states = [json.loads(urllib.request.urlopen(base + '/ml_status/', timeout=timeout).read())['ml']['state']
+                      for _ in range(4 * workers)]
+            if 'loading' not in states:
+                break
+            time.sleep(1.0)
+        master = memory_mb(server.pid)
+        return master, [memory_mb(pid) for pid in children(server.pid)]
+    finally:
+        server.terminate()
+        server.wait(30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--no-preload', action='store_true')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--timeout', type=float, default=180.0)
+    args = parser.parse_args()
+
+    print("workers  master RSS  worker RSS (mean)  worker PSS (mean)  shared (mean)  total PSS")
+    for workers in (1, 2, 4):
+        master, worker_memory = measure(workers, args.port, not args.no_preload, args.timeout)
+        rss, pss, shared = (sum(values) / len(worker_memory) for values in zip(*worker_memory))
+        total = master[1] + sum(values[1] for values in worker_memory)
+        print(f"{workers:7d}  {master[0]:8.0f} MB  {rss:14.0f} MB  {pss:14.0f} MB  {shared:10.0f} MB  {total:6.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -105,6 +105,13 @@ if IS_RENDER:
     # Memory trimming thresholds
     MALLOC_TRIM_THRESHOLD_ = 65536  # 64KB
 
+# Sign recognition pipeline profile: low-power, balanced or accuracy (pipeline/config.py)
+SIGNOVA_PIPELINE_PROFILE = os.getenv('SIGNOVA_PIPELINE_PROFILE', 'balanced')
+
+# Speak recognized words and sentences on the server's own sound device, only useful when the browser
+# runs on the same machine. Browsers otherwise play /sentence_audio/ themselves.
+SIGNOVA_SERVER_SPEECH = os.getenv('SIGNOVA_SERVER_SPEECH', 'False').lower() in ('1', 'true')
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Authentication
@@ -23,6 +23,10 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'signova.settings')
 # Get the standard WSGI application
 base_application = get_wsgi_application()
 
+# The ML stack is imported lazily, SIGNOVA_ML_WARMUP=background starts loading it now
+from signova_app.ml_runtime import warm_up
+warm_up()
+
 # Use our custom WSGI handler on Render to catch 400 errors
 if is_render:
     django_app = CustomWSGIHandler()
@@ -19,14 +19,23 @@ from app3 import (
     KeyPointClassifier, PointHistoryClassifier, CvFpsCalc, AudioTranslator,
     SentenceRecorder, calc_bounding_rect, calc_landmark_list, pre_process_landmark,
     pre_process_point_history, draw_landmarks, draw_bounding_rect, draw_info_text,
-    draw_point_history, draw_info, draw_sentence_info
+    draw_point_history, draw_info, draw_sentence_info, classify_hand, create_pipeline_decoder,
+    emit_decoded_sign, create_dynamic_sign_recognizer, create_keypoint_classifier, create_hand_detector,
+    IGNORED_SIGNS
 )
+from model.sign_decoder import DEFAULT_DECODER
+from model.sample_capture import get_sample_capture
+from pipeline.admission import get_admission_controller, FrameMeter
+from pipeline.config import get_pipeline_config
+from pipeline.quality import AdaptiveHands, create_quality_controller, release_quality_controller, session_levels
 
 # Initialize Flask app
 app = Flask(__name__, static_folder='static')
 app.config['SECRET_KEY'] = secrets.token_hex(16)
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///signova.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Sign recognition pipeline profile: low-power, balanced or accuracy (pipeline/config.py)
+app.config['SIGNOVA_PIPELINE_PROFILE'] = os.environ.get('SIGNOVA_PIPELINE_PROFILE', 'balanced')
 
 # Initialize database
 db = SQLAlchemy(app)
@@ -65,6 +74,7 @@ recognized_signs = []
 signs_lock = threading.Lock()
 audio_translator = None
 sentence_recorder = None
+dynamic_recognizer = None
 
 # Video paths for learning module
 VIDEO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'videos')
@@ -267,8 +277,13 @@ def video(video_name):
         return Response(generate_video(), mimetype='multipart/x-mixed-replace; boundary=frame')
     return "Video not found", 404
 
+def pipeline_config():
+    """The pipeline profile named by app.config['SIGNOVA_PIPELINE_PROFILE']"""
+    return get_pipeline_config(app.config.get('SIGNOVA_PIPELINE_PROFILE'))
+
 @app.route('/video_feed')
 def video_feed():
+    stream_interval = pipeline_config().stream_interval
     def generate():
         global frame_buffer
         while True:
@@ -276,7 +291,7 @@ def video_feed():
                 if frame_buffer is not None:
                     yield (b'--frame\r\n'
                            b'Content-Type: image/jpeg\r\n\r\n' + frame_buffer + b'\r\n')
-            time.sleep(0.03)  # Control frame rate
+            time.sleep(stream_interval)  # Control frame rate
     return Response(generate(), mimetype='multipart/x-mixed-replace; boundary=frame')
 
 @app.route('/start_camera')
@@ -286,10 +301,19 @@ def start_camera():
     if camera is not None or (processing_thread is not None and processing_thread.is_alive()):
         return jsonify({"status": "Camera already running"})
     
+    # Turn the session away rather than slow down the ones already running
+    decision = get_admission_controller().admit('flask-camera')
+    if not decision['admitted']:
+        response = jsonify({"status": f"Server is at capacity: {decision['message']}", "admission": decision})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(decision['retry_after'])
+        return response
+    
+    config = pipeline_config()
     should_stop = False
     camera = cv.VideoCapture(0)  # Use default camera
-    camera.set(cv.CAP_PROP_FRAME_WIDTH, 1280)
-    camera.set(cv.CAP_PROP_FRAME_HEIGHT, 720)
+    camera.set(cv.CAP_PROP_FRAME_WIDTH, config.camera_width)
+    camera.set(cv.CAP_PROP_FRAME_HEIGHT, config.camera_height)
     
     # Initialize audio translator and sentence recorder
     audio_translator = AudioTranslator(rate=150)
@@ -304,7 +328,7 @@ def start_camera():
 
 @app.route('/stop_camera')
 def stop_camera():
-    global camera, should_stop, processing_thread
+    global camera, should_stop, processing_thread, audio_translator
     
     should_stop = True
     if processing_thread is not None:
@@ -313,9 +337,16 @@ def stop_camera():
     if camera is not None:
         camera.release()
         camera = None
+    get_admission_controller().release('flask-camera')
+    if audio_translator is not None:
+        audio_translator.stop()
     
     return jsonify({"status": "Camera stopped"})
 
+@app.route('/pipeline_status')
+def pipeline_status():
+    return jsonify({"admission": get_admission_controller().stats(), "quality": session_levels()})
+
 @app.route('/get_recognized_signs')
 def get_recognized_signs():
     global recognized_signs
@@ -358,6 +389,18 @@ def speak_sentence():
         sentence_recorder.speak_sentence()
     return jsonify({"status": "Speaking sentence"})
 
+@app.route('/speech_metrics')
+def speech_metrics():
+    if audio_translator:
+        return jsonify(audio_translator.get_metrics())
+    return jsonify({"status": "Error: Audio translator not initialized"})
+
+@app.route('/sign_metrics')
+def sign_metrics():
+    if dynamic_recognizer:
+        return jsonify(dynamic_recognizer.stats())
+    return jsonify({"status": "Error: Dynamic sign recognizer not running"})
+
 @app.route('/set_language', methods=['POST'])
 def set_language():
     global sentence_recorder
@@ -396,32 +439,36 @@ def get_translation():
 
 def process_camera_feed():
     global camera, should_stop, frame_buffer, recognized_signs, audio_translator, sentence_recorder
+    global dynamic_recognizer
+
+    config = pipeline_config()
 
-    # Initialize MediaPipe Hands
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(
-        static_image_mode=False,
-        max_num_hands=2,
-        min_detection_confidence=0.7,
-        min_tracking_confidence=0.5,
-    )
+    # Initialize MediaPipe Hands, rebuilt when the quality level changes the hand count or model
+    quality = create_quality_controller('flask-camera', config.target_fps, config.adaptive_quality)
+    hands = AdaptiveHands(lambda max_num_hands, model_complexity: create_hand_detector(
+        'flask-camera',
+        detect_every=config.detect_every,
+        **dict(config.hands_options(), max_num_hands=max_num_hands, model_complexity=model_complexity),
+    ), quality, config.max_num_hands, config.model_complexity)
     
     # Initialize classifiers
-    keypoint_classifier = KeyPointClassifier()
+    keypoint_classifier = create_keypoint_classifier()
     point_history_classifier = PointHistoryClassifier()
-    cv_fps_calc = CvFpsCalc(buffer_len=10)
+    cv_fps_calc = CvFpsCalc(buffer_len=config.fps_buffer_len)
     
-    # Load labels
-    import csv
-    with open('model/keypoint_classifier/keypoint_classifier_label.csv', encoding='utf-8-sig') as f:
-        keypoint_classifier_labels = [row[0] for row in csv.reader(f)]
+    # Labels from the shared vocabulary
+    keypoint_classifier_labels = keypoint_classifier.labels
+    point_history_classifier_labels = point_history_classifier.labels
     
-    with open('model/point_history_classifier/point_history_classifier_label.csv', encoding='utf-8-sig') as f:
-        point_history_classifier_labels = [row[0] for row in csv.reader(f)]
+    # Temporal smoothing of predictions, selected with SIGNOVA_SIGN_DECODER
+    sign_decoder = create_pipeline_decoder(DEFAULT_DECODER, keypoint_classifier_labels)
+    dynamic_recognizer = create_dynamic_sign_recognizer(DEFAULT_DECODER)
+    sample_capture = get_sample_capture()  # SIGNOVA_CAPTURE_UNCERTAIN=1
     
     # Initialize variables
     point_history = deque([[0, 0] for _ in range(16)], maxlen=16)
     last_gesture_time = time.time()
+    frame_meter = FrameMeter(get_admission_controller(), 'flask-camera')
     
     while not should_stop:
         if camera is None:
@@ -430,6 +477,8 @@ def process_camera_feed():
         ret, image = camera.read()
         if not ret:
             continue
+        frame_meter.start()
+        level = quality.level  # Changes apply from the next frame
         
         fps = cv_fps_calc.get()
         
@@ -446,6 +495,7 @@ def process_camera_feed():
         image.flags.writeable = True
         
         # Process hand landmarks if detected
+        frame_probabilities = None
         if results.multi_hand_landmarks:
             last_gesture_time = time.time()
             for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
@@ -460,15 +510,13 @@ def process_camera_feed():
                 pre_processed_point_history_list = pre_process_point_history(debug_image, point_history)
                 
                 # Classification
-                try:
-                    hand_sign_id, confidence = keypoint_classifier(pre_processed_landmark_list)
-                    hand_sign_id = int(hand_sign_id)
-                    if not 0 <= hand_sign_id < len(keypoint_classifier_labels):
-                        hand_sign_id = 0  # Default to "None"
-                except Exception as e:
-                    print(f"Classification error: {e}")
-                    hand_sign_id = 0
-                    confidence = 0.0
+                hand_sign_id, confidence, probabilities = classify_hand(
+                    keypoint_classifier, pre_processed_landmark_list, len(keypoint_classifier_labels))
+                if sample_capture is not None:
+                    sample_capture.offer(pre_processed_landmark_list, probabilities)
+                if probabilities is not None:
+                    frame_probabilities = probabilities if frame_probabilities is None \
+                        else np.maximum(frame_probabilities, probabilities)
                 
                 # Update point history
                 if confidence > 0.7 and len(landmark_list) > 8:
@@ -477,10 +525,10 @@ def process_camera_feed():
                     point_history.append([0, 0])
                 
                 # Add recognized sign to the list if confidence is high enough
-                if 0 <= hand_sign_id < len(keypoint_classifier_labels):
+                if sign_decoder is None and 0 <= hand_sign_id < len(keypoint_classifier_labels):
                     recognized_word = keypoint_classifier_labels[hand_sign_id]
-                    if recognized_word not in ["None", "Point"]:
-                        if sentence_recorder.add_word(recognized_word):
+                    if recognized_word not in IGNORED_SIGNS:
+                        if sentence_recorder.add_word(recognized_word, confidence):
                             with signs_lock:
                                 recognized_signs.append(recognized_word)
                                 # Keep only the last 10 signs
@@ -488,20 +536,31 @@ def process_camera_feed():
                                     recognized_signs.pop(0)
                 
                 # Draw landmarks and information
-                debug_image = draw_bounding_rect(True, debug_image, brect)
-                debug_image = draw_landmarks(debug_image, landmark_list)
-                debug_image = draw_info_text(
-                    debug_image,
-                    brect,
-                    handedness,
-                    keypoint_classifier_labels[hand_sign_id],
-                    "",
-                )
+                if level.draw_overlay:
+                    debug_image = draw_bounding_rect(True, debug_image, brect)
+                    debug_image = draw_landmarks(debug_image, landmark_list)
+                    debug_image = draw_info_text(
+                        debug_image,
+                        brect,
+                        handedness,
+                        keypoint_classifier_labels[hand_sign_id],
+                        "",
+                    )
         else:
             point_history.append([0, 0])  # Append zeros when no hands detected
         
+        recognized_word = emit_decoded_sign(sign_decoder, frame_probabilities, keypoint_classifier_labels, sentence_recorder)
+        if dynamic_recognizer is not None:
+            recognized_word = dynamic_recognizer.update(results, sentence_recorder) or recognized_word
+        if recognized_word:
+            with signs_lock:
+                recognized_signs.append(recognized_word)
+                if len(recognized_signs) > 10:
+                    recognized_signs.pop(0)
+        
         # Draw point history and other information
-        debug_image = draw_point_history(debug_image, point_history)
+        if level.draw_overlay:
+            debug_image = draw_point_history(debug_image, point_history)
         debug_image = draw_info(debug_image, fps, 0, 0)
         debug_image = draw_sentence_info(
             debug_image, 
@@ -511,12 +570,16 @@ def process_camera_feed():
         )
         
         # Convert the image to JPEG
-        ret, buffer = cv.imencode('.jpg', debug_image)
+        ret, buffer = cv.imencode('.jpg', debug_image, [cv.IMWRITE_JPEG_QUALITY, level.jpeg_quality])
         if ret:
             with frame_lock:
                 frame_buffer = buffer.tobytes()
+        quality.record(frame_meter.stop())
+        if config.loop_sleep:
+            time.sleep(config.loop_sleep)
     
     # Clean up
+    release_quality_controller('flask-camera')
     if hands:
         hands.close()
     if camera:
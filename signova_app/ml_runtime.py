@@ -0,0 +1,232 @@
+"""Lazy loading of the ML stack for the Django views.
+
+Importing OpenCV, MediaPipe, TensorFlow and app3 (which pulls in pyttsx3)
+costs seconds and hundreds of MB, so views.py does not do it at import time.
+The runtime loads them on a background thread when the first ML endpoint is
+hit, or as soon as the worker is serving when SIGNOVA_ML_WARMUP=background.
+Views read the load state and error from ``status()`` instead of a flag set
+at import time.
+
+    disabled                        RENDER / DISABLE_TENSORFLOW / SIGNOVA_DISABLE_ML
+    idle -> loading -> ready        the modules are in ``runtime.modules``
+                    -> failed       the import error is in ``runtime.error``
+
+    python -m signova_app.ml_runtime    # startup time and RSS with and without ML
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+STATE_DISABLED = 'disabled'
+STATE_IDLE = 'idle'
+STATE_LOADING = 'loading'
+STATE_READY = 'ready'
+STATE_FAILED = 'failed'
+
+WARMUP_MODES = ('lazy', 'background')
+DEFAULT_WARMUP = os.environ.get('SIGNOVA_ML_WARMUP', 'lazy')
+# How long an ML endpoint waits for a load in progress before answering 503
+LOAD_WAIT_SECONDS = float(os.environ.get('SIGNOVA_ML_LOAD_WAIT', '20'))
+
+# app3 names the video pipeline uses
+APP3_EXPORTS = (
+    'KeyPointClassifier', 'PointHistoryClassifier', 'CvFpsCalc', 'AudioTranslator', 'SentenceRecorder',
+    'calc_bounding_rect', 'calc_landmark_list', 'pre_process_landmark', 'pre_process_point_history',
+    'draw_landmarks', 'draw_bounding_rect', 'draw_info_text', 'draw_point_history', 'draw_info',
+    'draw_sentence_info', 'classify_hand', 'create_pipeline_decoder', 'emit_decoded_sign',
+    'create_dynamic_sign_recognizer', 'create_keypoint_classifier', 'create_hand_detector', 'IGNORED_SIGNS',
+)
+
+
+def ml_disabled_reason():
+    """Why ML is switched off for this process, None when it may be loaded"""
+    if os.environ.get('RENDER', 'False').lower() == 'true':
+        return 'RENDER'
+    if os.environ.get('DISABLE_TENSORFLOW', 'False').lower() == 'true':
+        return 'DISABLE_TENSORFLOW'
+    if os.environ.get('SIGNOVA_DISABLE_ML', 'False').lower() == 'true':
+        return 'SIGNOVA_DISABLE_ML'
+    return None
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB, None where it cannot be read"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / (1024.0 * 1024.0) if sys.platform == 'darwin' else rss / 1024.0
+    except ImportError:
+        return None
+
+
+def import_ml_modules():
+    """Import the ML stack, returns a namespace of the modules and app3 names the views use"""
+    import cv2 as cv
+    import numpy as np
+    import mediapipe as mp
+
+    # Set TensorFlow log level to suppress warnings
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+    import tensorflow as tf
+    # Limit TensorFlow memory usage
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    import app3
+    from model.sign_decoder import DEFAULT_DECODER
+    from model.sample_capture import get_sample_capture
+    return SimpleNamespace(cv=cv, np=np, mp=mp, tf=tf, DEFAULT_DECODER=DEFAULT_DECODER,
+                           get_sample_capture=get_sample_capture,
+                           **{name: getattr(app3, name) for name in APP3_EXPORTS})
+
+
+class MLRuntime(object):
+    def __init__(self, loader=import_ml_modules, disabled_reason=None):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self.disabled_reason = disabled_reason
+        self.state = STATE_DISABLED if disabled_reason else STATE_IDLE
+        self.modules = None
+        self.error = None
+        self.load_seconds = None
+        if disabled_reason:
+            self._loaded.set()
+
+    @property
+    def ready(self):
+        return self.state == STATE_READY
+
+    def start(self):
+        """Begin loading on a background thread if nothing has started yet, returns the state"""
+        with self._lock:
+            if self.state != STATE_IDLE:
+                return self.state
+            self.state = STATE_LOADING
+        threading.Thread(target=self._load, daemon=True, name='ml-runtime-load').start()
+        return STATE_LOADING
+
+    def _load(self):
+        start = time.perf_counter()
+        modules, error = None, None
+        try:
+            modules = self._loader()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"Error loading ML modules: {error}")
+        with self._lock:
+            self.modules = modules
+            self.error = error
+            self.load_seconds = time.perf_counter() - start
+            self.state = STATE_READY if error is None else STATE_FAILED
+        self._loaded.set()
+
+    def require(self, timeout=LOAD_WAIT_SECONDS):
+        """The loaded modules, starting the load and waiting up to ``timeout`` seconds.
+
+        Returns None while disabled, failed or still loading, ``status()`` says which.
+        """
+        self.start()
+        self._loaded.wait(timeout)
+        return self.modules
+
+    def status(self):
+        with self._lock:
+            status = {
+                'state': self.state,
+                'error': self.error,
+                'disabled_reason': self.disabled_reason,
+                'load_seconds': round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            }
+        rss = current_rss_mb()
+        status['rss_mb'] = round(rss, 1) if rss is not None else None
+        return status
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_ml_runtime():
+    """The process-wide runtime, the disabling environment variables are read on first use"""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = MLRuntime(disabled_reason=ml_disabled_reason())
+        return _runtime
+
+
+def warm_up(mode=DEFAULT_WARMUP):
+    """Start the background load when configured to, called once the worker is serving"""
+    if mode not in WARMUP_MODES:
+        raise ValueError(f"Unknown warm-up mode: {mode}")
+    if mode == 'background':
+        get_ml_runtime().start()
+
+
+_MEASURE_SCRIPT = """
+import os, sys, time, json
+start = time.perf_counter()
+import django
+django.setup()
+import signova_app.views
+from signova_app.ml_runtime import get_ml_runtime, current_rss_mb
+result = {'boot_seconds': time.perf_counter() - start, 'boot_rss_mb': current_rss_mb()}
+if sys.argv[1] == 'ml':
+    runtime = get_ml_runtime()
+    runtime.require(timeout=None)
+    result.update(runtime.status(), total_seconds=time.perf_counter() - start)
+print(json.dumps(result))
+"""
+
+
+def measure(with_ml, runs=3):
+    """Boot Django in fresh interpreters, returns the per-run results"""
+    import json
+    env = dict(os.environ)
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'signova.settings')
+    env.pop('SIGNOVA_DISABLE_ML', None)
+    if not with_ml:
+        env['SIGNOVA_DISABLE_ML'] = 'True'
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', _MEASURE_SCRIPT, 'ml' if with_ml else 'web'],
+                                cwd=root, env=env, capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Django startup time and RSS with and without the ML stack")
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    web = measure(False, args.runs)
+    print(f"Without ML: boot {statistics.median(r['boot_seconds'] for r in web):.2f} s, "
+          f"RSS {statistics.median(r['boot_rss_mb'] for r in web):.0f} MB")
+    ml = measure(True, args.runs)
+    print(f"With ML:    boot {statistics.median(r['boot_seconds'] for r in ml):.2f} s, "
+          f"RSS {statistics.median(r['boot_rss_mb'] for r in ml):.0f} MB before loading")
+    failed = [r['error'] for r in ml if r['state'] != STATE_READY]
+    if failed:
+        print(f"ML load failed: {failed[0]}")
+        return
+    print(f"            load {statistics.median(r['load_seconds'] for r in ml):.2f} s, "
+          f"RSS {statistics.median(r['rss_mb'] for r in ml):.0f} MB once loaded")
+
+
+if __name__ == '__main__':
+    main()
@@ -37,6 +37,11 @@ urlpatterns = [
     path('stop_camera/', views.stop_camera, name='stop_camera'),
     path('clear_sentence/', views.clear_sentence, name='clear_sentence'),
     path('speak_sentence/', views.speak_sentence, name='speak_sentence'),
+    path('speech_metrics/', views.speech_metrics, name='speech_metrics'),
+    path('sign_metrics/', views.sign_metrics, name='sign_metrics'),
+    path('ml_status/', views.ml_status, name='ml_status'),
+    path('sentence_audio/', views.sentence_audio, name='sentence_audio'),
+    path('phrase_audio/', views.phrase_audio, name='phrase_audio'),
     path('get_recognized_signs/', views.get_recognized_signs, name='get_recognized_signs'),
     path('set_language/', views.set_language, name='set_language'),
     path('about/', views.about, name='about'),
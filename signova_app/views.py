@@ -1,61 +1,32 @@
+import io
 import os
 import time
 import threading
-import csv
 import copy
 from collections import deque
+from urllib.parse import urlencode
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
-from django.http import StreamingHttpResponse, JsonResponse, HttpResponse
+from django.http import StreamingHttpResponse, JsonResponse, HttpResponse, FileResponse, HttpResponseNotModified
+from django.urls import reverse
+from django.utils.cache import parse_etags
 from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib import messages
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import login, authenticate
 from django.views.static import serve
+from speech.audio_service import get_audio_service
+from pipeline.admission import get_admission_controller, FrameMeter
+from pipeline.config import get_pipeline_config
+from pipeline.quality import (
+    AdaptiveHands, create_quality_controller, get_quality_controller, release_quality_controller, session_levels,
+)
 
-# Conditionally import ML dependencies
-ML_IMPORTS_AVAILABLE = False
+from .ml_runtime import get_ml_runtime, STATE_DISABLED, STATE_FAILED
 
-# Check if ML features should be disabled
-is_render = os.environ.get('RENDER', 'False').lower() == 'true'
-disable_tensorflow = os.environ.get('DISABLE_TENSORFLOW', 'False').lower() == 'true'
-disable_ml = os.environ.get('SIGNOVA_DISABLE_ML', 'False').lower() == 'true'
-
-# Skip ML imports if we're on Render or if ML is explicitly disabled
-if not (is_render or disable_tensorflow or disable_ml):
-    try:
-        # Import lightweight dependencies first
-        import cv2 as cv
-        import numpy as np
-        
-        # Try to import MediaPipe (less memory intensive than TensorFlow)
-        import mediapipe as mp
-        
-        # Only import TensorFlow if explicitly allowed
-        try:
-            # Set TensorFlow log level to suppress warnings
-            os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
-            import tensorflow as tf
-            # Limit TensorFlow memory usage
-            gpus = tf.config.experimental.list_physical_devices('GPU')
-            if gpus:
-                for gpu in gpus:
-                    tf.config.experimental.set_memory_growth(gpu, True)
-            # Import application modules
-            from app3 import (
-                KeyPointClassifier, PointHistoryClassifier, CvFpsCalc, AudioTranslator,
-                SentenceRecorder, calc_bounding_rect, calc_landmark_list, pre_process_landmark,
-                pre_process_point_history, draw_landmarks, draw_bounding_rect, draw_info_text,
-                draw_point_history, draw_info, draw_sentence_info
-            )
-            ML_IMPORTS_AVAILABLE = True
-        except ImportError:
-            # TensorFlow not available, but we might still have OpenCV and MediaPipe
-            pass
-    except ImportError:
-        # For web deployment without ML dependencies
-        pass
+# cv2, mediapipe, tensorflow and app3 are imported by the ML runtime on first
+# use (or on warm-up), not here, see ml_runtime.py
 
 # Global variables for video processing
 camera = None
@@ -67,6 +38,7 @@ recognized_signs = []
 signs_lock = threading.Lock()
 audio_translator = None
 sentence_recorder = None
+dynamic_recognizer = None
 
 # Video paths for learning module
 VIDEO_DIR = os.path.join(settings.MEDIA_ROOT, 'videos')
@@ -82,6 +54,58 @@ VIDEO_FILES = {
     'you': os.path.join(VIDEO_DIR, 'You.mp4')
 }
 
+def ml_error_response(runtime):
+    """JSON error for an ML request while the runtime is disabled, failed or still loading"""
+    status = runtime.status()
+    if status['state'] == STATE_DISABLED:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'ML features are not available in web deployment mode',
+            'ml': status
+        })
+    if status['state'] == STATE_FAILED:
+        return JsonResponse({
+            'status': 'error',
+            'message': f"ML features failed to load: {status['error']}",
+            'ml': status
+        }, status=503)
+    response = JsonResponse({'status': 'loading', 'message': 'ML models are loading', 'ml': status}, status=503)
+    response['Retry-After'] = '2'
+    return response
+
+def ml_disabled_response():
+    """Error response when the ML stack is disabled or failed to load, else None"""
+    runtime = get_ml_runtime()
+    if runtime.state in (STATE_DISABLED, STATE_FAILED):
+        return ml_error_response(runtime)
+    return None
+
+def pipeline_config():
+    """The pipeline profile named by settings.SIGNOVA_PIPELINE_PROFILE"""
+    return get_pipeline_config(getattr(settings, 'SIGNOVA_PIPELINE_PROFILE', None))
+
+def admission_rejected_response(decision):
+    """503 for a camera session the admission controller turned away"""
+    response = JsonResponse({
+        'status': 'error',
+        'message': f"Server is at capacity: {decision['message']}",
+        'admission': decision
+    }, status=503)
+    response['Retry-After'] = str(decision['retry_after'])
+    return response
+
+def status_frame(message):
+    """A JPEG frame showing a message, plain text when OpenCV is unavailable"""
+    try:
+        import numpy as np
+        import cv2 as cv
+        frame = np.zeros((480, 640, 3), np.uint8)
+        cv.putText(frame, message, (50, 240), cv.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        ret, buffer = cv.imencode('.jpg', frame)
+        return buffer.tobytes()
+    except ImportError:
+        return message.encode()
+
 # Home page view
 def index(request):
     # Check if we're on Render and add a small delay to prevent worker timeout
@@ -148,49 +172,48 @@ def signup(request):
 def gen_frames():
     global frame_buffer, frame_lock
     
-    if not ML_IMPORTS_AVAILABLE:
-        # If ML imports are not available, return a static message frame
-        while True:
-            # Create a blank frame with a message
-            import numpy as np
-            try:
-                import cv2 as cv
-                frame = np.zeros((480, 640, 3), np.uint8)
-                cv.putText(frame, "ML features not available in web mode", (50, 240), 
-                          cv.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-                ret, buffer = cv.imencode('.jpg', frame)
-                frame_bytes = buffer.tobytes()
-            except ImportError:
-                # If even cv2 is not available, return a simple error message
-                frame_bytes = b'ML features not available in web mode'
-            
+    # The translator page is open, load the models in the background meanwhile
+    runtime = get_ml_runtime()
+    runtime.start()
+    stream_interval = pipeline_config().stream_interval
+    while True:
+        ml = runtime.modules
+        if ml is None:
+            # Static message while ML is disabled, loading or failed
+            messages_by_state = {
+                STATE_DISABLED: "ML features not available in web mode",
+                STATE_FAILED: "ML features failed to load",
+            }
+            frame_bytes = status_frame(messages_by_state.get(runtime.state, "Loading sign recognition..."))
             yield (b'--frame\r\n'
                    b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
             
             time.sleep(1.0)  # Slow refresh rate for static message
-    else:
-        # Normal operation with ML imports
-        while True:
-            with frame_lock:
-                if frame_buffer is not None:
-                    frame = frame_buffer.copy()
-                else:
-                    # Create a blank frame if no frame is available
-                    frame = np.zeros((480, 640, 3), np.uint8)
-                    # Add helpful message on blank frame
-                    cv.putText(frame, "Camera initializing...", (50, 240), cv.FONT_HERSHEY_SIMPLEX, 
-                              1, (255, 255, 255), 2, cv.LINE_AA)
-                    cv.putText(frame, "Please wait or check camera permissions", (50, 280), 
-                              cv.FONT_HERSHEY_SIMPLEX, 0.7, (200, 200, 200), 1, cv.LINE_AA)
-            
-            # Encode the frame as JPEG
-            ret, buffer = cv.imencode('.jpg', frame)
-            frame_bytes = buffer.tobytes()
-            
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-            
-            time.sleep(0.033)  # ~30 FPS
+            continue
+        
+        cv, np = ml.cv, ml.np
+        with frame_lock:
+            if frame_buffer is not None:
+                frame = frame_buffer.copy()
+            else:
+                # Create a blank frame if no frame is available
+                frame = np.zeros((480, 640, 3), np.uint8)
+                # Add helpful message on blank frame
+                cv.putText(frame, "Camera initializing...", (50, 240), cv.FONT_HERSHEY_SIMPLEX, 
+                          1, (255, 255, 255), 2, cv.LINE_AA)
+                cv.putText(frame, "Please wait or check camera permissions", (50, 280), 
+                          cv.FONT_HERSHEY_SIMPLEX, 0.7, (200, 200, 200), 1, cv.LINE_AA)
+        
+        # Encode the frame as JPEG, at the camera session's quality level
+        quality = get_quality_controller('django-camera')
+        params = [cv.IMWRITE_JPEG_QUALITY, quality.level.jpeg_quality] if quality is not None else []
+        ret, buffer = cv.imencode('.jpg', frame, params)
+        frame_bytes = buffer.tobytes()
+        
+        yield (b'--frame\r\n'
+               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+        
+        time.sleep(stream_interval)  # ~30 FPS in the balanced profile
 
 # Video feed view
 def video_feed(request):
@@ -201,29 +224,35 @@ def video_feed(request):
 def start_camera(request):
     global camera, processing_thread, should_stop, audio_translator, sentence_recorder
     
-    if not ML_IMPORTS_AVAILABLE:
-        # Return a message indicating ML features are not available in web mode
-        return JsonResponse({
-            'status': 'error',
-            'message': 'ML features are not available in web deployment mode'
-        })
+    # First ML request, imports the ML stack unless warm-up already has
+    runtime = get_ml_runtime()
+    ml = runtime.require()
+    if ml is None:
+        return ml_error_response(runtime)
     
     if camera is None:
+        # Turn the session away rather than slow down the ones already running
+        decision = get_admission_controller().admit('django-camera')
+        if not decision['admitted']:
+            return admission_rejected_response(decision)
         try:
-            camera = cv.VideoCapture(0)
-            camera.set(cv.CAP_PROP_FRAME_WIDTH, 1280)
-            camera.set(cv.CAP_PROP_FRAME_HEIGHT, 720)
+            config = pipeline_config()
+            camera = ml.cv.VideoCapture(0)
+            camera.set(ml.cv.CAP_PROP_FRAME_WIDTH, config.camera_width)
+            camera.set(ml.cv.CAP_PROP_FRAME_HEIGHT, config.camera_height)
             
             # Initialize audio and sentence recorder
-            audio_translator = AudioTranslator(rate=150)
-            sentence_recorder = SentenceRecorder(audio_translator)
+            audio_translator = ml.AudioTranslator(rate=150)
+            audio_translator.active = getattr(settings, 'SIGNOVA_SERVER_SPEECH', False)  # Desktop-only playback
+            sentence_recorder = ml.SentenceRecorder(audio_translator)
             
             # Start processing thread
             should_stop = False
-            processing_thread = threading.Thread(target=process_frames)
+            processing_thread = threading.Thread(target=process_frames, args=(ml,))
             processing_thread.daemon = True
             processing_thread.start()
         except Exception as e:
+            get_admission_controller().release('django-camera')
             return JsonResponse({
                 'status': 'error',
                 'message': f'Failed to initialize camera: {str(e)}'
@@ -236,13 +265,11 @@ def start_camera(request):
 # Stop camera API endpoint
 @csrf_exempt
 def stop_camera(request):
-    global camera, processing_thread, should_stop
+    global camera, processing_thread, should_stop, audio_translator
     
-    if not ML_IMPORTS_AVAILABLE:
-        return JsonResponse({
-            'status': 'error',
-            'message': 'ML features are not available in web deployment mode'
-        })
+    unavailable = ml_disabled_response()
+    if unavailable is not None:
+        return unavailable
     
     if camera is not None:
         should_stop = True
@@ -251,6 +278,9 @@ def stop_camera(request):
         
         camera.release()
         camera = None
+        get_admission_controller().release('django-camera')
+        if audio_translator is not None:
+            audio_translator.stop()
         
         return JsonResponse({'status': 'success', 'message': 'Camera stopped'})
     else:
@@ -261,11 +291,9 @@ def stop_camera(request):
 def clear_sentence(request):
     global sentence_recorder
     
-    if not ML_IMPORTS_AVAILABLE:
-        return JsonResponse({
-            'status': 'error',
-            'message': 'ML features are not available in web deployment mode'
-        })
+    unavailable = ml_disabled_response()
+    if unavailable is not None:
+        return unavailable
     
     if sentence_recorder is not None:
         sentence_recorder.current_sentence = []
@@ -278,28 +306,136 @@ def clear_sentence(request):
 def speak_sentence(request):
     global sentence_recorder
     
-    if not ML_IMPORTS_AVAILABLE:
-        return JsonResponse({
-            'status': 'error',
-            'message': 'ML features are not available in web deployment mode'
-        })
+    unavailable = ml_disabled_response()
+    if unavailable is not None:
+        return unavailable
     
     if sentence_recorder is not None:
+        # The browser plays audio_url, the server's speaker is only used when SIGNOVA_SERVER_SPEECH is on
         sentence_recorder.speak_sentence()
-        return JsonResponse({'status': 'success', 'message': 'Speaking sentence'})
+        return JsonResponse({
+            'status': 'success',
+            'message': 'Speaking sentence',
+            'audio_url': reverse('sentence_audio') + '?' + urlencode({'language': sentence_recorder.current_language})
+        })
     else:
         return JsonResponse({'status': 'error', 'message': 'Sentence recorder not initialized'})
 
+# Audio for the current sentence, redirects to the cacheable phrase audio URL
+def sentence_audio(request):
+    global sentence_recorder
+    
+    unavailable = ml_disabled_response()
+    if unavailable is not None:
+        return unavailable
+    
+    if sentence_recorder is None:
+        return JsonResponse({'status': 'error', 'message': 'Sentence recorder not initialized'})
+    
+    language = request.GET.get('language', sentence_recorder.current_language)
+    sentence = sentence_recorder.get_translation(sentence_recorder.get_current_sentence(), language)
+    if not sentence:
+        return JsonResponse({'status': 'error', 'message': 'No sentence to speak'}, status=404)
+    
+    query = {'text': sentence, 'language': language}
+    if request.GET.get('voice'):
+        query['voice'] = request.GET['voice']
+    query['v'] = get_audio_service().version(query.get('voice'))  # The URL changes with the rate and voice
+    response = redirect(reverse('phrase_audio') + '?' + urlencode(query))
+    response['Cache-Control'] = 'no-store'  # The current sentence changes, the target URL does not
+    return response
+
+def etag_matches(etag, if_none_match):
+    """Weak comparison of etag against an If-None-Match header, '*' matches any"""
+    etags = parse_etags(if_none_match)
+    return '*' in etags or etag in (tag[2:] if tag.startswith('W/') else tag for tag in etags)
+
+# Synthesized audio for a vocabulary phrase or a sentence made of them
+def phrase_audio(request):
+    text = ' '.join(request.GET.get('text', '').split())
+    language = request.GET.get('language', 'english')
+    voice = request.GET.get('voice') or None
+    
+    if not text or language not in ('english', 'kinyarwanda'):
+        return JsonResponse({'status': 'error', 'message': 'Invalid text or language'}, status=400)
+    
+    from model.translations import get_translation_tables
+    service = get_audio_service()
+    if not service.is_known_voice(voice):
+        return JsonResponse({'status': 'error', 'message': 'Unknown voice'}, status=400)
+    vocabulary = set(get_translation_tables().vocabulary())
+    phrases = service.split(text, vocabulary, voice)
+    if phrases is None:
+        return JsonResponse({'status': 'error', 'message': 'Unknown phrase'}, status=404)
+    
+    etag = service.etag(text, language, voice)
+    if request.GET.get('v') == service.version(voice):
+        cache_control = 'public, max-age=31536000, immutable'
+    else:
+        # Unversioned URLs revalidate, the ETag changes with the rate and default voice
+        cache_control = 'public, no-cache'
+    if etag_matches(etag, request.META.get('HTTP_IF_NONE_MATCH', '')):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        response['Cache-Control'] = cache_control
+        return response
+    
+    try:
+        audio = service.get_audio(phrases, voice)
+    except Exception as e:
+        return JsonResponse({'status': 'error', 'message': f'Speech synthesis failed: {str(e)}'}, status=500)
+    
+    if audio is None:
+        # Still rendering in the worker pool, the client retries shortly
+        response = JsonResponse({'status': 'pending', 'message': 'Audio is being generated'}, status=202)
+        response['Retry-After'] = '1'
+        response['Cache-Control'] = 'no-store'
+        return response
+    
+    response = FileResponse(io.BytesIO(audio), content_type='audio/wav')
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    response['Content-Disposition'] = 'inline; filename="speech.wav"'
+    return response
+
+# Speech worker metrics API endpoint
+def speech_metrics(request):
+    global audio_translator
+    
+    unavailable = ml_disabled_response()
+    if unavailable is not None:
+        return unavailable
+    
+    if audio_translator is not None:
+        return JsonResponse({'status': 'success', 'speech': audio_translator.get_metrics()})
+    else:
+        return JsonResponse({'status': 'error', 'message': 'Audio translator not initialized'})
+
+def sign_metrics(request):
+    global dynamic_recognizer
+    
+    unavailable = ml_disabled_response()
+    if unavailable is not None:
+        return unavailable
+    
+    if dynamic_recognizer is not None:
+        return JsonResponse({'status': 'success', 'dynamic_signs': dynamic_recognizer.stats()})
+    else:
+        return JsonResponse({'status': 'error', 'message': 'Dynamic sign recognizer not running'})
+
+# Load state of the ML stack
+def ml_status(request):
+    return JsonResponse({'status': 'success', 'ml': get_ml_runtime().status(),
+                         'admission': get_admission_controller().stats(), 'quality': session_levels()})
+
 # Get recognized signs API endpoint
 @csrf_exempt
 def get_recognized_signs(request):
     global sentence_recorder, recognized_signs, signs_lock
     
-    if not ML_IMPORTS_AVAILABLE:
-        return JsonResponse({
-            'status': 'error',
-            'message': 'ML features are not available in web deployment mode'
-        })
+    unavailable = ml_disabled_response()
+    if unavailable is not None:
+        return unavailable
     
     if sentence_recorder is not None:
         with signs_lock:
@@ -325,11 +461,9 @@ def health_check(request):
 def set_language(request):
     global sentence_recorder
     
-    if not ML_IMPORTS_AVAILABLE:
-        return JsonResponse({
-            'status': 'error',
-            'message': 'ML features are not available in web deployment mode'
-        })
+    unavailable = ml_disabled_response()
+    if unavailable is not None:
+        return unavailable
     
     if request.method == 'POST':
         language = request.POST.get('language', 'english')
@@ -413,58 +547,122 @@ def serve_video(request, video_name):
     return serve(request, os.path.basename(video_path), os.path.dirname(video_path))
 
 # Process frames function for ML processing
-def process_frames():
-    global camera, frame_buffer, frame_lock, should_stop, recognized_signs, signs_lock, sentence_recorder
-    
-    if not ML_IMPORTS_AVAILABLE:
-        return
+def process_frames(ml):
+    global camera, frame_buffer, frame_lock, should_stop, recognized_signs, signs_lock, sentence_recorder, audio_translator
+    global dynamic_recognizer
     
     try:
-        # Initialize MediaPipe hands module
-        mp_hands = mp.solutions.hands
-        hands = mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5,
-        )
+        config = pipeline_config()
+        
+        # Initialize MediaPipe hands module, rebuilt when the quality level changes the hand count or model
+        quality = create_quality_controller('django-camera', config.target_fps, config.adaptive_quality)
+        hands = AdaptiveHands(lambda max_num_hands, model_complexity: ml.create_hand_detector(
+            'django-camera',
+            detect_every=config.detect_every,
+            **dict(config.hands_options(), max_num_hands=max_num_hands, model_complexity=model_complexity),
+        ), quality, config.max_num_hands, config.model_complexity)
         
         # Initialize classifiers
-        keypoint_classifier = KeyPointClassifier()
-        point_history_classifier = PointHistoryClassifier()
+        keypoint_classifier = ml.create_keypoint_classifier()
+        point_history_classifier = ml.PointHistoryClassifier()
+        
+        # Labels from the shared vocabulary
+        keypoint_classifier_labels = keypoint_classifier.labels
+        point_history_classifier_labels = point_history_classifier.labels
         
-        # Read labels
-        with open('model/keypoint_classifier/keypoint_classifier_label.csv', encoding='utf-8-sig') as f:
-            keypoint_classifier_labels = [row[0] for row in csv.reader(f)]
-        with open('model/point_history_classifier/point_history_classifier_label.csv', encoding='utf-8-sig') as f:
-            point_history_classifier_labels = [row[0] for row in csv.reader(f)]
+        # Temporal smoothing of predictions, selected with SIGNOVA_SIGN_DECODER
+        sign_decoder = ml.create_pipeline_decoder(ml.DEFAULT_DECODER, keypoint_classifier_labels)
+        dynamic_recognizer = ml.create_dynamic_sign_recognizer(ml.DEFAULT_DECODER)
+        sample_capture = ml.get_sample_capture()  # SIGNOVA_CAPTURE_UNCERTAIN=1
         
         # Initialize variables
-        point_history = deque(maxlen=16)
+        point_history = deque([[0, 0] for _ in range(16)], maxlen=16)
         finger_gesture_history = deque(maxlen=16)
+        cv_fps_calc = ml.CvFpsCalc(buffer_len=config.fps_buffer_len)
+        last_gesture_time = time.time()
+        frame_meter = FrameMeter(get_admission_controller(), 'django-camera')
         
         while not should_stop:
             # Read frame from camera
             ret, frame = camera.read()
             if not ret:
                 continue
+            frame_meter.start()
+            level = quality.level  # Changes apply from the next frame
+            fps = cv_fps_calc.get()
             
             # Process frame with MediaPipe
-            frame = cv.flip(frame, 1)  # Mirror display
+            frame = ml.cv.flip(frame, 1)  # Mirror display
             debug_image = copy.deepcopy(frame)
             
             # Convert to RGB for MediaPipe
-            frame_rgb = cv.cvtColor(frame, cv.COLOR_BGR2RGB)
+            frame_rgb = ml.cv.cvtColor(frame, ml.cv.COLOR_BGR2RGB)
             results = hands.process(frame_rgb)
             
+            frame_probabilities = None
+            if results.multi_hand_landmarks:
+                last_gesture_time = time.time()
+                for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+                    brect = ml.calc_bounding_rect(debug_image, hand_landmarks)
+                    landmark_list = ml.calc_landmark_list(debug_image, hand_landmarks)
+                    pre_processed_landmark_list = ml.pre_process_landmark(landmark_list)
+                    
+                    hand_sign_id, confidence, probabilities = ml.classify_hand(
+                        keypoint_classifier, pre_processed_landmark_list, len(keypoint_classifier_labels))
+                    if sample_capture is not None:
+                        sample_capture.offer(pre_processed_landmark_list, probabilities)
+                    if probabilities is not None:
+                        frame_probabilities = probabilities if frame_probabilities is None \
+                            else ml.np.maximum(frame_probabilities, probabilities)
+                    
+                    if confidence > 0.7 and len(landmark_list) > 8:
+                        point_history.append(landmark_list[8] if hand_sign_id == 2 else [0, 0])
+                    else:
+                        point_history.append([0, 0])
+                    
+                    recognized_word = None
+                    if sign_decoder is None and 0 <= hand_sign_id < len(keypoint_classifier_labels):
+                        label = keypoint_classifier_labels[hand_sign_id]
+                        if label not in ml.IGNORED_SIGNS and sentence_recorder.add_word(label, confidence):
+                            recognized_word = label
+                    if recognized_word:
+                        with signs_lock:
+                            recognized_signs.append(recognized_word)
+                            recognized_signs[:] = recognized_signs[-10:]
+                    
+                    if level.draw_overlay:
+                        debug_image = ml.draw_bounding_rect(True, debug_image, brect)
+                        debug_image = ml.draw_landmarks(debug_image, landmark_list)
+                        debug_image = ml.draw_info_text(
+                            debug_image, brect, handedness, keypoint_classifier_labels[hand_sign_id], "")
+            else:
+                point_history.append([0, 0])
+            
+            recognized_word = ml.emit_decoded_sign(
+                sign_decoder, frame_probabilities, keypoint_classifier_labels, sentence_recorder)
+            if dynamic_recognizer is not None:
+                recognized_word = dynamic_recognizer.update(results, sentence_recorder) or recognized_word
+            if recognized_word:
+                with signs_lock:
+                    recognized_signs.append(recognized_word)
+                    recognized_signs[:] = recognized_signs[-10:]
+            
+            if level.draw_overlay:
+                debug_image = ml.draw_point_history(debug_image, point_history)
+            debug_image = ml.draw_info(debug_image, fps, 0, 0)
+            debug_image = ml.draw_sentence_info(
+                debug_image, sentence_recorder, last_gesture_time, audio_translator.is_speaking)
+            
             # Update frame buffer with processed frame
             with frame_lock:
                 frame_buffer = debug_image
+            quality.record(frame_meter.stop())
             
             # Sleep to reduce CPU usage
-            time.sleep(0.01)
+            time.sleep(config.loop_sleep)
     except Exception as e:
         print(f"Error in process_frames: {str(e)}")
     finally:
+        release_quality_controller('django-camera')
         if 'hands' in locals():
             hands.close()
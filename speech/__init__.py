@@ -0,0 +1,2 @@
+from speech.phrase_cache import PhraseCache, play_wav
+from speech.speech_worker import SpeechWorker, get_speech_worker, PRIORITY_SENTENCE, PRIORITY_WORD
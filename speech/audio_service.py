@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Synthesized phrase audio for HTTP clients.
+
+Audio comes from the on-disk phrase cache. Missing phrases are rendered in a
+small process pool, each process owning its own TTS engine, so request threads
+only ever wait a bounded time and never touch the sound device.
+"""
+import concurrent.futures
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+
+from speech.phrase_cache import PhraseCache, DEFAULT_CACHE_DIR, concat_wav, normalize_text, split_phrases
+
+SYNTHESIS_WORKERS = int(os.environ.get('SIGNOVA_TTS_WORKERS', '1'))
+SYNTHESIS_WAIT = float(os.environ.get('SIGNOVA_TTS_WAIT', '2.0'))  # Seconds a request waits before 202
+DEFAULT_RATE = int(os.environ.get('SIGNOVA_TTS_RATE', '150'))
+DEFAULT_VOICE = os.environ.get('SIGNOVA_TTS_VOICE') or None
+# Voices clients may ask for besides the default, comma separated ids
+VOICES = tuple(v.strip() for v in os.environ.get('SIGNOVA_TTS_VOICES', '').split(',') if v.strip())
+MAX_VOICE_CACHES = 8
+
+_synth_cache = None
+
+
+def _synthesize(cache_dir, voice_id, rate, text):
+    """Runs in a pool process, renders one phrase and returns its WAV bytes"""
+    global _synth_cache
+    if _synth_cache is None:
+        _synth_cache = PhraseCache(cache_dir=cache_dir)
+    _synth_cache.voice_id = voice_id or ''
+    _synth_cache.rate = rate
+    return _synth_cache.synthesize(text)
+
+
+class AudioService(object):
+    def __init__(
+        self,
+        cache_dir=DEFAULT_CACHE_DIR,
+        rate=DEFAULT_RATE,
+        voice_id=DEFAULT_VOICE,
+        workers=SYNTHESIS_WORKERS,
+        wait=SYNTHESIS_WAIT,
+        voices=VOICES,
+        max_voice_caches=MAX_VOICE_CACHES,
+    ):
+        self.cache_dir = cache_dir
+        self.rate = rate
+        self.voice_id = voice_id
+        self.workers = workers
+        self.wait = wait
+        self.voices = frozenset(voices) | {voice_id or ''}
+        self.max_voice_caches = max_voice_caches
+        self._caches = OrderedDict()  # voice_id -> PhraseCache, least recently used first
+        self._inflight = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def is_known_voice(self, voice_id):
+        """Whether voice_id is the default or one of the configured voices"""
+        return (voice_id or self.voice_id or '') in self.voices
+
+    def cache_for(self, voice_id=None):
+        voice_id = voice_id or self.voice_id or ''
+        if voice_id not in self.voices:
+            raise ValueError(f"Unknown voice: {voice_id}")
+        with self._lock:
+            cache = self._caches.get(voice_id)
+            if cache is None:
+                cache = self._caches[voice_id] = PhraseCache(cache_dir=self.cache_dir, voice_id=voice_id,
+                                                            rate=self.rate)
+                while len(self._caches) > self.max_voice_caches:
+                    self._caches.popitem(last=False)
+            else:
+                self._caches.move_to_end(voice_id)
+            return cache
+
+    def etag(self, text, language, voice_id=None):
+        raw = f"{language}\x1f{voice_id or self.voice_id or ''}\x1f{self.rate}\x1f{normalize_text(text)}"
+        return '"%s"' % hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def version(self, voice_id=None):
+        """Short tag of the resolved voice and rate, part of cacheable audio URLs"""
+        raw = f"{voice_id or self.voice_id or ''}\x1f{self.rate}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+    def split(self, text, vocabulary, voice_id=None):
+        """Phrases the text is made of, None if it is not built from known phrases"""
+        cache = self.cache_for(voice_id)
+        return split_phrases(text, lambda p: p in vocabulary or cache.contains(p))
+
+    def get_audio(self, phrases, voice_id=None):
+        """WAV bytes for the phrases spoken in order, or None while synthesis is pending.
+
+        Raises RuntimeError when the segments cannot be joined even after
+        rendering them again.
+        """
+        cache = self.cache_for(voice_id)
+        audio = cache.get(' '.join(phrases))
+        if audio is not None:
+            return audio
+        for rerender in (False, True):
+            segments = self._segments(cache, phrases, rerender)
+            if segments is None:
+                return None
+            audio = concat_wav([segments[phrase] for phrase in phrases])
+            if audio is not None:
+                return audio
+            # Cached segments that cannot be joined, mixed formats or a corrupt file: render them all again
+        raise RuntimeError("Phrase audio segments could not be joined")
+
+    def _segments(self, cache, phrases, rerender=False):
+        """{phrase: WAV bytes}, synthesizing the missing ones, None while synthesis is pending"""
+        phrases = list(dict.fromkeys(phrases))
+        # The bytes are kept, a segment evicted after this read cannot break the sentence
+        segments = {} if rerender else {phrase: cache.get(phrase) for phrase in phrases}
+        missing = [phrase for phrase in phrases if segments.get(phrase) is None]
+        if missing:
+            futures = {phrase: self._submit(cache, phrase, replace=rerender) for phrase in missing}
+            done, _ = concurrent.futures.wait(list(futures.values()), timeout=self.wait)
+            if len(done) < len(futures):
+                return None
+            for phrase, future in futures.items():
+                segments[phrase] = future.result()  # Raises if synthesis failed
+                if rerender or not cache.contains(phrase):
+                    cache.put(phrase, segments[phrase])
+        return segments
+
+    def _submit(self, cache, phrase, replace=False):
+        key = cache.key(phrase)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            if self._executor is None:
+                # Spawned processes, forking a threaded web worker is not safe
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+            try:
+                future = self._executor.submit(_synthesize, cache.cache_dir, cache.voice_id, cache.rate, phrase)
+            except BrokenProcessPool:
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+                future = self._executor.submit(_synthesize, cache.cache_dir, cache.voice_id, cache.rate, phrase)
+            self._inflight[key] = future
+
+        def _store(done_future):
+            with self._lock:
+                self._inflight.pop(key, None)
+            # Requests that gave up waiting still get the phrase cached for the retry
+            if done_future.exception() is None and (replace or not cache.contains(phrase)):
+                try:
+                    cache.put(phrase, done_future.result())
+                except OSError as e:
+                    print(f"Error writing TTS cache: {e}")
+
+        future.add_done_callback(_store)
+        return future
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_audio_service():
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = AudioService()
+        return _service
@@ -0,0 +1,349 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""On-disk cache of synthesized phrases.
+
+Every display word the recorder can produce is rendered once (at build time
+with ``python -m speech.phrase_cache`` or lazily the first time it is spoken)
+and stored as a small mono 16-bit WAV keyed by text, voice and rate. Sentences
+made only of cached phrases are stitched together from the stored segments
+instead of being synthesized again.
+"""
+import argparse
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import wave
+from collections import OrderedDict
+
+try:
+    import audioop
+except ImportError:  # Removed in Python 3.13, segments are then stored as rendered
+    audioop = None
+
+DEFAULT_CACHE_DIR = os.environ.get('SIGNOVA_TTS_CACHE_DIR', os.path.join('instance', 'tts_cache'))
+DEFAULT_MAX_BYTES = int(float(os.environ.get('SIGNOVA_TTS_CACHE_MB', '64')) * 1024 * 1024)
+SAMPLE_RATE = 16000
+WORD_GAP = 0.12  # Seconds of silence between assembled segments
+MAX_PHRASE_WORDS = 5  # Longest vocabulary phrase tried when assembling sentences
+
+
+def normalize_text(text):
+    return ' '.join(str(text).split())
+
+
+def play_wav(wav_bytes):
+    """Play WAV bytes on the local sound device, returns False if no backend could"""
+    try:
+        import numpy as np
+        import sounddevice as sd
+        with wave.open(io.BytesIO(wav_bytes), 'rb') as w:
+            frames = w.readframes(w.getnframes())
+            channels, rate = w.getnchannels(), w.getframerate()
+            sample_width = w.getsampwidth()
+        if sample_width != 2:
+            raise ValueError("Only 16-bit audio is supported")
+        data = np.frombuffer(frames, dtype=np.int16).reshape(-1, channels)
+        sd.play(data, rate)
+        sd.wait()
+        return True
+    except Exception:
+        pass
+    try:
+        import winsound
+        winsound.PlaySound(wav_bytes, winsound.SND_MEMORY)
+        return True
+    except Exception:
+        return False
+
+
+class PhraseCache(object):
+    def __init__(
+        self,
+        cache_dir=DEFAULT_CACHE_DIR,
+        voice_id=None,
+        rate=150,
+        max_bytes=DEFAULT_MAX_BYTES,
+        engine=None,
+    ):
+        self.cache_dir = cache_dir
+        self.voice_id = voice_id or ''
+        self.rate = rate
+        self.max_bytes = max_bytes
+        self.engine = engine
+        self._owns_engine = engine is None
+        self.vocabulary = set()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._index = OrderedDict()  # filename -> size, least recently used first
+        self._total_bytes = 0
+        self._scan()
+
+    def _scan(self):
+        """Rebuild the LRU index from the files already on disk"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.wav'):
+                    continue
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, name, stat.st_size))
+        except OSError as e:
+            print(f"Error scanning TTS cache: {e}")
+            return
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self._total_bytes += size
+
+    def key(self, text):
+        raw = f"{self.voice_id}\x1f{self.rate}\x1f{normalize_text(text)}".encode('utf-8')
+        return hashlib.sha1(raw).hexdigest()[:24]
+
+    def path(self, text):
+        return os.path.join(self.cache_dir, self.key(text) + '.wav')
+
+    def add_vocabulary(self, phrases):
+        self.vocabulary.update(normalize_text(p) for p in phrases if p)
+
+    def is_known(self, text):
+        return normalize_text(text) in self.vocabulary
+
+    def contains(self, text):
+        with self._lock:
+            return self.key(text) + '.wav' in self._index
+
+    def get(self, text):
+        """Return cached WAV bytes for text, or None"""
+        name = self.key(text) + '.wav'
+        with self._lock:
+            if name not in self._index:
+                self.misses += 1
+                return None
+            try:
+                with open(os.path.join(self.cache_dir, name), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                self._total_bytes -= self._index.pop(name)
+                self.misses += 1
+                return None
+            self._index.move_to_end(name)
+            self.hits += 1
+        try:
+            os.utime(os.path.join(self.cache_dir, name))  # Keeps LRU order across restarts
+        except OSError:
+            pass
+        return data
+
+    def put(self, text, wav_bytes):
+        name = self.key(text) + '.wav'
+        path = os.path.join(self.cache_dir, name)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(wav_bytes)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if name in self._index:
+                self._total_bytes -= self._index.pop(name)
+            self._index[name] = len(wav_bytes)
+            self._total_bytes += len(wav_bytes)
+            self._evict()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            name, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+
+    def _get_engine(self):
+        if self.engine is None:
+            import pyttsx3
+            self.engine = pyttsx3.init()
+        if self._owns_engine:
+            # Voice and rate may change between calls, a shared engine is configured by its owner
+            self.engine.setProperty('rate', self.rate)
+            if self.voice_id:
+                for voice in self.engine.getProperty('voices'):
+                    if self.voice_id in voice.id:
+                        self.engine.setProperty('voice', voice.id)
+                        break
+        return self.engine
+
+    def synthesize(self, text):
+        """Render text with the TTS engine and return compact WAV bytes"""
+        fd, tmp_path = tempfile.mkstemp(suffix='.wav', dir=self.cache_dir)
+        os.close(fd)
+        try:
+            engine = self._get_engine()
+            engine.save_to_file(normalize_text(text), tmp_path)
+            engine.runAndWait()
+            with open(tmp_path, 'rb') as f:
+                data = f.read()
+        finally:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return compact_wav(data)
+
+    def render(self, text):
+        """Return cached audio for text, synthesizing and storing it on a miss"""
+        data = self.get(text)
+        if data is None:
+            data = self.synthesize(text)
+            if data:
+                self.put(text, data)
+        return data
+
+    def prebuild(self, phrases=None):
+        """Render every phrase that is not cached yet, returns the number rendered"""
+        rendered = 0
+        for phrase in sorted(phrases if phrases is not None else self.vocabulary):
+            if not self.contains(phrase):
+                try:
+                    self.put(phrase, self.synthesize(phrase))
+                    rendered += 1
+                except Exception as e:
+                    print(f"Error rendering '{phrase}': {e}")
+        return rendered
+
+    def assemble(self, sentence):
+        """Build a sentence from cached segments without synthesis.
+
+        The sentence is split greedily into the longest cached phrases. Returns
+        None when any part is missing from the cache or the segment formats
+        differ.
+        """
+        phrases = split_phrases(sentence, self.contains)
+        if phrases is None:
+            return None
+        segments = []
+        for phrase in phrases:
+            data = self.get(phrase)
+            if data is None:
+                return None
+            segments.append(data)
+        return concat_wav(segments)
+
+    def lookup(self, text):
+        """Cached audio for a phrase or a sentence of cached phrases, never synthesizes"""
+        if not normalize_text(text):
+            return None
+        data = self.get(text)
+        if data is None:
+            data = self.assemble(text)
+        return data
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._index),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+def split_phrases(sentence, is_known, max_words=MAX_PHRASE_WORDS):
+    """Split a sentence greedily into the longest known phrases, None if a word is unknown"""
+    words = normalize_text(sentence).split(' ')
+    phrases = []
+    i = 0
+    while i < len(words):
+        for j in range(min(len(words), i + max_words), i, -1):
+            if is_known(' '.join(words[i:j])):
+                break
+        else:
+            return None
+        phrases.append(' '.join(words[i:j]))
+        i = j
+    return phrases
+
+
+def compact_wav(data):
+    """Downmix to mono 16-bit at SAMPLE_RATE so segments can be concatenated"""
+    if audioop is None:
+        return data
+    try:
+        with wave.open(io.BytesIO(data), 'rb') as w:
+            channels, width, rate = w.getnchannels(), w.getsampwidth(), w.getframerate()
+            frames = w.readframes(w.getnframes())
+    except (wave.Error, EOFError):
+        return data  # Not a RIFF file (e.g. AIFF from the macOS driver), keep as is
+    if width != 2:
+        frames = audioop.lin2lin(frames, width, 2)
+    if channels == 2:
+        frames = audioop.tomono(frames, 2, 0.5, 0.5)
+    elif channels != 1:
+        return data
+    if rate != SAMPLE_RATE:
+        frames, _ = audioop.ratecv(frames, 2, 1, rate, SAMPLE_RATE, None)
+    return _write_wav(frames, 1, 2, SAMPLE_RATE)
+
+
+def concat_wav(segments, gap=WORD_GAP):
+    if len(segments) == 1:
+        return segments[0]
+    params = None
+    chunks = []
+    try:
+        for data in segments:
+            with wave.open(io.BytesIO(data), 'rb') as w:
+                seg_params = (w.getnchannels(), w.getsampwidth(), w.getframerate())
+                if params is None:
+                    params = seg_params
+                elif seg_params != params:
+                    return None
+                chunks.append(w.readframes(w.getnframes()))
+    except (wave.Error, EOFError):
+        return None
+    channels, width, rate = params
+    silence = b'\x00' * (int(rate * gap) * channels * width)
+    return _write_wav(silence.join(chunks), channels, width, rate)
+
+
+def _write_wav(frames, channels, width, rate):
+    out = io.BytesIO()
+    with wave.open(out, 'wb') as w:
+        w.setnchannels(channels)
+        w.setsampwidth(width)
+        w.setframerate(rate)
+        w.writeframes(frames)
+    return out.getvalue()
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description="Pre-render the sign vocabulary into the TTS phrase cache")
+    parser.add_argument("--cache_dir", type=str, default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--speech_rate", type=int, default=150)
+    parser.add_argument("--voice", type=str, default=None)
+    parser.add_argument("--max_mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024))
+    return parser.parse_args()
+
+
+def main():
+    args = get_args()
+    from model.translations import get_translation_tables
+    cache = PhraseCache(
+        cache_dir=args.cache_dir,
+        voice_id=args.voice,
+        rate=args.speech_rate,
+        max_bytes=int(args.max_mb * 1024 * 1024),
+    )
+    cache.add_vocabulary(get_translation_tables().vocabulary())
+    rendered = cache.prebuild()
+    stats = cache.stats()
+    print(f"Rendered {rendered} phrases, cache holds {stats['entries']} entries "
+          f"({stats['bytes'] / 1024:.1f} KB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
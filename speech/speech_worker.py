@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Single long-lived text-to-speech thread per process.
+
+The worker owns the only pyttsx3 engine and pulls utterances from a bounded
+priority queue. Consecutive duplicates are coalesced, the cooldown between
+utterances is a timed wait on the queue condition, and queue depth plus speak
+latency (submission to start of audio) are kept as metrics.
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+from speech.phrase_cache import PhraseCache, play_wav
+
+PRIORITY_SENTENCE = 0  # Explicit "speak sentence" requests go first
+PRIORITY_WORD = 1
+
+DEFAULT_COOLDOWN = 1.2
+DEFAULT_MAX_QUEUE = 8
+LATENCY_SAMPLES = 200
+
+
+class SpeechWorker(object):
+    def __init__(
+        self,
+        rate=150,
+        voice_id=None,
+        cooldown=DEFAULT_COOLDOWN,
+        max_queue=DEFAULT_MAX_QUEUE,
+        use_phrase_cache=True,
+        engine_factory=None,
+    ):
+        self.rate = rate
+        self.voice_id = voice_id
+        self.cooldown = cooldown
+        self.max_queue = max_queue
+        self.use_phrase_cache = use_phrase_cache
+        self.engine = None
+        self.phrase_cache = None
+        self._engine_factory = engine_factory
+        self._applied = (None, None)
+        self._has_start_callback = False
+        self._vocabulary = set()
+        self._queue = []  # (priority, seq, text, submitted_at, owner)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._ready = threading.Event()
+        self._speaking = threading.Event()
+        self._stopped = False
+        self._current = None  # (text, submitted_at) of the utterance being spoken
+        self._last_submitted = None  # seq of the newest queued item
+        self.last_spoken_time = 0.0
+        self.spoken = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.errors = 0
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._thread = threading.Thread(target=self._run, name='speech-worker')
+        self._thread.daemon = True  # Exits with the main program
+        self._thread.start()
+
+    @property
+    def is_speaking(self):
+        return self._speaking.is_set()
+
+    def submit(self, text, priority=PRIORITY_WORD, owner=None):
+        """Queue text for speaking, returns False if it was coalesced or dropped.
+
+        owner tags the item so ``clear(owner)`` can drop one session's speech.
+        """
+        text = ' '.join(str(text).split())
+        if not text:
+            return False
+        with self._cond:
+            if self._stopped:
+                return False
+            newest = self._newest()
+            if (newest is not None and newest[2] == text) or \
+                    (newest is None and self._current is not None and self._current[0] == text):
+                self.coalesced += 1
+                return False
+            item = (priority, next(self._seq), text, time.monotonic(), owner)
+            if len(self._queue) >= self.max_queue:
+                # Drop the oldest entry of the least urgent priority, possibly the new one
+                worst = max(self._queue + [item], key=lambda entry: (entry[0], -entry[1]))
+                self.dropped += 1
+                if worst is item:
+                    return False
+                self._queue.remove(worst)
+                heapq.heapify(self._queue)
+            heapq.heappush(self._queue, item)
+            self._last_submitted = item[1]
+            self._cond.notify()
+        return True
+
+    def _newest(self):
+        for entry in self._queue:
+            if entry[1] == self._last_submitted:
+                return entry
+        return None
+
+    def clear(self, owner=None):
+        """Drop queued speech, only the items submitted by owner when it is given"""
+        with self._cond:
+            if owner is None:
+                kept = []
+            else:
+                kept = [entry for entry in self._queue if entry[4] != owner]
+            self.dropped += len(self._queue) - len(kept)
+            heapq.heapify(kept)
+            self._queue = kept
+
+    def configure(self, rate=None, voice_id=None):
+        """Change voice settings, applied before the next utterance"""
+        with self._cond:
+            if rate is not None:
+                self.rate = rate
+            if voice_id is not None:
+                self.voice_id = voice_id
+            self._cond.notify()
+
+    def register_vocabulary(self, phrases):
+        with self._cond:
+            self._vocabulary.update(phrases)
+            if self.phrase_cache is not None:
+                self.phrase_cache.add_vocabulary(phrases)
+
+    def list_voices(self, timeout=5.0):
+        if not self._ready.wait(timeout) or self.engine is None:
+            return []
+        return self.engine.getProperty('voices')
+
+    def stop(self, timeout=2.0):
+        with self._cond:
+            self._stopped = True
+            self._queue = []
+            self._cond.notify()
+        if self.engine is not None:
+            try:
+                self.engine.stop()
+            except RuntimeError:
+                pass
+        self._thread.join(timeout=timeout)
+
+    def metrics(self):
+        with self._cond:
+            latencies = sorted(self._latencies)
+            queue_depth = len(self._queue)
+        metrics = {
+            'queue_depth': queue_depth,
+            'is_speaking': self.is_speaking,
+            'spoken': self.spoken,
+            'coalesced': self.coalesced,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'latency_ms_last': None,
+            'latency_ms_mean': None,
+            'latency_ms_p95': None,
+        }
+        if latencies:
+            metrics['latency_ms_last'] = round(self._latencies[-1] * 1000, 1)
+            metrics['latency_ms_mean'] = round(sum(latencies) / len(latencies) * 1000, 1)
+            metrics['latency_ms_p95'] = round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 1)
+        if self.phrase_cache is not None:
+            metrics['phrase_cache'] = self.phrase_cache.stats()
+        return metrics
+
+    def _init_engine(self):
+        if self._engine_factory is not None:
+            self.engine = self._engine_factory()
+        else:
+            import pyttsx3
+            self.engine = pyttsx3.init()
+        self._apply_settings()
+        try:
+            self.engine.connect('started-utterance', self._on_audio_start)
+            self._has_start_callback = True
+        except Exception:
+            pass  # Engines without callbacks are timed when runAndWait starts
+        if self.use_phrase_cache:
+            try:
+                self.phrase_cache = PhraseCache(voice_id=self.voice_id, rate=self.rate, engine=self.engine)
+                self.phrase_cache.add_vocabulary(self._vocabulary)
+            except Exception as e:
+                print(f"TTS phrase cache disabled: {e}")
+
+    def _apply_settings(self):
+        if self._applied == (self.rate, self.voice_id):
+            return
+        self.engine.setProperty('rate', self.rate)
+        if self.voice_id:
+            for voice in self.engine.getProperty('voices'):
+                if self.voice_id in voice.id:
+                    self.engine.setProperty('voice', voice.id)
+                    break
+        if self.phrase_cache is not None:
+            self.phrase_cache.rate = self.rate
+            self.phrase_cache.voice_id = self.voice_id or ''
+        self._applied = (self.rate, self.voice_id)
+
+    def _on_audio_start(self, name=None):
+        current = self._current
+        if current is not None and current[1] is not None:
+            self._latencies.append(time.monotonic() - current[1])
+            self._current = (current[0], None)  # Count each utterance once
+
+    def _run(self):
+        try:
+            self._init_engine()
+        except Exception as e:
+            print(f"Error initializing speech engine: {e}")
+            with self._cond:
+                self._stopped = True
+            return
+        finally:
+            self._ready.set()
+
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    if self._queue:
+                        # Cooldown is a timed wait, new submissions can still reorder the queue
+                        remaining = self.last_spoken_time + self.cooldown - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+                _, _, text, submitted_at, _ = heapq.heappop(self._queue)
+                self._current = (text, submitted_at)
+                self._apply_settings()
+            self._speaking.set()
+            try:
+                self._speak(text)
+                self.spoken += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"Error speaking '{text}': {e}")
+            finally:
+                self._speaking.clear()
+                with self._cond:
+                    self._current = None
+                    self.last_spoken_time = time.monotonic()
+
+    def _speak(self, text):
+        audio = self.phrase_cache.lookup(text) if self.phrase_cache is not None else None
+        if audio is not None:
+            self._on_audio_start()
+            if play_wav(audio):
+                return
+        self.engine.say(text)
+        if not self._has_start_callback:
+            self._on_audio_start()
+        self.engine.runAndWait()
+        # Render known phrases on first use so the next utterance comes from the cache
+        if self.phrase_cache is not None and self.phrase_cache.is_known(text):
+            try:
+                self.phrase_cache.render(text)
+            except OSError as e:
+                print(f"Error writing TTS cache: {e}")
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_speech_worker(rate=150, voice_id=None, use_phrase_cache=True):
+    """Return the process-wide speech worker, creating it on first use"""
+    global _worker
+    with _worker_lock:
+        if _worker is None or _worker._stopped:
+            _worker = SpeechWorker(rate=rate, voice_id=voice_id, use_phrase_cache=use_phrase_cache)
+        else:
+            _worker.configure(rate=rate, voice_id=voice_id)
+        return _worker
@@ -0,0 +1,112 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pipeline.admission import (
+    AdmissionController, FrameMeter, REASON_ADMITTED, REASON_SESSIONS, REASON_CPU, REASON_LAG,
+)
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class AdmissionControllerTest(unittest.TestCase):
+    """Test cases for admitting camera sessions under load"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.controller = AdmissionController(max_sessions=3, max_cpu=1.0, max_lag_ms=100, target_fps=30,
+                                              window=5.0, clock=self.clock)
+
+    def run_frames(self, session_id, seconds, cpu_per_frame, frame_seconds=0.02, fps=30):
+        for _ in range(int(seconds * fps)):
+            self.clock.now += 1.0 / fps
+            self.controller.record_frame(session_id, cpu_per_frame, frame_seconds)
+
+    def test_session_limit(self):
+        """Test that sessions beyond the limit get a 503-style decision with Retry-After"""
+        for i in range(3):
+            self.assertTrue(self.controller.admit(f's{i}', wait=0)['admitted'])
+        decision = self.controller.admit('s3', wait=0)
+        self.assertFalse(decision['admitted'])
+        self.assertEqual(decision['reason'], REASON_SESSIONS)
+        self.assertEqual(decision['retry_after'], 5)
+        self.assertEqual(decision['load']['sessions'], 3)
+        self.controller.release('s0')
+        self.assertTrue(self.controller.admit('s3', wait=0)['admitted'])
+
+    def test_cpu_projection_rejects_a_session_that_would_saturate(self):
+        """Test that a new session is rejected when an average session's CPU would exceed the budget"""
+        self.controller.admit('s0', wait=0)
+        self.run_frames('s0', 5.0, cpu_per_frame=0.02)  # 0.6 CPU s/s
+        decision = self.controller.admit('s1', wait=0)
+        self.assertEqual(decision['reason'], REASON_CPU)
+        self.assertAlmostEqual(decision['load']['cpu_per_second'], 0.6, places=1)
+        self.assertEqual(self.controller.stats()['rejected'][REASON_CPU], 1)
+
+    def test_light_sessions_are_admitted(self):
+        """Test that sessions are admitted while CPU and lag are within their limits"""
+        self.controller.admit('s0', wait=0)
+        self.run_frames('s0', 5.0, cpu_per_frame=0.005)
+        decision = self.controller.admit('s1', wait=0)
+        self.assertTrue(decision['admitted'])
+        self.assertEqual(decision['reason'], REASON_ADMITTED)
+        self.assertIsNone(decision['retry_after'])
+
+    def test_lagging_session_blocks_admission(self):
+        """Test that a session falling behind its frame budget blocks new sessions"""
+        self.controller.admit('s0', wait=0)
+        self.run_frames('s0', 1.0, cpu_per_frame=0.001, frame_seconds=0.2, fps=5)
+        decision = self.controller.admit('s1', wait=0)
+        self.assertEqual(decision['reason'], REASON_LAG)
+        self.assertGreater(decision['load']['lag_ms'], 100)
+
+    def test_cpu_window_expires(self):
+        """Test that CPU from frames older than the window no longer counts"""
+        self.controller.admit('s0', wait=0)
+        self.run_frames('s0', 5.0, cpu_per_frame=0.02)
+        self.controller.release('s0')
+        self.clock.now += 6.0
+        self.assertEqual(self.controller.load()['cpu_per_second'], 0.0)
+
+    def test_running_session_is_readmitted(self):
+        """Test that admitting a session already running does not count it twice"""
+        self.controller.admit('s0', wait=0)
+        decision = self.controller.admit('s0', wait=0)
+        self.assertTrue(decision['admitted'])
+        self.assertEqual(decision['load']['sessions'], 1)
+
+    def test_waiting_request_is_admitted_on_release(self):
+        """Test that a queued request is admitted when a session stops within the wait"""
+        controller = AdmissionController(max_sessions=1, max_cpu=1.0)
+        controller.admit('s0', wait=0)
+        threading.Timer(0.1, controller.release, args=('s0',)).start()
+        start = time.monotonic()
+        decision = controller.admit('s1', wait=5.0)
+        self.assertTrue(decision['admitted'])
+        self.assertLess(time.monotonic() - start, 2.0)
+
+    def test_frame_meter_reports_frames(self):
+        """Test that FrameMeter records a frame's wall time for its session"""
+        controller = AdmissionController(max_sessions=2, max_cpu=1.0, target_fps=1000)
+        controller.admit('s0', wait=0)
+        meter = FrameMeter(controller, 's0')
+        meter.start()
+        time.sleep(0.02)
+        meter.stop()
+        meter.stop()  # Without a start it records nothing
+        self.assertGreater(controller.load()['lag_ms'], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import contextlib
+import csv
+import io
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.buffered_csv_writer import BufferedCsvWriter, close_csv_writers, get_csv_writer
+
+
+def read_rows(path):
+    with open(path, newline='') as f:
+        return list(csv.reader(f))
+
+
+class BufferedCsvWriterTest(unittest.TestCase):
+    """Test cases for the background data-collection writer"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'logs', 'keypoint.csv')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rows_are_durable_on_close(self):
+        """Test that every buffered row is on disk after close, in order"""
+        writer = BufferedCsvWriter(self.path, flush_rows=1000, flush_interval=60)
+        for i in range(50):
+            self.assertTrue(writer.write([i % 10, 0.5, -0.25]))
+        writer.close()
+        rows = read_rows(self.path)
+        self.assertEqual(len(rows), 50)
+        self.assertEqual(rows[3], ['3', '0.5', '-0.25'])
+        self.assertEqual(writer.stats()['pending'], 0)
+
+    def test_flush_by_size(self):
+        """Test that reaching flush_rows writes without waiting for the interval"""
+        writer = BufferedCsvWriter(self.path, flush_rows=5, flush_interval=60)
+        flushed = threading.Event()
+        original = writer._append
+        writer._append = lambda rows, sync=False: (original(rows, sync), flushed.set())
+        for i in range(5):
+            writer.write([i])
+        self.assertTrue(flushed.wait(5))
+        self.assertEqual(len(read_rows(self.path)), 5)
+        writer.close()
+
+    def test_overflow_is_counted(self):
+        """Test that a full buffer drops rows instead of blocking"""
+        writer = BufferedCsvWriter(self.path, max_rows=3, flush_rows=100, flush_interval=60)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            results = [writer.write([i]) for i in range(5)]
+        self.assertEqual(results, [True, True, True, False, False])
+        self.assertEqual(writer.stats()['dropped'], 2)
+        self.assertEqual(output.getvalue().count('dropping rows'), 1)  # Rate-limited
+        writer.close()
+        self.assertEqual(len(read_rows(self.path)), 3)
+
+    def test_shutdown_reports_lost_rows(self):
+        """Test that closing the writers prints the stats of a writer that dropped rows"""
+        writer = get_csv_writer(self.path, max_rows=1, flush_rows=100, flush_interval=60)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            writer.write([1])
+            writer.write([2])
+            close_csv_writers()
+        self.assertIn("'dropped': 1", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.columnar_store import ColumnarDataset, ColumnarWriter, convert_csv, read_csv_dataset
+
+
+class ColumnarStoreTest(unittest.TestCase):
+    """Test cases for the columnar training data store"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, 'point_history.csv')
+        with open(self.csv_path, 'w') as f:
+            f.write("0, 0, 0.1, -0.25.1\n")  # pandas-mangled header row
+            f.write("3, 0.5        , -0.25, 1\n")
+            f.write("1, 0           , 0.125, -1.5\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_padded_csv_with_header(self):
+        """Test that padded fields parse and the header row is skipped"""
+        labels, features, skipped = read_csv_dataset(self.csv_path)
+        self.assertEqual(skipped, 1)
+        self.assertEqual(labels.dtype, np.int16)
+        self.assertEqual(features.dtype, np.float32)
+        self.assertEqual(labels.tolist(), [3, 1])
+        np.testing.assert_array_equal(features[1], [0, 0.125, -1.5])
+
+    def test_convert_round_trip(self):
+        store_path, rows, _ = convert_csv(self.csv_path)
+        self.assertEqual(rows, 2)
+        labels, features = ColumnarDataset(store_path).load()
+        reference_labels, reference_features, _ = read_csv_dataset(self.csv_path)
+        np.testing.assert_array_equal(labels, reference_labels)
+        np.testing.assert_array_equal(features, reference_features)
+
+    def test_append_in_chunks(self):
+        """Test that appended rows become memory-mapped chunks once flushed"""
+        store_path = os.path.join(self.tmp.name, 'keypoint.columnar')
+        writer = ColumnarWriter(store_path, num_features=4, chunk_rows=3)
+        for i in range(7):
+            writer.append(i % 2, np.full(4, i, dtype=np.float32))
+        dataset = ColumnarDataset(store_path)
+        self.assertEqual(len(dataset), 6)  # The seventh row is still buffered
+        self.assertIsInstance(dataset.chunks()[0][1], np.memmap)
+        writer.close()
+
+        reopened = ColumnarWriter(store_path)
+        reopened.extend([1, 0], np.ones((2, 4)))
+        reopened.close()
+        labels, features = ColumnarDataset(store_path).load()
+        self.assertEqual(len(labels), 9)
+        self.assertEqual(features[6, 0], 6)
+        self.assertEqual(labels.tolist()[-2:], [1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
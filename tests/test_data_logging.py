@@ -0,0 +1,30 @@
+import os
+import sys
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.data_logging import MODE_KEYPOINT, MODE_NORMAL, MODE_POINT_HISTORY, select_mode
+
+
+class SelectModeTest(unittest.TestCase):
+    """Test cases for the desktop app's data logging keys"""
+
+    def test_translation_shortcuts_do_not_start_logging(self):
+        """Test that m/t and the gesture keys pick a label without turning logging on"""
+        for key, number in ((ord('m'), 8), (ord('t'), 9), (ord('o'), 0), (ord('g'), 7)):
+            self.assertEqual(select_mode(key, MODE_NORMAL, False), (number, MODE_NORMAL, False))
+
+    def test_k_and_h_start_logging_and_n_stops(self):
+        """Test that logging is turned on only with k/h and off with n"""
+        number, mode, recording = select_mode(ord('k'), MODE_NORMAL, False)
+        self.assertEqual((mode, recording), (MODE_KEYPOINT, True))
+        number, mode, recording = select_mode(ord('m'), mode, recording)
+        self.assertEqual((number, mode, recording), (8, MODE_KEYPOINT, True))
+        self.assertEqual(select_mode(ord('h'), mode, recording)[1:], (MODE_POINT_HISTORY, True))
+        self.assertEqual(select_mode(ord('n'), mode, recording)[1:], (MODE_NORMAL, False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import unittest
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pipeline.frame_ring import FrameRing, FramePipeline, _identity_processor
+
+
+class FrameRingTest(unittest.TestCase):
+    """Test cases for the shared-memory frame ring"""
+
+    def setUp(self):
+        self.ring = FrameRing((4, 6, 3), slots=3)
+        self.reader = FrameRing.attach(self.ring.spec)
+
+    def tearDown(self):
+        self.reader.close()
+        self.ring.close()
+
+    def test_reader_sees_frames_written_in_place(self):
+        """Test that a published slot is visible through the attached view"""
+        slot, seq, view = self.ring.begin_write()
+        view[:] = 7
+        self.ring.publish(slot, seq)
+        frame = self.reader.read(slot, seq)
+        self.assertTrue((frame == 7).all())
+        self.assertTrue(self.reader.release(slot, seq))
+
+    def test_unpublished_and_reused_slots_are_rejected(self):
+        """Test that the sequence words expose frames in progress and overwritten frames"""
+        slot, seq, view = self.ring.begin_write()
+        self.assertIsNone(self.reader.read(slot, seq))  # Still being written
+        self.ring.publish(slot, seq)
+        for _ in range(3):
+            self.ring.write(np.ones((4, 6, 3), dtype=np.uint8))
+        self.assertIsNone(self.reader.read(slot, seq))  # Lapped
+
+    def test_overwrite_during_read_is_detected(self):
+        """Test that a frame replaced while the reader holds it fails release"""
+        slot, seq = self.ring.write(np.zeros((4, 6, 3), dtype=np.uint8))
+        self.assertIsNotNone(self.reader.read(slot, seq))
+        self.ring._sequences[slot] = 2 * (seq + 3) + 1  # The writer claimed the slot anyway
+        self.assertFalse(self.reader.release(slot, seq))
+
+    def test_writer_skips_the_slot_being_read(self):
+        """Test that a slow reader keeps its frame while the writer moves on"""
+        slot, seq = self.ring.write(np.full((4, 6, 3), 1, dtype=np.uint8))
+        frame = self.reader.read(slot, seq)
+        for value in range(2, 8):
+            self.ring.write(np.full((4, 6, 3), value, dtype=np.uint8))
+        self.assertTrue((frame == 1).all())
+        self.assertTrue(self.reader.release(slot, seq))
+
+
+class FramePipelineTest(unittest.TestCase):
+    """Test cases for the capture-side handle on the inference process"""
+
+    def test_results_come_back_from_the_child(self):
+        """Test that frames written in place are processed by the other process"""
+        pipeline = FramePipeline((8, 8, 3), _identity_processor, slots=4)
+        try:
+            for value in range(1, 6):
+                slot, seq, view = pipeline.begin_write()
+                view[:] = value
+                pipeline.submit(slot, seq)
+            deadline = time.monotonic() + 30
+            while (pipeline.latest is None or pipeline.latest[0] < 4) and time.monotonic() < deadline:
+                pipeline.poll()
+                time.sleep(0.01)
+            self.assertEqual(pipeline.latest, (4, 5))
+        finally:
+            pipeline.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
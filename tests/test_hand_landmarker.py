@@ -0,0 +1,112 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pipeline.hand_landmarker import LiveStreamHands, tasks_detections
+
+
+class DeferredLandmarker(object):
+    """Records detect_async calls, the test delivers results when it chooses"""
+
+    def __init__(self, on_result):
+        self.on_result = on_result
+        self.timestamps = []
+        self.closed = False
+
+    def detect_async(self, rgb_frame, timestamp_ms):
+        self.timestamps.append(timestamp_ms)
+
+    def deliver(self, timestamp_ms, value=0.5):
+        self.on_result([('Right', 0.9, np.full((21, 3), value, dtype=np.float32))], timestamp_ms)
+
+    def close(self):
+        self.closed = True
+
+
+class LiveStreamHandsTest(unittest.TestCase):
+    """Test cases for the non-blocking HandLandmarker wrapper"""
+
+    def setUp(self):
+        self.landmarkers = []
+
+        def factory(on_result):
+            self.landmarkers.append(DeferredLandmarker(on_result))
+            return self.landmarkers[-1]
+
+        self.hands = LiveStreamHands(landmarker_factory=factory, history=4)
+        self.landmarker = self.landmarkers[0]
+        self.frame = np.zeros((8, 8, 3), dtype=np.uint8)
+
+    def test_process_returns_before_any_result(self):
+        """Test that process returns an empty result while the graph has delivered nothing"""
+        results = self.hands.process(self.frame)
+        self.assertIsNone(results.multi_hand_landmarks)
+        self.assertIsNone(results.frame_id)
+        self.assertEqual(len(self.landmarker.timestamps), 1)
+
+    def test_results_are_matched_to_frames_by_timestamp(self):
+        """Test that a delivered result carries the id of the frame it was computed on"""
+        self.hands.process(self.frame, timestamp_ms=100)
+        self.hands.process(self.frame, timestamp_ms=133)
+        self.landmarker.deliver(100, value=0.25)
+        results = self.hands.latest()
+        self.assertEqual(results.frame_id, 1)
+        self.assertEqual(results.timestamp_ms, 100)
+        self.assertAlmostEqual(results.multi_hand_landmarks[0].landmark[0].x, 0.25)
+        self.assertEqual(results.multi_handedness[0].classification[0].label, 'Right')
+        self.assertGreaterEqual(results.latency_ms, 0.0)
+
+    def test_timestamps_strictly_increase(self):
+        """Test that repeated or decreasing timestamps are bumped as LIVE_STREAM requires"""
+        for timestamp in (50, 50, 40):
+            self.hands.process(self.frame, timestamp_ms=timestamp)
+        self.assertEqual(self.landmarker.timestamps, [50, 51, 52])
+
+    def test_skipped_frames_are_counted_as_dropped(self):
+        """Test that frames older than a delivered result never get one and count as dropped"""
+        for timestamp in (10, 20, 30):
+            self.hands.process(self.frame, timestamp_ms=timestamp)
+        self.landmarker.deliver(30)
+        self.landmarker.deliver(10)  # Late, already superseded
+        stats = self.hands.stats()
+        self.assertEqual(stats['completed'], 1)
+        self.assertEqual(stats['dropped'], 2)
+        self.assertEqual(self.hands.latest().timestamp_ms, 30)
+
+    def test_history_bounds_unanswered_frames(self):
+        """Test that frames beyond the history are forgotten and counted as dropped"""
+        for timestamp in range(6):
+            self.hands.process(self.frame, timestamp_ms=timestamp)
+        self.assertEqual(self.hands.stats()['dropped'], 2)
+        self.hands.close()
+        self.assertTrue(self.landmarker.closed)
+
+    def test_reconfigure_rebuilds_only_for_the_hand_count(self):
+        """Test that model complexity changes are ignored and a new hand count rebuilds the landmarker"""
+        self.assertTrue(self.hands.reconfigure(max_num_hands=2, model_complexity=0))
+        self.assertEqual(len(self.landmarkers), 1)
+        self.assertTrue(self.hands.reconfigure(max_num_hands=1, model_complexity=0))
+        self.assertEqual(len(self.landmarkers), 2)
+        self.assertTrue(self.landmarker.closed)
+        self.assertEqual(self.hands.max_num_hands, 1)
+
+    def test_tasks_result_conversion(self):
+        """Test that a HandLandmarkerResult becomes (handedness, score, landmarks) tuples"""
+        point = SimpleNamespace(x=0.1, y=0.2, z=0.3)
+        result = SimpleNamespace(hand_landmarks=[[point] * 21],
+                                 handedness=[[SimpleNamespace(category_name='Left', score=0.8)]])
+        (label, score, points), = tasks_detections(result)
+        self.assertEqual(label, 'Left')
+        self.assertAlmostEqual(score, 0.8)
+        self.assertEqual(points.shape, (21, 3))
+        self.assertEqual(tasks_detections(SimpleNamespace(hand_landmarks=[], handedness=[])), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
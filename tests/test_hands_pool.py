@@ -0,0 +1,166 @@
+import itertools
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pipeline import hands_pool
+from pipeline.hands_pool import HandsPool, PooledHands, get_hands_pool, synthetic_detector
+
+
+def pid_detector(crash_value=255):
+    """One hand whose score is the worker's pid, exits the worker on a frame filled with crash_value"""
+    def new_session():
+        def detect(rgb_frame):
+            if rgb_frame[0, 0, 0] == crash_value:
+                os._exit(3)
+            return [('Left', float(os.getpid()), np.zeros((21, 3), dtype=np.float32))]
+        return detect
+    return new_session
+
+
+def options_detector(max_num_hands=2):
+    """One hand scored with the session's max_num_hands, its x the serial number of the session's graph"""
+    graphs = itertools.count(1)
+
+    def new_session(max_num_hands=max_num_hands, **options):
+        graph = next(graphs)
+
+        def detect(rgb_frame):
+            return [('Left', float(max_num_hands), np.full((21, 3), graph, dtype=np.float32))]
+        return detect
+    return new_session
+
+
+class HandsPoolTest(unittest.TestCase):
+    """Test cases for the pool of hands detector processes"""
+
+    def setUp(self):
+        self.pool = None
+
+    def tearDown(self):
+        if self.pool is not None:
+            self.pool.close()
+
+    def start_pool(self, **options):
+        options.setdefault('frame_shape', (48, 64, 3))
+        options.setdefault('monitor_interval', 0.1)
+        self.pool = HandsPool(**options)
+        return self.pool
+
+    def test_sessions_stick_to_one_worker(self):
+        """Test that every frame of a session is detected by the same worker"""
+        pool = self.start_pool(workers=2, detector_factory=pid_detector)
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        pids = {session: {pool.process(session, frame, timeout=30.0)[0][1] for _ in range(5)}
+                for session in ('alice', 'bob')}
+        self.assertEqual(len(pids['alice']), 1)
+        self.assertEqual(len(pids['bob']), 1)
+        self.assertNotEqual(pids['alice'], pids['bob'])
+
+    def test_frames_smaller_than_the_ring_are_detected(self):
+        """Test that a frame reaches the detector intact through the worker's ring"""
+        pool = self.start_pool(workers=1, detector_factory=synthetic_detector,
+                               detector_options={'work_seconds': 0.0})
+        frame = np.full((24, 32, 3), 102, dtype=np.uint8)
+        label, score, points = pool.process('alice', frame, timeout=30.0)[0]
+        self.assertEqual(points.shape, (21, 3))
+        self.assertAlmostEqual(float(points[0, 0]), 102 / 255.0, places=5)
+        with self.assertRaises(ValueError):
+            pool.submit('alice', np.zeros((96, 64, 3), dtype=np.uint8))
+
+    def test_full_worker_queue_drops_frames(self):
+        """Test that a worker with queue_size frames in flight rejects further frames"""
+        pool = self.start_pool(workers=1, queue_size=1, detector_factory=synthetic_detector,
+                               detector_options={'work_seconds': 0.5})
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        first = pool.submit('alice', frame)
+        self.assertIsNotNone(first)
+        self.assertIsNone(pool.submit('alice', frame))
+        first.result(30.0)
+        self.assertIsNotNone(pool.process('alice', frame, timeout=30.0))
+        stats = pool.stats()[0]
+        self.assertEqual(stats['dropped'], 1)
+        self.assertEqual(stats['processed'], 2)
+
+    def test_crashed_worker_is_restarted(self):
+        """Test that a worker that dies fails its request and is replaced"""
+        pool = self.start_pool(workers=1, detector_factory=pid_detector)
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        first_pid = pool.process('alice', frame, timeout=30.0)[0][1]
+        future = pool.submit('alice', np.full((48, 64, 3), 255, dtype=np.uint8))
+        with self.assertRaises(RuntimeError):
+            future.result(30.0)
+        deadline = time.monotonic() + 30.0
+        result = None
+        while result is None and time.monotonic() < deadline:
+            result = pool.process('alice', frame, timeout=30.0)
+        self.assertIsNotNone(result)
+        self.assertNotEqual(result[0][1], first_pid)
+        self.assertEqual(pool.stats()[0]['restarts'], 1)
+
+    def test_utilization_reflects_busy_time(self):
+        """Test that a worker kept busy reports a high utilization"""
+        pool = self.start_pool(workers=1, detector_factory=synthetic_detector,
+                               detector_options={'work_seconds': 0.02}, monitor_interval=0.5)
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        pool.process('alice', frame, timeout=30.0)
+        time.sleep(0.6)  # Let the monitor take a sample before the busy period
+        stop = time.monotonic() + 1.2
+        while time.monotonic() < stop:
+            pool.process('alice', frame, timeout=30.0)
+        self.assertGreater(pool.stats()[0]['utilization'], 0.3)
+
+    def test_pooled_hands_mimics_mediapipe_results(self):
+        """Test that PooledHands returns landmarks and handedness shaped like MediaPipe's"""
+        pool = self.start_pool(workers=1, detector_factory=synthetic_detector,
+                               detector_options={'work_seconds': 0.0})
+        hands = PooledHands(pool, 'alice', timeout=30.0)
+        results = hands.process(np.zeros((48, 64, 3), dtype=np.uint8))
+        self.assertEqual(len(results.multi_hand_landmarks[0].landmark), 21)
+        self.assertEqual(results.multi_handedness[0].classification[0].label, 'Right')
+        hands.close()
+        self.assertEqual(pool.stats()[0]['sessions'], 0)
+
+
+    def test_session_options_rebuild_only_that_sessions_graph(self):
+        """Test that reconfiguring a session changes its own graph and keeps the other sessions' graphs"""
+        pool = self.start_pool(workers=1, detector_factory=options_detector)
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        alice = PooledHands(pool, 'alice', timeout=30.0, options={'max_num_hands': 2})
+        bob = PooledHands(pool, 'bob', timeout=30.0)
+
+        def detect(hands):
+            results = hands.process(frame)
+            return results.multi_handedness[0].classification[0].score, results.multi_hand_landmarks[0].landmark[0].x
+
+        self.assertEqual(detect(alice), (2.0, 1.0))
+        self.assertEqual(detect(bob), (2.0, 2.0))
+        self.assertEqual(detect(alice), (2.0, 1.0))  # Same options, same graph
+        self.assertTrue(alice.reconfigure(max_num_hands=1))
+        self.assertEqual(detect(alice), (1.0, 3.0))
+        self.assertEqual(detect(bob), (2.0, 2.0))
+        self.assertEqual(pool.stats()[0]['sessions'], 2)  # Reconfiguring does not end the session
+
+class GetHandsPoolTest(unittest.TestCase):
+    """Test cases for the process-wide pool"""
+
+    def test_first_callers_options_configure_the_workers(self):
+        """Test that the profile's detector options reach the pool instead of the defaults"""
+        options = {'max_num_hands': 1, 'model_complexity': 0}
+        with mock.patch.object(hands_pool, 'HANDS_WORKERS', 2), mock.patch.object(hands_pool, '_pool', None), \
+                mock.patch.object(hands_pool, 'HandsPool') as pool_class:
+            pool_class.return_value.detector_options = options
+            pool = get_hands_pool(options)
+            self.assertIs(get_hands_pool(dict(options, max_num_hands=2)), pool)
+        pool_class.assert_called_once_with(2, detector_options=options)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.holistic_features import HolisticFeatureExtractor
+from model.sign_dataset import FEATURE_SIZE, POSE_SIZE, HAND_SIZE
+from model.sign_sequence_classifier.sign_sequence_classifier import HAND_FEATURES
+
+
+def landmarks(count, value):
+    return SimpleNamespace(landmark=[SimpleNamespace(x=value, y=value, z=value, visibility=1.0)
+                                     for _ in range(count)])
+
+
+class FakeSolution(object):
+    """Returns fixed results in the shape of a MediaPipe solution"""
+
+    def __init__(self, **results):
+        self.results = SimpleNamespace(**results)
+        self.calls = 0
+
+    def process(self, image):
+        self.calls += 1
+        return self.results
+
+    def close(self):
+        pass
+
+
+def split_graphs():
+    right = SimpleNamespace(classification=[SimpleNamespace(label='Right')])
+    return {
+        'pose': FakeSolution(pose_landmarks=landmarks(33, 0.5)),
+        'hands': FakeSolution(multi_hand_landmarks=[landmarks(21, 0.25)], multi_handedness=[right]),
+    }
+
+
+class HolisticFeatureExtractorTest(unittest.TestCase):
+    """Test cases for the 1518-d live feature layout"""
+
+    def test_full_layout(self):
+        """Test that pose and the repeated hand blocks land where the dataset has them"""
+        extractor = HolisticFeatureExtractor(graphs=split_graphs())
+        frame = extractor.extract(None)
+        self.assertEqual(frame.shape, (FEATURE_SIZE,))
+        self.assertEqual(frame.dtype, np.float32)
+        np.testing.assert_array_equal(frame[:POSE_SIZE].reshape(33, 4)[:, 3], 1.0)
+        hands = frame[POSE_SIZE:].reshape(11, 2, HAND_SIZE)
+        self.assertTrue(np.all(hands[:, 0] == 0))  # No left hand
+        self.assertTrue(np.all(hands[:, 1] == 0.25))
+        self.assertIn('pack', extractor.timings())
+
+    def test_zero_and_skip(self):
+        """Test that zero-filled parts keep the layout and skipped parts are left out"""
+        graphs = split_graphs()
+        zeroed = HolisticFeatureExtractor(pose='zero', graphs={'hands': graphs['hands']})
+        frame = zeroed.extract(None)
+        self.assertEqual(frame.shape, (FEATURE_SIZE,))
+        self.assertTrue(np.all(frame[:POSE_SIZE] == 0))
+
+        compact = HolisticFeatureExtractor(pose='skip', graphs={'hands': graphs['hands']})
+        features = compact.extract(None)
+        self.assertEqual(features.shape, HAND_FEATURES.shape)
+        np.testing.assert_array_equal(features, frame[HAND_FEATURES])
+
+    def test_buffer_is_reused(self):
+        extractor = HolisticFeatureExtractor(graphs=split_graphs())
+        self.assertIs(extractor.extract(None), extractor.extract(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
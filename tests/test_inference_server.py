@@ -0,0 +1,83 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pipeline.inference_protocol import OP_KEYPOINT, OP_SEQUENCE
+from pipeline.inference_server import InferenceServer
+from pipeline.inference_client import InferenceClient
+
+
+def fake_backends():
+    def keypoint(batch):
+        if not np.isfinite(batch).all():
+            raise ValueError("non-finite landmarks")
+        return batch[:, :3] * 2.0
+    return {OP_KEYPOINT: keypoint}
+
+
+class InferenceServerTest(unittest.TestCase):
+    """Test cases for the Unix socket inference daemon and its client"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'inference.sock')
+        self.server = InferenceServer(self.path, backend_factory=fake_backends).start()
+        self.client = InferenceClient(self.path, pool_size=2)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+        self.tmp.cleanup()
+
+    def test_batch_round_trip(self):
+        """Test that a batch comes back computed, with its shape intact"""
+        batch = np.arange(42 * 5, dtype=np.float32).reshape(5, 42)
+        result = self.client.keypoint_proba(batch)
+        np.testing.assert_array_equal(result, batch[:, :3] * 2.0)
+        self.assertTrue(self.client.ping())
+        self.assertEqual(self.server.stats()['rows'], 5)
+
+    def test_server_errors_keep_the_connection(self):
+        """Test that a failing request is reported and the next one still works"""
+        bad = np.full((1, 42), np.nan, dtype=np.float32)
+        with self.assertRaises(RuntimeError):
+            self.client.keypoint_proba(bad)
+        self.assertEqual(self.client._idle.qsize(), 1)  # Returned for reuse, not left to the collector
+        with self.assertRaises(RuntimeError):
+            self.client.call(OP_SEQUENCE, np.zeros((1, 10), dtype=np.float32))
+        self.assertEqual(self.client.keypoint_proba(np.ones(42)).shape, (1, 3))
+
+    def test_concurrent_callers_share_the_pool(self):
+        """Test that threads get their own replies through a small pool"""
+        errors = []
+
+        def run(value):
+            for _ in range(50):
+                result = self.client.keypoint_proba(np.full(42, value, dtype=np.float32))
+                if result[0, 0] != value * 2.0:
+                    errors.append(result)
+
+        threads = [threading.Thread(target=run, args=(float(i),)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_client_reconnects_after_restart(self):
+        """Test that a restarted daemon costs the client one reconnect, not an error"""
+        self.client.keypoint_proba(np.ones(42))
+        self.server.close()
+        self.server = InferenceServer(self.path, backend_factory=fake_backends).start()
+        self.assertEqual(self.client.keypoint_proba(np.ones(42)).shape, (1, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pipeline.hands_pool import solution_results
+from pipeline.landmark_tracker import LandmarkKalman, SkippingHands
+
+BASE_HAND = np.column_stack([np.linspace(0.4, 0.5, 21), np.linspace(0.4, 0.6, 21), np.zeros(21)])
+
+
+class ScriptedHands(object):
+    """Detector returning one hand at positions given per call, counting calls"""
+
+    def __init__(self, positions):
+        self.positions = positions
+        self.calls = 0
+
+    def process(self, rgb_frame):
+        points = self.positions(self.calls)
+        self.calls += 1
+        return solution_results([] if points is None else [('Right', 0.9, points)])
+
+    def close(self):
+        pass
+
+
+def moving_hand(frame_index, step=0.004):
+    points = BASE_HAND.copy()
+    points[:, 0] += step * frame_index
+    return points
+
+
+class LandmarkKalmanTest(unittest.TestCase):
+    """Test cases for the vectorized constant-velocity filter"""
+
+    def test_prediction_follows_constant_velocity(self):
+        """Test that after a few measurements the prediction extrapolates linear motion"""
+        kalman = LandmarkKalman()
+        kalman.reset(moving_hand(0)[:, :2])
+        for i in range(1, 10):
+            kalman.predict()
+            kalman.update(moving_hand(i)[:, :2])
+        for i in range(10, 13):
+            predicted = kalman.predict()
+        np.testing.assert_allclose(predicted, moving_hand(12)[:, :2], atol=2e-3)
+
+    def test_update_reduces_jitter(self):
+        """Test that filtered positions of a still hand jitter less than the measurements"""
+        rng = np.random.default_rng(0)
+        kalman = LandmarkKalman()
+        measurements = BASE_HAND[:, :2] + rng.normal(0, 0.004, (60, 21, 2))
+        kalman.reset(measurements[0])
+        filtered = []
+        for measurement in measurements[1:]:
+            kalman.predict()
+            kalman.update(measurement)
+            filtered.append(kalman.position.copy())
+        raw_error = np.abs(measurements[20:] - BASE_HAND[:, :2]).mean()
+        filtered_error = np.abs(np.array(filtered[19:]) - BASE_HAND[:, :2]).mean()
+        self.assertLess(filtered_error, 0.8 * raw_error)
+
+
+class SkippingHandsTest(unittest.TestCase):
+    """Test cases for detecting every N frames"""
+
+    def setUp(self):
+        self.frame = np.zeros((8, 8, 3), dtype=np.uint8)
+
+    def test_detector_runs_every_n_frames(self):
+        """Test that detection runs on one frame in N and predicted frames are flagged"""
+        detector = ScriptedHands(lambda call: moving_hand(3 * call))
+        hands = SkippingHands(detector, detect_every=3)
+        flags = [hands.process(self.frame).predicted for _ in range(9)]
+        self.assertEqual(detector.calls, 3)
+        self.assertEqual(flags, [False, True, True] * 3)
+        self.assertEqual(hands.stats()['predicted'], 6)
+
+    def test_predicted_landmarks_follow_the_hand(self):
+        """Test that predicted landmarks track the motion between detections"""
+        detector = ScriptedHands(lambda call: moving_hand(2 * call))
+        hands = SkippingHands(detector, detect_every=2, error_threshold=10.0)
+        for _ in range(20):
+            hands.process(self.frame)
+        hands.process(self.frame)  # Frame 20 is a detection, 21 is predicted
+        results = hands.process(self.frame)
+        self.assertTrue(results.predicted)
+        predicted = np.array([(p.x, p.y) for p in results.multi_hand_landmarks[0].landmark])
+        np.testing.assert_allclose(predicted, moving_hand(21)[:, :2], atol=3e-3)
+
+    def test_large_error_forces_next_detection(self):
+        """Test that a detection far from the prediction makes the next frame a detection"""
+        detector = ScriptedHands(lambda call: moving_hand(0) if call < 1 else moving_hand(40))
+        hands = SkippingHands(detector, detect_every=4)
+        for _ in range(5):
+            hands.process(self.frame)  # Detection at frames 0 and 4, the second one jumps
+        self.assertFalse(hands.process(self.frame).predicted)
+        self.assertEqual(hands.stats()['forced'], 1)
+
+    def test_no_hand_detects_every_frame(self):
+        """Test that without a tracked hand every frame runs the detector"""
+        detector = ScriptedHands(lambda call: None)
+        hands = SkippingHands(detector, detect_every=3)
+        for _ in range(4):
+            self.assertIsNone(hands.process(self.frame).multi_hand_landmarks)
+        self.assertEqual(detector.calls, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import threading
+import unittest
+from types import SimpleNamespace
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from signova_app.ml_runtime import (
+    MLRuntime, ml_disabled_reason, STATE_DISABLED, STATE_IDLE, STATE_READY, STATE_FAILED,
+)
+
+
+class MLRuntimeTest(unittest.TestCase):
+    """Test cases for the lazily loaded ML stack"""
+
+    def test_nothing_loads_until_requested(self):
+        """Test that creating the runtime does not call the loader"""
+        calls = []
+        runtime = MLRuntime(loader=lambda: calls.append(1) or SimpleNamespace())
+        self.assertEqual(runtime.state, STATE_IDLE)
+        self.assertEqual(calls, [])
+        self.assertIsNotNone(runtime.require(timeout=5))
+        self.assertEqual(runtime.state, STATE_READY)
+        self.assertIsNotNone(runtime.status()['load_seconds'])
+
+    def test_concurrent_requests_load_once(self):
+        """Test that requests arriving during the load share a single import"""
+        release = threading.Event()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            release.wait(5)
+            return SimpleNamespace(name='ml')
+
+        runtime = MLRuntime(loader=loader)
+        self.assertIsNone(runtime.require(timeout=0.01))  # Still loading
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(runtime.require(timeout=5))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r.name for r in results], ['ml'] * 4)
+
+    def test_import_error_is_reported(self):
+        """Test that a failed import is surfaced in the status instead of raising"""
+        def loader():
+            raise ImportError("No module named 'cv2'")
+
+        runtime = MLRuntime(loader=loader)
+        self.assertIsNone(runtime.require(timeout=5))
+        status = runtime.status()
+        self.assertEqual(status['state'], STATE_FAILED)
+        self.assertIn('cv2', status['error'])
+
+    def test_disabled_runtime_never_loads(self):
+        """Test that the deployment flags keep the loader from running"""
+        runtime = MLRuntime(loader=lambda: self.fail("loader called"), disabled_reason='SIGNOVA_DISABLE_ML')
+        self.assertIsNone(runtime.require(timeout=5))
+        self.assertEqual(runtime.status()['state'], STATE_DISABLED)
+
+    def test_disabled_reason_from_environment(self):
+        """Test that SIGNOVA_DISABLE_ML disables the runtime"""
+        saved = {key: os.environ.pop(key, None) for key in ('RENDER', 'DISABLE_TENSORFLOW', 'SIGNOVA_DISABLE_ML')}
+        try:
+            self.assertIsNone(ml_disabled_reason())
+            os.environ['SIGNOVA_DISABLE_ML'] = 'True'
+            self.assertEqual(ml_disabled_reason(), 'SIGNOVA_DISABLE_ML')
+        finally:
+            os.environ.pop('SIGNOVA_DISABLE_ML', None)
+            for key, value in saved.items():
+                if value is not None:
+                    os.environ[key] = value
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+import concurrent.futures
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import wave
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from speech.audio_service import AudioService
+from speech.phrase_cache import PhraseCache
+
+
+class FakeEngine(object):
+    """Stands in for pyttsx3, writes one 8 kHz frame per character"""
+
+    def __init__(self):
+        self.rendered = []
+        self._jobs = []
+
+    def save_to_file(self, text, path):
+        self._jobs.append((text, path))
+
+    def runAndWait(self):
+        for text, path in self._jobs:
+            self.rendered.append(text)
+            with wave.open(path, 'wb') as w:
+                w.setnchannels(1)
+                w.setsampwidth(2)
+                w.setframerate(8000)
+                w.writeframes(b'\x01\x00' * (len(text) * 100))
+        self._jobs = []
+
+
+class PhraseCacheTest(unittest.TestCase):
+    """Test cases for the TTS phrase cache"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.engine = FakeEngine()
+        self.cache = PhraseCache(cache_dir=self.cache_dir, engine=self.engine)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_render_is_cached(self):
+        """Test that a phrase is synthesized only once"""
+        first = self.cache.render('Muraho')
+        second = self.cache.render('Muraho')
+        self.assertEqual(first, second)
+        self.assertEqual(self.engine.rendered, ['Muraho'])
+
+    def test_key_includes_voice_and_rate(self):
+        """Test that voice and rate select different cache entries"""
+        other = PhraseCache(cache_dir=self.cache_dir, rate=200, engine=self.engine)
+        self.assertNotEqual(self.cache.key('Muraho'), other.key('Muraho'))
+
+    def test_assemble_known_words(self):
+        """Test that sentences of cached phrases are built without synthesis"""
+        self.cache.prebuild(['Thank you', 'Water'])
+        self.engine.rendered = []
+        audio = self.cache.lookup('Thank you Water')
+        self.assertIsNotNone(audio)
+        self.assertEqual(self.engine.rendered, [])
+        with wave.open(io.BytesIO(audio), 'rb') as w:
+            self.assertEqual(w.getnchannels(), 1)
+            self.assertGreater(w.getnframes(), 0)
+        self.assertIsNone(self.cache.lookup('Thank you Milk'))
+
+    def test_lru_size_cap(self):
+        """Test that the least recently used entries are evicted"""
+        self.cache.render('Amata')
+        size = os.path.getsize(self.cache.path('Amata'))
+        self.cache.max_bytes = size * 3
+        self.cache.render('Amazi')
+        self.cache.get('Amata')
+        self.cache.render('Icyayi')
+        self.assertTrue(self.cache.contains('Amata'))
+        self.assertFalse(self.cache.contains('Amazi'))
+        self.assertFalse(os.path.exists(self.cache.path('Amazi')))
+
+    def test_index_survives_restart(self):
+        """Test that cached files are found by a new cache instance"""
+        self.cache.render('Murakoze')
+        reopened = PhraseCache(cache_dir=self.cache_dir, engine=self.engine)
+        self.assertTrue(reopened.contains('Murakoze'))
+
+
+class AudioServiceTest(unittest.TestCase):
+    """Test cases for the voices HTTP clients may request"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.service = AudioService(cache_dir=self.cache_dir, voice_id=None, voices=('english', 'french', 'swahili'),
+                                    max_voice_caches=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_unknown_voice_rejected(self):
+        """Test that only the default and configured voices get a phrase cache"""
+        self.assertTrue(self.service.is_known_voice(None))
+        self.assertTrue(self.service.is_known_voice('french'))
+        self.assertFalse(self.service.is_known_voice('../../voice'))
+        with self.assertRaises(ValueError):
+            self.service.cache_for('../../voice')
+        self.assertEqual(len(self.service._caches), 0)
+
+    def wav(self, rate, frames=80):
+        out = io.BytesIO()
+        with wave.open(out, 'wb') as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(rate)
+            w.writeframes(b'\x00\x01' * frames)
+        return out.getvalue()
+
+    def rendering(self, rate):
+        """Stands in for the synthesis pool, renders every phrase at rate"""
+        def submit(cache, phrase, replace=False):
+            future = concurrent.futures.Future()
+            future.set_result(self.wav(rate))
+            return future
+        return submit
+
+    def test_unjoinable_segments_are_rendered_again(self):
+        """Test that cached segments in mixed formats are re-rendered instead of reported as pending"""
+        cache = self.service.cache_for()
+        cache.put('Muraho', self.wav(8000))
+        cache.put('Amazi', self.wav(16000))
+        self.service._submit = self.rendering(8000)
+        audio = self.service.get_audio(['Muraho', 'Amazi'])
+        self.assertIsNotNone(audio)
+        with wave.open(io.BytesIO(cache.get('Amazi')), 'rb') as w:
+            self.assertEqual(w.getframerate(), 8000)
+
+    def test_segments_that_never_join_are_an_error(self):
+        """Test that a failure to join rendered segments raises instead of returning pending"""
+        self.service._submit = lambda cache, phrase, replace=False: self.rendering(
+            8000 if phrase == 'Muraho' else 16000)(cache, phrase)
+        with self.assertRaises(RuntimeError):
+            self.service.get_audio(['Muraho', 'Amazi'])
+
+    def test_version_follows_rate_and_voice(self):
+        """Test that the URL version changes with the rate and the resolved voice"""
+        version = self.service.version()
+        self.assertEqual(self.service.version(''), version)
+        self.assertNotEqual(self.service.version('french'), version)
+        self.service.rate = 180
+        self.assertNotEqual(self.service.version(), version)
+
+    def test_voice_caches_bounded(self):
+        """Test that the least recently used voice cache is evicted past the limit"""
+        english = self.service.cache_for('english')
+        self.service.cache_for('french')
+        self.assertIs(self.service.cache_for('english'), english)
+        self.service.cache_for('swahili')
+        self.assertEqual(list(self.service._caches), ['english', 'swahili'])
+
+
+if __name__ == '__main__':
+    unittest.main()
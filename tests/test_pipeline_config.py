@@ -0,0 +1,71 @@
+import dataclasses
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pipeline.config import PROFILES, DEFAULT_PROFILE, get_pipeline_config
+
+CLEAN_ENV = {name: value for name, value in os.environ.items() if not name.startswith('SIGNOVA_')}
+
+
+class PipelineConfigTest(unittest.TestCase):
+    """Test cases for named pipeline profiles"""
+
+    def test_balanced_profile_keeps_the_previous_settings(self):
+        """Test that the default profile matches the values the pipelines hard-coded"""
+        config = PROFILES[DEFAULT_PROFILE]
+        self.assertEqual((config.camera_width, config.camera_height), (1280, 720))
+        self.assertEqual((config.min_detection_confidence, config.min_tracking_confidence), (0.7, 0.5))
+        self.assertEqual((config.loop_sleep, config.stream_interval, config.fps_buffer_len), (0.01, 0.033, 10))
+        self.assertEqual(config.detect_every, 1)
+        self.assertFalse(config.adaptive_quality)
+
+    def test_profiles_trade_cost_for_accuracy(self):
+        """Test that low-power does less work per second than accuracy"""
+        low, accurate = PROFILES['low-power'], PROFILES['accuracy']
+        self.assertLess(low.camera_width * low.camera_height, accurate.camera_width * accurate.camera_height)
+        self.assertLess(low.max_num_hands, accurate.max_num_hands)
+        self.assertLess(low.model_complexity, accurate.model_complexity)
+        self.assertGreater(low.detect_every, accurate.detect_every)
+        self.assertLess(low.target_fps, accurate.target_fps)
+
+    def test_selection_by_argument_and_environment(self):
+        """Test that an explicit name wins over SIGNOVA_PIPELINE_PROFILE, which wins over the default"""
+        with mock.patch.dict(os.environ, CLEAN_ENV, clear=True):
+            self.assertEqual(get_pipeline_config().name, DEFAULT_PROFILE)
+            os.environ['SIGNOVA_PIPELINE_PROFILE'] = 'low-power'
+            self.assertEqual(get_pipeline_config().name, 'low-power')
+            self.assertEqual(get_pipeline_config('accuracy').name, 'accuracy')
+            self.assertEqual(get_pipeline_config('turbo').name, DEFAULT_PROFILE)
+
+    def test_feature_variables_override_the_profile(self):
+        """Test that SIGNOVA_DETECT_EVERY, SIGNOVA_ADAPTIVE_QUALITY and SIGNOVA_TARGET_FPS still apply"""
+        env = dict(CLEAN_ENV, SIGNOVA_DETECT_EVERY='2', SIGNOVA_ADAPTIVE_QUALITY='false', SIGNOVA_TARGET_FPS='24')
+        with mock.patch.dict(os.environ, env, clear=True):
+            config = get_pipeline_config('low-power')
+        self.assertEqual((config.detect_every, config.adaptive_quality, config.target_fps), (2, False, 24.0))
+        self.assertEqual(config.camera_width, 640)
+
+    def test_override_ignores_missing_values(self):
+        """Test that override replaces only the fields given a value and never mutates the preset"""
+        balanced = PROFILES['balanced']
+        config = balanced.override(camera_width=800, camera_height=None)
+        self.assertEqual((config.camera_width, config.camera_height), (800, 720))
+        self.assertIs(balanced.override(camera_width=None), balanced)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            balanced.camera_width = 1
+
+    def test_hands_options(self):
+        """Test that the hands options carry the profile's detector settings"""
+        options = PROFILES['low-power'].hands_options()
+        self.assertEqual(options['max_num_hands'], 1)
+        self.assertEqual(options['model_complexity'], 0)
+        self.assertFalse(options['static_image_mode'])
+
+
+if __name__ == '__main__':
+    unittest.main()
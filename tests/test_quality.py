@@ -0,0 +1,139 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pipeline.quality import (
+    QUALITY_LADDER, AdaptiveHands, QualityController, create_quality_controller, release_quality_controller,
+    session_levels,
+)
+
+
+class RecordingHands(object):
+    def __init__(self, max_num_hands, model_complexity):
+        self.settings = (max_num_hands, model_complexity)
+        self.frames = []
+        self.closed = False
+
+    def process(self, rgb_frame):
+        self.frames.append(rgb_frame.shape)
+        return None
+
+    def close(self):
+        self.closed = True
+
+
+class ReconfigurableHands(RecordingHands):
+    """Applies hand count changes itself, like a pooled session"""
+
+    def reconfigure(self, max_num_hands, model_complexity):
+        self.settings = (max_num_hands, model_complexity)
+        return True
+
+
+class QualityControllerTest(unittest.TestCase):
+    """Test cases for stepping through the quality ladder"""
+
+    def setUp(self):
+        self.controller = QualityController(target_fps=50, down_frames=5, up_frames=20, cooldown_frames=3,
+                                            smoothing=1.0)
+
+    def feed(self, seconds, frames):
+        return [self.controller.record(seconds) for _ in range(frames)]
+
+    def test_steps_down_when_behind(self):
+        """Test that frames over budget step one level down after down_frames"""
+        changes = self.feed(0.03, 5)
+        self.assertEqual(changes[:4], [None] * 4)
+        self.assertIs(changes[4], QUALITY_LADDER[1])
+        self.assertEqual(self.controller.level.name, 'reduced-resolution')
+
+    def test_cooldown_follows_a_change(self):
+        """Test that no further change happens until the cooldown and a new run of slow frames"""
+        self.feed(0.03, 5)
+        self.feed(0.03, 3 + 4)
+        self.assertEqual(self.controller.index, 1)
+        self.feed(0.03, 1)
+        self.assertEqual(self.controller.index, 2)
+
+    def test_steps_up_only_with_slack(self):
+        """Test hysteresis: frames just under budget keep the level, clear slack steps it up"""
+        self.feed(0.03, 5)
+        self.feed(0.019, 100)  # Under the 20 ms budget but above 0.7 of it
+        self.assertEqual(self.controller.index, 1)
+        self.feed(0.005, 19)
+        self.assertEqual(self.controller.index, 1)
+        self.feed(0.005, 1)
+        self.assertEqual(self.controller.index, 0)
+
+    def test_bottom_and_top_of_the_ladder(self):
+        """Test that the level stays within the ladder"""
+        self.feed(0.005, 100)
+        self.assertEqual(self.controller.index, 0)
+        self.feed(0.1, 200)
+        self.assertEqual(self.controller.level.name, 'minimal')
+        self.assertFalse(self.controller.level.draw_overlay)
+
+    def test_fixed_controller_never_changes(self):
+        """Test that a non-adaptive controller stays on the top level"""
+        controller = QualityController(target_fps=50, adaptive=False, down_frames=1)
+        for _ in range(50):
+            self.assertIsNone(controller.record(0.1))
+        self.assertEqual(controller.status()['level'], 'full')
+        self.assertEqual(controller.status()['frame_ms'], 100.0)
+
+
+class AdaptiveHandsTest(unittest.TestCase):
+    """Test cases for applying the level to the hands detector"""
+
+    def test_detector_rebuilt_only_when_settings_change(self):
+        """Test that hand count and model complexity changes rebuild the detector at the next frame"""
+        controller = QualityController(target_fps=50, down_frames=1, cooldown_frames=0, smoothing=1.0)
+        hands = AdaptiveHands(RecordingHands, controller, max_num_hands=1)
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        hands.process(frame)
+        first = hands.hands
+        self.assertEqual(first.settings, (1, 1))  # The session's own limit caps the ladder's two hands
+        controller.record(0.1)  # full -> reduced-resolution, same hands settings
+        hands.process(frame)
+        self.assertIs(hands.hands, first)
+        controller.record(0.1)  # -> one-hand
+        controller.record(0.1)  # -> lite-model
+        hands.process(frame)
+        self.assertEqual(hands.hands.settings, (1, 0))
+        self.assertTrue(first.closed)
+        self.assertEqual(hands.rebuilds, 1)
+        self.assertEqual(hands.hands.frames, [(240, 320, 3)])  # Narrower than 640, not resized
+
+    def test_reconfigurable_detector_is_kept(self):
+        """Test that a detector applying the settings itself is reconfigured instead of closed and rebuilt"""
+        controller = QualityController(target_fps=50, down_frames=1, cooldown_frames=0, smoothing=1.0)
+        built = []
+        hands = AdaptiveHands(lambda *settings: built.append(ReconfigurableHands(*settings)) or built[-1], controller)
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        hands.process(frame)
+        for _ in range(3):
+            controller.record(0.1)  # -> lite-model
+        hands.process(frame)
+        self.assertEqual(len(built), 1)
+        self.assertFalse(built[0].closed)
+        self.assertEqual(built[0].settings, (1, 0))
+        self.assertEqual((hands.rebuilds, hands.reconfigures), (0, 1))
+        self.assertEqual(built[0].frames, [(240, 320, 3)] * 2)
+
+    def test_session_levels(self):
+        """Test that registered sessions report their current level"""
+        create_quality_controller('camera-a', adaptive=True)
+        try:
+            self.assertEqual(session_levels()['camera-a']['level'], 'full')
+        finally:
+            release_quality_controller('camera-a')
+        self.assertNotIn('camera-a', session_levels())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.columnar_store import ColumnarDataset
+from model.sample_capture import (UncertainSampleCapture, load_captured_samples, process_store_path,
+                                  LANDMARK_FEATURES)
+
+
+def probabilities(confidence, predicted=2, classes=5):
+    row = np.full(classes, (1.0 - confidence) / (classes - 1), dtype=np.float32)
+    row[predicted] = confidence
+    return row
+
+
+class UncertainSampleCaptureTest(unittest.TestCase):
+    """Test cases for the ambiguous-frame capture ring"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = os.path.join(self.tmp.name, 'uncertain.columnar')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_only_the_band_is_captured(self):
+        """Test that confident and hopeless frames are ignored"""
+        capture = UncertainSampleCapture(self.store, low=0.4, high=0.7, spill_interval=60)
+        landmarks = [0.1] * LANDMARK_FEATURES
+        self.assertFalse(capture.offer(landmarks, probabilities(0.9)))
+        self.assertFalse(capture.offer(landmarks, probabilities(0.3)))
+        self.assertFalse(capture.offer(landmarks, None))
+        self.assertTrue(capture.offer(landmarks, probabilities(0.55)))
+        capture.close()
+        stats = capture.stats()
+        self.assertEqual((stats['offered'], stats['captured'], stats['spilled']), (3, 1, 1))
+
+    def test_spilled_samples_round_trip(self):
+        """Test that landmarks, probabilities and the predicted class reach the store"""
+        capture = UncertainSampleCapture(self.store, spill_rows=4, spill_interval=60)
+        rng = np.random.default_rng(0)
+        expected = []
+        for i in range(10):
+            landmarks = rng.uniform(-1, 1, LANDMARK_FEATURES).astype(np.float32)
+            row = probabilities(0.5, predicted=i % 5)
+            capture.offer(landmarks.tolist(), row)
+            expected.append((i % 5, landmarks, row))
+        capture.close()
+
+        predicted, landmarks, probs = load_captured_samples(self.store)
+        self.assertEqual(predicted.tolist(), [label for label, _, _ in expected])
+        np.testing.assert_array_equal(landmarks, np.stack([l for _, l, _ in expected]))
+        np.testing.assert_array_equal(probs, np.stack([p for _, _, p in expected]))
+        schema = ColumnarDataset(self.store).schema
+        self.assertEqual(schema['columns']['probabilities'], [LANDMARK_FEATURES, LANDMARK_FEATURES + 5])
+
+    def test_spill_happens_in_background(self):
+        """Test that a full batch is written without closing the capture"""
+        capture = UncertainSampleCapture(self.store, spill_rows=8, spill_interval=60)
+        for _ in range(8):
+            capture.offer([0.0] * LANDMARK_FEATURES, probabilities(0.5))
+        deadline = time.monotonic() + 5
+        while capture.stats()['spilled'] < 8 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(ColumnarDataset(self.store)), 8)
+        capture.close()
+
+    def test_overwrites_are_counted(self):
+        """Test that a ring the spill thread cannot keep up with drops the oldest samples"""
+        capture = UncertainSampleCapture(self.store, capacity=4, spill_rows=100, spill_interval=60)
+        for i in range(10):
+            capture.offer([float(i)] * LANDMARK_FEATURES, probabilities(0.5))
+        capture.close()
+        self.assertEqual(capture.stats()['overwritten'], 6)
+        _, landmarks, _ = load_captured_samples(self.store)
+        self.assertEqual(landmarks[:, 0].tolist(), [6.0, 7.0, 8.0, 9.0])
+
+    def test_processes_spill_to_separate_stores(self):
+        """Test that each process writes its own store and loading the root reads all of them"""
+        root = os.path.join(self.tmp.name, 'capture.columnar')
+        other = UncertainSampleCapture(os.path.join(root, 'process-1'), spill_rows=4, spill_interval=60)
+        other.offer([1.0] * LANDMARK_FEATURES, probabilities(0.5, predicted=1))
+        other.close()
+        capture = UncertainSampleCapture(spill_rows=4, spill_interval=60)
+        capture.offer([2.0] * LANDMARK_FEATURES, probabilities(0.5, predicted=3))
+        with mock.patch('model.sample_capture.DEFAULT_CAPTURE_PATH', root):
+            capture.close()
+            self.assertEqual(capture.store_path, process_store_path())
+        self.assertEqual(os.path.basename(capture.store_path), f'process-{os.getpid()}')
+        predicted, landmarks, _ = load_captured_samples(root)
+        self.assertEqual(sorted(predicted.tolist()), [1, 3])
+        self.assertEqual(sorted(landmarks[:, 0].tolist()), [1.0, 2.0])
+
+    def test_missing_root_loads_nothing(self):
+        """Test that an empty capture root returns empty arrays"""
+        predicted, landmarks, probs = load_captured_samples(os.path.join(self.tmp.name, 'missing'))
+        self.assertEqual((len(predicted), landmarks.shape[1], len(probs)), (0, LANDMARK_FEATURES, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
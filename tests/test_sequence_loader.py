@@ -0,0 +1,77 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.sign_dataset import FEATURE_SIZE, POSE_SIZE, HAND_SIZE
+from model.sequence_loader import SequenceAugmenter, SequenceBatchLoader, stratified_split
+
+
+class ArrayDataset(object):
+    """In-memory stand-in for a packed dataset"""
+
+    def __init__(self, sequences, labels):
+        self.sequences = sequences
+        self.labels = labels
+        self.shape = sequences.shape
+
+    def __len__(self):
+        return len(self.sequences)
+
+    def batch(self, indices):
+        return self.sequences[indices].astype(np.float32), self.labels[indices]
+
+
+def make_dataset(count=20, frames=4):
+    rng = np.random.default_rng(0)
+    sequences = rng.uniform(0.1, 0.9, size=(count, frames, FEATURE_SIZE)).astype(np.float32)
+    sequences[:, :, POSE_SIZE + HAND_SIZE:POSE_SIZE + 2 * HAND_SIZE] = 0  # No right hand
+    return ArrayDataset(sequences, np.arange(count, dtype=np.int16) % 4)
+
+
+class SequenceLoaderTest(unittest.TestCase):
+    """Test cases for the streaming training input pipeline"""
+
+    def test_stratified_split(self):
+        """Test that every sign lands in both splits"""
+        labels = np.repeat(np.arange(5), 10)
+        train, val = stratified_split(labels, val_fraction=0.2)
+        self.assertEqual(len(set(train) & set(val)), 0)
+        self.assertEqual(len(train) + len(val), len(labels))
+        for label in range(5):
+            self.assertEqual(np.sum(labels[val] == label), 2)
+
+    def test_epoch_covers_every_sequence(self):
+        """Test that prefetched and direct epochs yield each sequence once"""
+        dataset = make_dataset()
+        for prefetch in (0, 2):
+            loader = SequenceBatchLoader(dataset, batch_size=6, prefetch=prefetch, seed=1)
+            seen = [row[0, 0] for batch, _ in loader for row in batch]
+            self.assertEqual(len(loader), 4)
+            self.assertEqual(sorted(seen), sorted(dataset.sequences[:, 0, 0]))
+
+    def test_mirror_twice_is_identity(self):
+        """Test that mirroring swaps the hands and undoes itself"""
+        dataset = make_dataset()
+        batch, _ = dataset.batch(np.arange(4))
+        augment = SequenceAugmenter(max_shift=0, scale_range=None, mirror_probability=1.0)
+        once = augment(batch.copy())
+        self.assertTrue(np.all(once[:, :, POSE_SIZE:POSE_SIZE + HAND_SIZE] == 0))
+        np.testing.assert_allclose(augment(once), batch, atol=1e-6)
+
+    def test_scale_keeps_missing_landmarks(self):
+        """Test that scaling leaves undetected landmarks at zero"""
+        dataset = make_dataset()
+        batch, _ = dataset.batch(np.arange(4))
+        augmented = SequenceAugmenter(max_shift=0, scale_range=(0.5, 0.5), mirror_probability=0)(batch.copy())
+        self.assertTrue(np.all(augmented[:, :, POSE_SIZE + HAND_SIZE:POSE_SIZE + 2 * HAND_SIZE] == 0))
+        np.testing.assert_allclose(augmented[:, :, 0], 0.5 + (batch[:, :, 0] - 0.5) * 0.5, atol=1e-6)
+        np.testing.assert_array_equal(augmented[:, :, 3], batch[:, :, 3])  # Visibility
+
+
+if __name__ == '__main__':
+    unittest.main()
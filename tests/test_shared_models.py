@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.shared_models import get_model_bytes, preload_models, KEYPOINT_MODEL_PATH
+from model.sign_sequence_classifier.sign_sequence_classifier import get_sign_sequence_classifier, MODEL_PATH
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class SharedModelsTest(unittest.TestCase):
+    """Test cases for the model state loaded before forking workers"""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        os.chdir(PROJECT_ROOT)  # The model paths are relative to the project root
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+
+    def test_model_bytes_are_read_once(self):
+        """Test that every caller gets the same bytes object for a file"""
+        with tempfile.NamedTemporaryFile(suffix='.tflite', delete=False) as f:
+            f.write(b'model')
+        try:
+            first = get_model_bytes(f.name)
+            os.remove(f.name)  # Later calls must not touch the file
+            self.assertIs(get_model_bytes(f.name), first)
+        finally:
+            if os.path.exists(f.name):
+                os.remove(f.name)
+
+    def test_preload_covers_the_shared_state(self):
+        """Test that preloading reads the models and vocabulary without errors"""
+        timings = preload_models()
+        self.assertIn('sign vocabulary', timings)
+        self.assertIn(os.path.basename(KEYPOINT_MODEL_PATH), timings)
+
+    @unittest.skipUnless(os.path.exists(MODEL_PATH), "sign sequence classifier has not been trained")
+    def test_sequence_classifier_is_shared(self):
+        """Test that sessions share one sequence classifier instance"""
+        self.assertIs(get_sign_sequence_classifier(), get_sign_sequence_classifier())
+
+
+if __name__ == '__main__':
+    unittest.main()
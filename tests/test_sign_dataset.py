@@ -0,0 +1,66 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.sign_dataset import pack_dataset, load_packed_dataset, verify_packed
+
+
+def write_sequence(data_path, sign, sequence_id, frames, features=12, duplicate=False):
+    sequence_path = os.path.join(data_path, sign, str(sequence_id))
+    os.makedirs(sequence_path)
+    rng = np.random.default_rng(sequence_id)
+    for i in range(frames):
+        frame = rng.standard_normal(features)
+        np.save(os.path.join(sequence_path, f"{i}.npy"), frame)
+        if duplicate:
+            np.save(os.path.join(sequence_path, f"{i}-copy.npy"), frame + 1.0)
+
+
+class PackedSignDatasetTest(unittest.TestCase):
+    """Test cases for packing the per-frame sign dataset"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_path = os.path.join(self.tmp.name, 'Data')
+        self.packed_dir = os.path.join(self.tmp.name, 'packed')
+        write_sequence(self.data_path, 'oya', 1, 4)
+        write_sequence(self.data_path, 'oya', 2, 4, duplicate=True)
+        write_sequence(self.data_path, 'yego', 1, 4)
+        write_sequence(self.data_path, 'yego', 2, 3)  # Incomplete, skipped
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_pack_round_trip(self):
+        """Test that packed sequences equal the canonical frames"""
+        index = pack_dataset(self.data_path, self.packed_dir, sequence_length=4)
+        self.assertEqual(index['shape'], [3, 4, 12])
+        self.assertEqual(index['sequence_ids'], ['oya/1', 'oya/2', 'yego/1'])
+        dataset = load_packed_dataset(self.packed_dir)
+        self.assertIsInstance(dataset.sequences, np.memmap)
+        self.assertEqual(verify_packed(self.data_path, self.packed_dir), [])
+        sequence, label = dataset[1]
+        original = np.load(os.path.join(self.data_path, 'oya', '2', '0.npy'))
+        np.testing.assert_array_equal(sequence[0], original.astype(np.float32))
+        self.assertEqual(dataset.signs[label], 'oya')
+
+    def test_float16_and_batch(self):
+        """Test half precision packing and batch gathering"""
+        pack_dataset(self.data_path, self.packed_dir, dtype='float16', sequence_length=4)
+        dataset = load_packed_dataset(self.packed_dir)
+        self.assertEqual(dataset.sequences.dtype, np.float16)
+        self.assertEqual(verify_packed(self.data_path, self.packed_dir), [])
+        batch, labels = dataset.batch([2, 0])
+        self.assertEqual(batch.dtype, np.float32)
+        np.testing.assert_array_equal(batch[0], dataset.sequences[2])
+        self.assertEqual(list(labels), [1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.sign_decoder import TemporalSignDecoder, create_sign_decoder
+
+
+def one_hot(index, num_classes=4, confidence=0.95):
+    probabilities = np.full(num_classes, (1.0 - confidence) / (num_classes - 1), dtype=np.float32)
+    probabilities[index] = confidence
+    return probabilities
+
+
+class TemporalSignDecoderTest(unittest.TestCase):
+    """Test cases for the streaming sign decoder"""
+
+    def run_frames(self, decoder, frames):
+        return [decoder.update(frame) for frame in frames]
+
+    def test_single_frame_spike_is_ignored(self):
+        """Test that a one-frame misclassification is not emitted"""
+        decoder = TemporalSignDecoder(num_classes=4)
+        frames = [one_hot(1)] * 10 + [one_hot(2)] + [one_hot(1)] * 5
+        emitted = [e for e in self.run_frames(decoder, frames) if e is not None]
+        self.assertEqual([e[0] for e in emitted], [1])
+
+    def test_hysteresis_requires_release(self):
+        """Test that a held sign is emitted once and again only after it fades"""
+        decoder = TemporalSignDecoder(num_classes=4)
+        frames = [one_hot(1)] * 20 + [None] * 10 + [one_hot(1)] * 10
+        emitted = [e for e in self.run_frames(decoder, frames) if e is not None]
+        self.assertEqual([e[0] for e in emitted], [1, 1])
+
+    def test_ignored_classes(self):
+        """Test that ignored labels such as None are never emitted"""
+        decoder = TemporalSignDecoder(num_classes=4, ignore_ids=[0])
+        emitted = [e for e in self.run_frames(decoder, [one_hot(0)] * 20) if e is not None]
+        self.assertEqual(emitted, [])
+
+    def test_vote_mode(self):
+        """Test that the windowed vote emits on a stable majority"""
+        decoder = TemporalSignDecoder(num_classes=4, mode='vote', window=6)
+        frames = [one_hot(3)] * 3 + [one_hot(2)] * 8
+        emitted = [e for e in self.run_frames(decoder, frames) if e is not None]
+        self.assertEqual([e[0] for e in emitted], [2])
+
+    def test_none_disables_decoder(self):
+        """Test that the 'none' kind keeps per-frame emission"""
+        self.assertIsNone(create_sign_decoder('none'))
+
+
+if __name__ == '__main__':
+    unittest.main()
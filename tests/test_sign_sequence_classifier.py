@@ -0,0 +1,72 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.sign_sequence_classifier.sign_sequence_classifier import (
+    SignSequenceClassifier, MODEL_PATH, hand_features, sign_label,
+)
+
+
+def fake_hand(label, offset):
+    landmarks = [SimpleNamespace(x=offset + i * 0.01, y=0.5, z=-0.1) for i in range(21)]
+    return SimpleNamespace(landmark=landmarks), SimpleNamespace(classification=[SimpleNamespace(label=label)])
+
+
+@unittest.skipUnless(os.path.exists(MODEL_PATH), "sign sequence classifier has not been trained")
+class SignSequenceClassifierTest(unittest.TestCase):
+    """Test cases for the streaming sign sequence classifier"""
+
+    def setUp(self):
+        self.classifier = SignSequenceClassifier()
+        rng = np.random.default_rng(0)
+        self.sequence = rng.uniform(0, 1, size=(45, self.classifier.input_size)).astype(np.float32)
+
+    def test_streaming_matches_full_window(self):
+        """Test that the ring gives the same scores as classifying the window from scratch"""
+        stream = self.classifier.create_stream()
+        frames = self.classifier.frames
+        for i, frame in enumerate(self.sequence):
+            stream.push(frame)
+            probabilities = stream.predict_proba()
+            if i + 1 < frames:
+                self.assertIsNone(probabilities)
+                continue
+            expected = self.classifier.predict_sequences(self.sequence[None, i + 1 - frames:i + 1])[0]
+            np.testing.assert_allclose(probabilities, expected, rtol=1e-4, atol=1e-6)
+
+    def test_idle_window_is_not_scored(self):
+        """Test that a window without any detection yields no scores"""
+        stream = self.classifier.create_stream()
+        for frame in self.sequence[:self.classifier.frames]:
+            stream.push(frame)
+        self.assertIsNotNone(stream.predict_proba())
+        for _ in range(self.classifier.frames):
+            stream.push(None)
+        self.assertIsNone(stream.predict_proba())
+
+
+class HandFeaturesTest(unittest.TestCase):
+    """Test cases for the live hand feature layout"""
+
+    def test_left_and_right_blocks(self):
+        """Test that each hand lands in its dataset block and a missing hand is zero"""
+        landmarks, handedness = fake_hand('Right', 0.2)
+        out = np.full(126, 7.0, dtype=np.float32)
+        hand_features([landmarks], [handedness], out)
+        self.assertTrue(np.all(out[:63] == 0))
+        self.assertAlmostEqual(float(out[63]), 0.2, places=6)
+        self.assertAlmostEqual(float(out[65]), -0.1, places=6)
+
+    def test_sign_label(self):
+        self.assertEqual(sign_label('umujyi wa kigali'), 'Umujyi wa kigali')
+        self.assertEqual(sign_label('---'), '---')
+
+
+if __name__ == '__main__':
+    unittest.main()
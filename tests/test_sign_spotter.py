@@ -0,0 +1,70 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.sign_spotter import SignSpotter, resample_segment
+
+
+class RecordingClassifier(object):
+    """Sequence classifier stand-in that records the windows it is asked about"""
+    input_size = 126
+    frames = 30
+
+    def __init__(self):
+        self.windows = []
+
+    def predict_sequences(self, sequences):
+        self.windows.append(sequences.copy())
+        return np.array([[0.1, 0.9]], dtype=np.float32)
+
+
+def hand_at(x):
+    frame = np.zeros(126, dtype=np.float32)
+    hand = frame.reshape(2, 21, 3)
+    hand[1, :, 0] = x
+    hand[1, :, 1] = 0.5
+    return frame
+
+
+class SignSpotterTest(unittest.TestCase):
+    """Test cases for motion-energy sign spotting"""
+
+    def test_resample_segment(self):
+        """Test that resampling keeps the end points and interpolates between them"""
+        segment = np.linspace(0, 9, 10, dtype=np.float32)[:, None].repeat(3, axis=1)
+        window = resample_segment(segment, 4)
+        np.testing.assert_allclose(window[:, 0], [0, 3, 6, 9])
+
+    def test_rest_is_never_classified(self):
+        """Test that a still hand and missing hands open no segment"""
+        classifier = RecordingClassifier()
+        spotter = SignSpotter(classifier)
+        for _ in range(50):
+            self.assertIsNone(spotter.update(hand_at(0.4)))
+        for _ in range(20):
+            self.assertIsNone(spotter.update(None))
+        self.assertEqual(classifier.windows, [])
+        self.assertEqual(spotter.stats()['invocations_saved'], 70)
+
+    def test_motion_segment_is_classified_once(self):
+        """Test that one movement between rests yields one 30-frame classification"""
+        classifier = RecordingClassifier()
+        spotter = SignSpotter(classifier)
+        frames = [hand_at(0.4)] * 10 + [hand_at(0.4 + 0.03 * i) for i in range(15)] + [hand_at(0.85)] * 20
+        results = [r for r in (spotter.update(f) for f in frames) if r is not None]
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0][0], 1)
+        self.assertEqual(classifier.windows[0].shape, (1, 30, 126))
+        stats = spotter.stats()
+        self.assertEqual(stats['segments_found'], 1)
+        self.assertEqual(stats['classifier_invocations'], 1)
+        self.assertFalse(stats['active'])
+
+
+if __name__ == '__main__':
+    unittest.main()
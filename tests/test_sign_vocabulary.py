@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.sign_vocabulary import parse_label_line, load_vocabulary, build_vocabulary
+
+
+class SignVocabularyTest(unittest.TestCase):
+    """Test cases for the shared sign vocabulary"""
+
+    def test_parse_label_line(self):
+        """Test that plain and malformed label rows are parsed"""
+        self.assertEqual(parse_label_line('Open\n'), ('Open', None))
+        self.assertEqual(parse_label_line('Open: "Open",\n'), ('Open', 'Open'))
+        self.assertEqual(parse_label_line('Muraho": "Hello",\n'), ('Muraho', 'Hello'))
+        self.assertEqual(parse_label_line('\n'), (None, None))
+
+    def test_keypoint_tables_are_aligned(self):
+        """Test that id -> label, display and translation tables line up"""
+        vocabulary = build_vocabulary()
+        self.assertEqual(len(vocabulary.keypoint_labels), len(vocabulary.keypoint_display))
+        self.assertEqual(len(vocabulary.keypoint_labels), len(vocabulary.keypoint_kinyarwanda))
+        self.assertNotIn(':', ''.join(vocabulary.keypoint_labels))
+        with self.assertRaises(TypeError):
+            vocabulary.label_to_display['Open'] = 'Closed'
+
+    def test_cache_round_trip(self):
+        """Test that a cached vocabulary matches a freshly built one"""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = os.path.join(tmp, 'vocabulary.cache')
+            built = load_vocabulary(cache_path)
+            self.assertTrue(os.path.exists(cache_path))
+            cached = load_vocabulary(cache_path)
+            self.assertEqual(built.to_record(), cached.to_record())
+
+
+if __name__ == '__main__':
+    unittest.main()
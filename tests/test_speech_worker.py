@@ -0,0 +1,117 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from speech.speech_worker import SpeechWorker, PRIORITY_SENTENCE
+
+
+class FakeEngine(object):
+    """Stands in for pyttsx3, blocks in runAndWait until released"""
+
+    def __init__(self):
+        self.spoken = []
+        self.release = threading.Event()
+        self.release.set()
+        self._pending = []
+        self._callbacks = []
+
+    def setProperty(self, name, value):
+        pass
+
+    def getProperty(self, name):
+        return []
+
+    def connect(self, topic, callback):
+        self._callbacks.append(callback)
+
+    def say(self, text):
+        self._pending.append(text)
+
+    def runAndWait(self):
+        for text in self._pending:
+            for callback in self._callbacks:
+                callback(text)
+            self.release.wait(2.0)
+            self.spoken.append(text)
+        self._pending = []
+
+    def stop(self):
+        self.release.set()
+
+
+class SpeechWorkerTest(unittest.TestCase):
+    """Test cases for the queue-driven speech worker"""
+
+    def setUp(self):
+        self.engine = FakeEngine()
+        self.worker = SpeechWorker(cooldown=0.0, max_queue=3, use_phrase_cache=False,
+                                   engine_factory=lambda: self.engine)
+        self.worker._ready.wait(2.0)
+
+    def tearDown(self):
+        self.worker.stop()
+
+    def wait_idle(self):
+        deadline = time.time() + 2.0
+        while time.time() < deadline:
+            if not self.worker.metrics()['queue_depth'] and not self.worker.is_speaking:
+                return
+            time.sleep(0.01)
+
+    def test_coalesces_consecutive_duplicates(self):
+        """Test that repeated consecutive words are spoken once"""
+        self.engine.release.clear()
+        self.worker.submit('Muraho')
+        time.sleep(0.05)
+        self.assertFalse(self.worker.submit('Muraho'))
+        self.assertTrue(self.worker.submit('Amazi'))
+        self.assertFalse(self.worker.submit('Amazi'))
+        self.engine.release.set()
+        self.wait_idle()
+        self.assertEqual(self.engine.spoken, ['Muraho', 'Amazi'])
+        self.assertEqual(self.worker.metrics()['coalesced'], 2)
+
+    def test_priority_and_bound(self):
+        """Test that sentences jump the queue and the oldest word is dropped when full"""
+        self.engine.release.clear()
+        self.worker.submit('busy')
+        time.sleep(0.05)
+        for word in ['one', 'two', 'three', 'four']:
+            self.worker.submit(word)
+        self.worker.submit('full sentence', priority=PRIORITY_SENTENCE)
+        self.engine.release.set()
+        self.wait_idle()
+        self.assertEqual(self.engine.spoken, ['busy', 'full sentence', 'three', 'four'])
+        self.assertEqual(self.worker.metrics()['dropped'], 2)
+
+    def test_clear_drops_only_the_owners_items(self):
+        """Test that stopping one translator keeps the speech another one queued"""
+        self.engine.release.clear()
+        self.worker.submit('busy', owner=1)
+        time.sleep(0.05)
+        self.worker.submit('Muraho', owner=1)
+        self.worker.submit('Amazi', owner=2)
+        self.worker.submit('Murakoze', priority=PRIORITY_SENTENCE, owner=2)
+        self.worker.clear(1)
+        self.assertEqual(self.worker.metrics()['queue_depth'], 2)
+        self.engine.release.set()
+        self.wait_idle()
+        self.assertEqual(self.engine.spoken, ['busy', 'Murakoze', 'Amazi'])
+        self.assertEqual(self.worker.metrics()['dropped'], 1)
+
+    def test_latency_metric(self):
+        """Test that speak latency is recorded per utterance"""
+        self.worker.submit('Murakoze')
+        self.wait_idle()
+        metrics = self.worker.metrics()
+        self.assertEqual(metrics['spoken'], 1)
+        self.assertIsNotNone(metrics['latency_ms_last'])
+
+
+if __name__ == '__main__':
+    unittest.main()
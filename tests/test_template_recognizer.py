@@ -0,0 +1,106 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.template_recognizer import TemplateRecognizer, banded_dtw, envelope, lb_keogh
+
+
+def make_sign(kind, length=30, noise=0.02, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0, 1, length)[:, None]
+    base = np.sin(2 * np.pi * (kind + 1) * t + np.arange(6)[None, :])
+    return (base + rng.normal(0, noise, base.shape)).astype(np.float32)
+
+
+def make_recognizer(per_sign=5):
+    recognizer = TemplateRecognizer(n_components=4, band=3, feature_indices=np.arange(6))
+    for kind in range(4):
+        recognizer.add_sign(f"sign{kind}", [make_sign(kind, seed=kind * 100 + i) for i in range(per_sign)])
+    return recognizer
+
+
+class TemplateRecognizerTest(unittest.TestCase):
+    """Test cases for the DTW template recognizer"""
+
+    def test_lower_bound_holds(self):
+        """Test that LB_Keogh never exceeds the banded DTW distance"""
+        rng = np.random.default_rng(1)
+        query = rng.normal(size=(20, 3)).astype(np.float32)
+        templates = rng.normal(size=(32, 20, 3)).astype(np.float32)
+        lower, upper = envelope(templates, 2)
+        bounds = lb_keogh(query, lower, upper)
+        distances = banded_dtw(query, templates, 2)
+        self.assertTrue(np.all(bounds <= distances + 1e-4))
+
+    def test_pruning_keeps_the_nearest(self):
+        """Test that pruned queries return the same neighbours as full alignment"""
+        recognizer = make_recognizer()
+        for kind in range(4):
+            query = make_sign(kind, length=40, seed=999 + kind)
+            pruned = recognizer.query(query, k=3)
+            self.assertGreater(recognizer.last_query['pruned'], 0)
+            full = recognizer.query(query, k=3, prune=False)
+            self.assertEqual([label for label, _ in pruned], [label for label, _ in full])
+            self.assertEqual(recognizer.classify(query), f"sign{kind}")
+
+    def test_envelopes_survive_growth(self):
+        """Test that the index keeps every template's envelope when its capacity grows"""
+        recognizer = make_recognizer(per_sign=5)  # 20 templates, grown once past 16
+        count = len(recognizer)
+        lower, upper = envelope(recognizer._templates[:count], recognizer.band)
+        np.testing.assert_array_equal(recognizer._lower[:count], lower)
+        np.testing.assert_array_equal(recognizer._upper[:count], upper)
+
+    def test_record_new_sign_at_runtime(self):
+        """Test that a recorded sample becomes a template for a new sign"""
+        recognizer = make_recognizer()
+        recognizer.start_recording('new')
+        for frame in make_sign(7, length=25):
+            recognizer.record_frame(frame)
+        self.assertTrue(recognizer.finish_recording())
+        self.assertEqual(recognizer.classify(make_sign(7, seed=5), k=1), 'new')
+
+    def test_provisional_projection_is_refit(self):
+        """Test that signs recorded on an empty index are refit and reprojected together"""
+        recognizer = TemplateRecognizer(n_components=4, band=3, feature_indices=np.arange(6), refit_signs=3)
+        first = make_sign(0)
+        first[:, 5] = 0.5  # Constant within the first sign only
+        recognizer.add_sign('sign0', [first])
+        self.assertTrue(recognizer.provisional)
+        self.assertGreater(recognizer.scale[5], 100)
+        for kind in (1, 2):
+            recognizer.add_sign(f"sign{kind}", [make_sign(kind)])
+        self.assertFalse(recognizer.provisional)
+        self.assertLess(recognizer.scale[5], 10)
+        for kind, template in enumerate(recognizer._templates[:len(recognizer)]):
+            np.testing.assert_allclose(template, recognizer.project(make_sign(kind) if kind else first), atol=1e-5)
+        self.assertEqual(recognizer.classify(make_sign(2, seed=3), k=1), 'sign2')
+
+    def test_fit_projection_reprojects_recorded_signs(self):
+        """Test that fitting on representative frames reprojects the provisional templates"""
+        recognizer = TemplateRecognizer(n_components=4, band=3, feature_indices=np.arange(6))
+        recognizer.add_sign('sign0', [make_sign(0)])
+        recognizer.fit_projection(np.concatenate([make_sign(kind, seed=kind) for kind in range(4)]))
+        self.assertFalse(recognizer.provisional)
+        np.testing.assert_allclose(recognizer._templates[0], recognizer.project(make_sign(0)), atol=1e-5)
+        with self.assertRaises(ValueError):
+            recognizer.fit_projection(make_sign(1))
+
+    def test_save_and_load(self):
+        recognizer = make_recognizer(per_sign=2)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'templates.npz')
+            recognizer.save(path)
+            loaded = TemplateRecognizer.load(path)
+        query = make_sign(2, seed=42)
+        self.assertEqual(loaded.query(query, k=2), recognizer.query(query, k=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import sys
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.translations import PhraseTranslator, get_translation_tables
+
+
+class PhraseTranslatorTest(unittest.TestCase):
+    """Test cases for longest-match phrase translation"""
+
+    def setUp(self):
+        self.translator = PhraseTranslator({
+            "Thank you": "Murakoze",
+            "Thank you very much": "Murakoze Cyane",
+            "I want": "Nshaka",
+            "I want water": "Ndashaka Amazi",
+            "Water": "Amazi",
+        })
+
+    def test_longest_match_wins(self):
+        """Test that multi-word entries beat their prefixes"""
+        self.assertEqual(self.translator.translate("Thank you very much"), "Murakoze Cyane")
+        self.assertEqual(self.translator.translate("I want water"), "Ndashaka Amazi")
+
+    def test_falls_back_to_shorter_phrase(self):
+        """Test that a partial long match backs off to the longest complete one"""
+        self.assertEqual(self.translator.translate("Thank you very"), "Murakoze very")
+        self.assertEqual(self.translator.translate("I want Water Water"), "Ndashaka Amazi Amazi")
+
+    def test_unknown_words_pass_through(self):
+        """Test that unknown tokens are kept and matching ignores case"""
+        self.assertEqual(self.translator.translate("hello thank YOU"), "hello Murakoze")
+
+    def test_tables_are_shared(self):
+        """Test that the compiled tables are built once per process"""
+        tables = get_translation_tables()
+        self.assertIs(tables, get_translation_tables())
+        self.assertEqual(tables.translate("Thank you very much", 'kinyarwanda'), "Murakoze Cyane")
+        self.assertEqual(tables.translate("Thank you", 'english'), "Thank you")
+
+
+if __name__ == '__main__':
+    unittest.main()